@@ -1,8 +1,32 @@
+import uuid
+from pathlib import Path
+
 from flask import Flask
 from flask_socketio import SocketIO
-from pymongo import MongoClient
+from pymongo.errors import PyMongoError
 
 from .config import get_settings
+from .services.broadcast import DashboardBroadcaster
+from .services.change_fanout import ChangeFanout
+from .services.dashboard_counters import DashboardCounters
+from .services.http_cache import install_compression
+from .services.db_executor import DbExecutor, is_hub_friendly
+from .services.indexes import ensure_tracker_indexes, verify_index_usage
+from .services.metrics import (
+    MetricsRegistry,
+    cache_collector,
+    executor_collector,
+    instrument_flask,
+    mongo_collector,
+    register_default_metrics,
+)
+from .services.migrations import run_migrations
+from .services.mongo import MongoStats, build_mongo_client
+from .services.progress import prune_orphans
+from .services.pubsub import create_pubsub
+from .services.question_cache import QuestionCache
+from .services.users import sync_users
+from .services.warmup import SeedWarmup
 
 socketio = SocketIO(async_mode="eventlet", cors_allowed_origins="*")
 
@@ -18,17 +42,111 @@ def create_app() -> Flask:
         MONGO_COLLECTION_NAME=settings.mongo_collection,
         USER_ONE_NAME=settings.user_one,
         USER_TWO_NAME=settings.user_two,
+        DASHBOARD_RECONCILE_SECONDS=settings.dashboard_reconcile_seconds,
+        QUESTION_CACHE_MAX_ENTRIES=settings.question_cache_max_entries,
+        QUESTION_CACHE_TTL_SECONDS=settings.question_cache_ttl_seconds,
+        SEED_BATCH_SIZE=settings.seed_batch_size,
+        DASHBOARD_SYNC_WINDOW_MS=settings.dashboard_sync_window_ms,
+        METRICS_ENABLED=settings.metrics_enabled,
+        RESPONSE_COMPRESSION=settings.response_compression,
+        DAY_GROUPS_PAGE_SIZE=max(settings.day_groups_page_size, 0),
+        HISTORY_ENABLED=settings.history_enabled,
+    )
+    # Identifies this process in pub/sub messages and HTTP validators; version
+    # stamps are process-local, so ETags from another worker never match.
+    app.instance_id = uuid.uuid4().hex
+
+    if not is_hub_friendly():
+        app.logger.warning(
+            "eventlet monkey-patching is not active; MongoDB calls will block the event loop. "
+            "Start the app through wsgi.py or gunicorn's eventlet worker."
+        )
+    app.db_executor = DbExecutor(
+        max_concurrency=settings.db_max_concurrency,
+        slow_wait_ms=settings.db_slow_wait_ms,
+        slow_call_ms=settings.db_slow_call_ms,
     )
 
-    mongo_client = MongoClient(settings.mongo_uri)
+    app.mongo_stats = MongoStats(slow_command_ms=settings.mongo_slow_command_ms) if settings.mongo_monitoring else None
+    mongo_client = build_mongo_client(settings, listeners=[app.mongo_stats] if app.mongo_stats else None)
     app.mongo_client = mongo_client
     app.tracker_collection = mongo_client[settings.mongo_db][settings.mongo_collection]
+    if settings.run_migrations_on_startup:
+        try:
+            run_migrations(app.tracker_collection)
+        except PyMongoError as exc:
+            app.logger.warning("Skipping startup migrations; MongoDB unavailable: %s", exc)
+    if settings.mongo_ensure_indexes:
+        ensure_tracker_indexes(
+            app.tracker_collection, event_ttl_seconds=int(max(settings.progress_event_ttl_days, 0) * 86400)
+        )
+    if settings.mongo_verify_indexes:
+        verify_index_usage(app.tracker_collection)
+
+    configured_users = (("user_one", settings.user_one), ("user_two", settings.user_two)) + settings.extra_users
+    try:
+        app.users = sync_users(app.tracker_collection, configured_users)
+    except PyMongoError as exc:
+        app.logger.warning("Using configured users only; MongoDB unavailable: %s", exc)
+        app.users = [{"key": key, "name": name} for key, name in configured_users]
+    # Registry keys accepted as user_field by the write paths and counted on every dashboard.
+    app.user_fields = tuple(user["key"] for user in app.users)
+
+    app.dashboard_counters = DashboardCounters(
+        user_fields=app.user_fields, reconcile_interval=settings.dashboard_reconcile_seconds
+    )
+    app.question_cache = QuestionCache(
+        max_entries=settings.question_cache_max_entries,
+        ttl_seconds=settings.question_cache_ttl_seconds,
+    )
+
+    app.metrics = MetricsRegistry(enabled=settings.metrics_enabled)
+    register_default_metrics(app.metrics)
+    app.metrics.add_collector(executor_collector(app.db_executor))
+    app.metrics.add_collector(cache_collector(app.question_cache))
+    if app.mongo_stats is not None:
+        app.metrics.add_collector(mongo_collector(app.mongo_stats))
+    if settings.metrics_enabled:
+        instrument_flask(app, app.metrics)
+    if settings.response_compression:
+        install_compression(app, min_bytes=settings.response_compression_min_bytes)
 
+    app.pubsub = create_pubsub(settings.pubsub_url, channel=settings.pubsub_channel)
+    app.change_fanout = ChangeFanout(
+        app.pubsub, app.dashboard_counters, app.question_cache, instance_id=app.instance_id
+    )
+    app.dashboard_broadcaster = DashboardBroadcaster(
+        socketio, window_seconds=settings.dashboard_sync_window_ms / 1000.0, metrics=app.metrics
+    )
+
+    def _on_seed_change(category, result) -> None:
+        app.change_fanout.category_invalidated(category)
+        if result.deleted:
+            # Writes that used cached metadata of a removed item may have landed after the seed's cleanup.
+            prune_orphans(app.tracker_collection, category)
+
+    app.seed_warmup = SeedWarmup(
+        app.tracker_collection,
+        Path(app.root_path) / "static" / "data",
+        batch_size=settings.seed_batch_size,
+        on_change=_on_seed_change,
+    )
+
+    from .api import api_bp
     from .routes import main_bp
     from .socket_events import register_socketio_events
 
     app.register_blueprint(main_bp)
+    app.register_blueprint(api_bp)
     register_socketio_events(socketio)
-    socketio.init_app(app)
+    socketio.init_app(app, message_queue=settings.socketio_message_queue or None)
+    app.pubsub.start(socketio.start_background_task)
+
+    if settings.seed_warmup == "sync":
+        app.seed_warmup.run()
+    elif settings.seed_warmup == "background":
+        socketio.start_background_task(app.seed_warmup.run)
+    if settings.seed_warmup != "off" and settings.seed_watch_seconds > 0:
+        socketio.start_background_task(app.seed_warmup.watch, settings.seed_watch_seconds, socketio.sleep)
 
     return app
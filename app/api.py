@@ -0,0 +1,94 @@
+from flask import Blueprint, current_app, jsonify, request
+
+from .services.history import daily_history, user_streaks
+from .services.http_cache import make_etag, not_modified, with_etag
+from .services.tracker_service import CONTEST_CATEGORY, QUESTION_CATEGORIES
+
+api_bp = Blueprint("api", __name__, url_prefix="/api/v1")
+
+DASHBOARD_CATEGORIES = QUESTION_CATEGORIES + (CONTEST_CATEGORY,)
+MAX_HISTORY_DAYS = 366
+
+
+def _unknown_category(category: str):
+    return jsonify({"error": f"Unknown category '{category}'."}), 404
+
+
+def _cache_etag(kind: str, category: str, stamp):
+    """Validator built from a question cache stamp; None (no 304s) while the category is not cached."""
+    return make_etag(current_app.instance_id, kind, category, stamp) if stamp is not None else None
+
+
+@api_bp.route("/questions/<category>")
+def questions(category: str):
+    if category not in QUESTION_CATEGORIES:
+        return _unknown_category(category)
+
+    question_cache = current_app.question_cache
+    cached = not_modified(_cache_etag("questions", category, question_cache.stamp(category)))
+    if cached is not None:
+        return cached
+
+    grouped_questions = current_app.db_executor.run(
+        question_cache.get_grouped_questions, current_app.tracker_collection, category
+    )
+    etag = _cache_etag("questions", category, question_cache.stamp(category, grouped_questions))
+    return with_etag(jsonify({"category": category, "days": grouped_questions}), etag)
+
+
+@api_bp.route("/dashboard/<category>")
+def dashboard(category: str):
+    if category not in DASHBOARD_CATEGORIES:
+        return _unknown_category(category)
+
+    counters = current_app.dashboard_counters
+    stamp = counters.stamp(category)
+    if stamp is not None:
+        cached = not_modified(make_etag(current_app.instance_id, "dashboard", category, stamp))
+        if cached is not None:
+            return cached
+
+    snapshot, version = current_app.db_executor.run(counters.snapshot, current_app.tracker_collection, category)
+    payload = {
+        "category": category,
+        "dashboard": snapshot,
+        "user_one_name": current_app.config["USER_ONE_NAME"],
+        "user_two_name": current_app.config["USER_TWO_NAME"],
+    }
+    # A None version means the build raced with a write; skip the validator rather than pin stale data.
+    etag = make_etag(current_app.instance_id, "dashboard", category, version) if version is not None else None
+    return with_etag(jsonify(payload), etag)
+
+
+@api_bp.route("/contests")
+def contests():
+    question_cache = current_app.question_cache
+    cached = not_modified(_cache_etag("contests", CONTEST_CATEGORY, question_cache.stamp(CONTEST_CATEGORY)))
+    if cached is not None:
+        return cached
+
+    entries = current_app.db_executor.run(question_cache.get_contest_entries, current_app.tracker_collection)
+    etag = _cache_etag("contests", CONTEST_CATEGORY, question_cache.stamp(CONTEST_CATEGORY, entries))
+    return with_etag(jsonify({"category": CONTEST_CATEGORY, "contests": entries}), etag)
+
+
+@api_bp.route("/history")
+def history():
+    """Per-day progress and streaks for every registered user, read from the daily rollups."""
+    category = request.args.get("category") or None
+    if category is not None and category not in DASHBOARD_CATEGORIES:
+        return _unknown_category(category)
+    days = min(max(request.args.get("days", default=30, type=int), 1), MAX_HISTORY_DAYS)
+
+    collection = current_app.tracker_collection
+    users = current_app.user_fields
+    series = current_app.db_executor.run(daily_history, collection, users, category, days)
+    streaks = current_app.db_executor.run(user_streaks, collection, users, category)
+    return jsonify(
+        {
+            "category": category,
+            "users": current_app.users,
+            "days": series,
+            "streaks": streaks,
+        }
+    )
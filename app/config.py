@@ -1,5 +1,6 @@
 import os
 from dataclasses import dataclass
+from typing import Optional, Tuple
 
 from dotenv import load_dotenv
 
@@ -11,6 +12,61 @@ class Settings:
     mongo_collection: str
     user_one: str
     user_two: str
+    extra_users: Tuple[Tuple[str, str], ...]
+    dashboard_reconcile_seconds: float
+    question_cache_max_entries: int
+    question_cache_ttl_seconds: float
+    mongo_ensure_indexes: bool
+    mongo_verify_indexes: bool
+    run_migrations_on_startup: bool
+    seed_batch_size: int
+    seed_warmup: str
+    seed_watch_seconds: float
+    dashboard_sync_window_ms: int
+    db_max_concurrency: int
+    db_slow_wait_ms: float
+    db_slow_call_ms: float
+    socketio_message_queue: str
+    pubsub_url: str
+    pubsub_channel: str
+    mongo_max_pool_size: Optional[int]
+    mongo_min_pool_size: Optional[int]
+    mongo_wait_queue_timeout_ms: Optional[int]
+    mongo_server_selection_timeout_ms: Optional[int]
+    mongo_connect_timeout_ms: Optional[int]
+    mongo_socket_timeout_ms: Optional[int]
+    mongo_read_preference: Optional[str]
+    mongo_compressors: Optional[str]
+    mongo_monitoring: bool
+    mongo_slow_command_ms: float
+    metrics_enabled: bool
+    response_compression: bool
+    response_compression_min_bytes: int
+    day_groups_page_size: int
+    history_enabled: bool
+    progress_event_ttl_days: float
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _env_int(name: str) -> Optional[int]:
+    raw = os.getenv(name, "").strip()
+    return int(raw) if raw else None
+
+
+def _env_users(name: str) -> Tuple[Tuple[str, str], ...]:
+    # "key=Display Name" pairs separated by commas; a bare key doubles as its name.
+    users = []
+    for item in os.getenv(name, "").split(","):
+        key, _, display_name = item.partition("=")
+        if key.strip():
+            users.append((key.strip().lower(), display_name.strip() or key.strip()))
+    return tuple(users)
 
 
 def get_settings() -> Settings:
@@ -24,4 +80,55 @@ def get_settings() -> Settings:
         mongo_collection=os.getenv("MONGO_COLLECTION_NAME", "questions"),
         user_one=os.getenv("USER_ONE_NAME", "You"),
         user_two=os.getenv("USER_TWO_NAME", "Friend"),
+        # Collaborators registered in addition to user_one/user_two (e.g. "sam=Sam,alex=Alex")
+        extra_users=_env_users("EXTRA_USERS"),
+        # Interval after which in-memory dashboard counters are rebuilt from Mongo (0 disables)
+        dashboard_reconcile_seconds=float(os.getenv("DASHBOARD_RECONCILE_SECONDS", "300")),
+        # Bounds for the page-render question cache (0 entries disables caching, 0 TTL never expires)
+        question_cache_max_entries=int(os.getenv("QUESTION_CACHE_MAX_ENTRIES", "16")),
+        question_cache_ttl_seconds=float(os.getenv("QUESTION_CACHE_TTL_SECONDS", "600")),
+        # Create tracker indexes at startup, and optionally explain() the main queries
+        mongo_ensure_indexes=_env_flag("MONGO_ENSURE_INDEXES", True),
+        mongo_verify_indexes=_env_flag("MONGO_VERIFY_INDEXES", False),
+        # Apply pending data migrations (see scripts/migrate.py) before serving requests
+        run_migrations_on_startup=_env_flag("RUN_MIGRATIONS_ON_STARTUP", True),
+        # Number of upserts sent per bulk_write call when seeding from JSON files
+        seed_batch_size=int(os.getenv("SEED_BATCH_SIZE", "500")),
+        # When to seed bundled categories: "sync" (during startup), "background" or "off"
+        seed_warmup=os.getenv("SEED_WARMUP", "sync").strip().lower(),
+        # Re-check seed files for changes this often in the background (0 disables)
+        seed_watch_seconds=float(os.getenv("SEED_WATCH_SECONDS", "0")),
+        # Window for merging dashboard_sync broadcasts per room (0 emits on every write)
+        dashboard_sync_window_ms=int(os.getenv("DASHBOARD_SYNC_WINDOW_MS", "150")),
+        # Concurrent database calls allowed before requests queue, and when to log waits/slow calls
+        db_max_concurrency=int(os.getenv("DB_MAX_CONCURRENCY", "8")),
+        db_slow_wait_ms=float(os.getenv("DB_SLOW_WAIT_MS", "50")),
+        db_slow_call_ms=float(os.getenv("DB_SLOW_CALL_MS", "500")),
+        # Message queue shared by all workers/nodes for Socket.IO broadcasts (e.g. redis://host:6379/0)
+        socketio_message_queue=os.getenv("SOCKETIO_MESSAGE_QUEUE", ""),
+        # Channel used to keep in-process caches in sync across workers; defaults to the message queue
+        pubsub_url=os.getenv("PUBSUB_URL", os.getenv("SOCKETIO_MESSAGE_QUEUE", "")),
+        pubsub_channel=os.getenv("PUBSUB_CHANNEL", "sdetrack:events"),
+        # MongoClient tuning; unset values fall back to the connection string / driver defaults
+        mongo_max_pool_size=_env_int("MONGO_MAX_POOL_SIZE"),
+        mongo_min_pool_size=_env_int("MONGO_MIN_POOL_SIZE"),
+        mongo_wait_queue_timeout_ms=_env_int("MONGO_WAIT_QUEUE_TIMEOUT_MS"),
+        mongo_server_selection_timeout_ms=_env_int("MONGO_SERVER_SELECTION_TIMEOUT_MS"),
+        mongo_connect_timeout_ms=_env_int("MONGO_CONNECT_TIMEOUT_MS"),
+        mongo_socket_timeout_ms=_env_int("MONGO_SOCKET_TIMEOUT_MS"),
+        mongo_read_preference=os.getenv("MONGO_READ_PREFERENCE") or None,
+        mongo_compressors=os.getenv("MONGO_COMPRESSORS") or None,
+        # Collect pool/command statistics through PyMongo event listeners
+        mongo_monitoring=_env_flag("MONGO_MONITORING", True),
+        mongo_slow_command_ms=float(os.getenv("MONGO_SLOW_COMMAND_MS", "0")),
+        # Record request/socket latency and serve it at /metrics
+        metrics_enabled=_env_flag("METRICS_ENABLED", True),
+        # gzip/brotli for HTML and JSON responses larger than the threshold
+        response_compression=_env_flag("RESPONSE_COMPRESSION", True),
+        response_compression_min_bytes=int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "500")),
+        # Day/pattern groups rendered with the page; the rest load as the user scrolls
+        day_groups_page_size=int(os.getenv("DAY_GROUPS_PAGE_SIZE", "5")),
+        # Append progress events and daily rollups on every write; events expire after the TTL (0 keeps them)
+        history_enabled=_env_flag("HISTORY_ENABLED", True),
+        progress_event_ttl_days=float(os.getenv("PROGRESS_EVENT_TTL_DAYS", "365")),
     )
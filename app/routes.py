@@ -1,92 +1,139 @@
-from pathlib import Path
-
-from flask import Blueprint, current_app, render_template
-
-from .services.tracker_service import (
-    build_dashboard_snapshot,
-    build_contest_dashboard,
-    ensure_category_seeded,
-    ensure_contests_seeded,
-    get_all_questions,
-    get_contest_entries,
-    group_questions_by_day,
+from flask import (
+    Blueprint,
+    Response,
+    abort,
+    current_app,
+    make_response,
+    render_template,
+    request,
+    stream_template,
 )
 
-main_bp = Blueprint("main", __name__)
+from .services.http_cache import make_etag, not_modified, with_etag
+from .services.tracker_service import build_contest_dashboard, contest_dashboard_from_entries
 
+main_bp = Blueprint("main", __name__)
 
-@main_bp.route("/")
-def index():
+# Partial that renders a page of day groups for each question category.
+DAY_GROUP_PARTIALS = {
+    "striver": "partials/striver_days.html",
+    "binary_search": "partials/binary_search_days.html",
+}
+MAX_DAY_GROUPS_PAGE_SIZE = 50
+
+
+def _page_etag(category: str, dashboard_version=None, question_stamp=None):
+    """Validator for a rendered page: the category's cache stamp plus its dashboard version.
+
+    None while either is not loaded or has expired: the data then has to be
+    re-read, since writes from other processes only show up on a reload.
+    """
+    if dashboard_version is None:
+        dashboard_version = current_app.dashboard_counters.stamp(category)
+    if question_stamp is None:
+        question_stamp = current_app.question_cache.stamp(category)
+    if dashboard_version is None or question_stamp is None:
+        return None
+    return make_etag(current_app.instance_id, "page", category, question_stamp, dashboard_version)
+
+
+def _rendered_etag(category: str, question_version: int, dashboard_version, question_stamp):
+    """Validator for a page just rendered, or None when its data may already be stale."""
+    if (
+        dashboard_version is None
+        or question_stamp is None
+        or current_app.question_cache.version(category) != question_version
+    ):
+        return None
+    return _page_etag(category, dashboard_version, question_stamp)
+
+
+def _render_day_groups(template: str, page, etag, question_version: int, **context):
+    """Render a template around a page of day groups.
+
+    Pages served from the question cache are rendered in one go. With the
+    cache disabled the page is a lazy cursor stream: the template is streamed
+    too, so the first day group reaches the browser before the last document
+    is read.
+    """
+    category = context["category"]
+    if page.lazy:
+        page.groups = current_app.db_executor.iterate(page.groups)
+        response = Response(stream_template(template, grouped_questions=page, **context), mimetype="text/html")
+        # Streamed pages are read straight from Mongo and carry no cache stamp, so
+        # ``etag`` is None here and clients always revalidate with a full read.
+        return with_etag(response, etag)
+    html = render_template(template, grouped_questions=page, **context)
+    if current_app.question_cache.version(category) != question_version:
+        etag = None
+    return with_etag(make_response(html), etag)
+
+
+def _question_page(template: str, category: str):
     collection = current_app.tracker_collection
-    category = "striver"
-    questions = get_all_questions(collection, category=category)
-    grouped_questions = group_questions_by_day(questions)
-
-    user_one_field = "user_one"
-    user_two_field = "user_two"
+    cached = not_modified(_page_etag(category))
+    if cached is not None:
+        return cached
 
-    dashboard = build_dashboard_snapshot(
-        collection=collection,
-        user_one_field=user_one_field,
-        user_two_field=user_two_field,
-        category=category,
+    question_version = current_app.question_cache.version(category)
+    dashboard, dashboard_version = current_app.db_executor.run(
+        current_app.dashboard_counters.snapshot, collection, category
+    )
+    page = current_app.db_executor.run(
+        current_app.question_cache.get_day_page,
+        collection,
+        category,
+        None,
+        current_app.config["DAY_GROUPS_PAGE_SIZE"] or None,
     )
 
-    return render_template(
-        "index.html",
-        grouped_questions=grouped_questions,
+    return _render_day_groups(
+        template,
+        page,
+        _rendered_etag(category, question_version, dashboard_version, page.stamp),
+        question_version,
         dashboard=dashboard,
         user_one_name=current_app.config["USER_ONE_NAME"],
         user_two_name=current_app.config["USER_TWO_NAME"],
         category=category,
-        active_page="striver",
+        active_page=category,
     )
 
 
-@main_bp.route("/binary-search")
-def binary_search():
-    collection = current_app.tracker_collection
-    category = "binary_search"
-
-    data_path = Path(current_app.root_path) / "static" / "data" / "binary_search_questions.json"
-    ensure_category_seeded(collection, category, data_path)
-
-    questions = get_all_questions(collection, category=category)
-    grouped_questions = group_questions_by_day(questions)
+@main_bp.route("/")
+def index():
+    return _question_page("index.html", "striver")
 
-    dashboard = build_dashboard_snapshot(
-        collection=collection,
-        user_one_field="user_one",
-        user_two_field="user_two",
-        category=category,
-    )
 
-    return render_template(
-        "binary_search.html",
-        grouped_questions=grouped_questions,
-        dashboard=dashboard,
-        user_one_name=current_app.config["USER_ONE_NAME"],
-        user_two_name=current_app.config["USER_TWO_NAME"],
-        category=category,
-        active_page="binary_search",
-    )
+@main_bp.route("/binary-search")
+def binary_search():
+    return _question_page("binary_search.html", "binary_search")
 
 
 @main_bp.route("/contest-tracker")
 def contest_tracker():
     collection = current_app.tracker_collection
     category = "contest_tracker"
+    cached = not_modified(_page_etag(category))
+    if cached is not None:
+        return cached
+
+    question_cache = current_app.question_cache
+    question_version = question_cache.version(category)
+    entries = current_app.db_executor.run(question_cache.get_contest_entries, collection)
+
+    def dashboard_from_entries():
+        # Cold counters are derived from the entries already in hand; if a write
+        # landed since they were read, fall back to the aggregation instead.
+        if question_cache.version(category) != question_version:
+            return build_contest_dashboard(collection, current_app.user_fields)
+        return contest_dashboard_from_entries(entries, current_app.user_fields)
+
+    dashboard, dashboard_version = current_app.db_executor.run(
+        current_app.dashboard_counters.snapshot, collection, category, dashboard_from_entries
+    )
 
-    data_path = Path(current_app.root_path) / "static" / "data" / "contest_tracker.json"
-    try:
-        ensure_contests_seeded(collection, data_path)
-    except FileNotFoundError:
-        current_app.logger.warning("Contest seed file missing at %s; proceeding with existing data", data_path)
-
-    entries = get_contest_entries(collection)
-    dashboard = build_contest_dashboard(collection)
-
-    return render_template(
+    html = render_template(
         "contest_tracker.html",
         contests=entries,
         dashboard=dashboard,
@@ -95,3 +142,48 @@ def contest_tracker():
         category=category,
         active_page="contest_tracker",
     )
+    etag = _rendered_etag(category, question_version, dashboard_version, question_cache.stamp(category, entries))
+    return with_etag(make_response(html), etag)
+
+
+@main_bp.route("/fragments/<category>/days")
+def day_groups(category: str):
+    """Render the next page of day groups after the ``after`` cursor for ``main.js``."""
+    partial = DAY_GROUP_PARTIALS.get(category)
+    if partial is None:
+        abort(404)
+    after_day = request.args.get("after", type=int)
+    page_size = current_app.config["DAY_GROUPS_PAGE_SIZE"]
+    limit = min(max(request.args.get("limit", page_size, type=int), 1), MAX_DAY_GROUPS_PAGE_SIZE)
+
+    def days_etag(stamp):
+        return make_etag(current_app.instance_id, "days", category, stamp, after_day, limit) if stamp else None
+
+    cached = not_modified(days_etag(current_app.question_cache.stamp(category)))
+    if cached is not None:
+        return cached
+
+    question_version = current_app.question_cache.version(category)
+    page = current_app.db_executor.run(
+        current_app.question_cache.get_day_page,
+        current_app.tracker_collection,
+        category,
+        after_day,
+        limit,
+    )
+    return _render_day_groups(
+        partial,
+        page,
+        days_etag(page.stamp),
+        question_version,
+        user_one_name=current_app.config["USER_ONE_NAME"],
+        user_two_name=current_app.config["USER_TWO_NAME"],
+        category=category,
+    )
+
+
+@main_bp.route("/metrics")
+def metrics():
+    if not current_app.config["METRICS_ENABLED"]:
+        abort(404)
+    return Response(current_app.metrics.render(), mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Dict, Set
+
+from flask import current_app
+
+
+class DashboardBroadcaster:
+    """Coalesce ``dashboard_sync`` broadcasts per room.
+
+    The first ``schedule`` call for a room starts a short window; further calls
+    inside that window are merged, and a single dashboard is built and emitted
+    when it closes. Every payload carries a ``sequence`` that only grows, so
+    clients can drop payloads that arrive out of order.
+    """
+
+    def __init__(self, socketio, window_seconds: float = 0.15, metrics=None) -> None:
+        self._socketio = socketio
+        self._window_seconds = window_seconds
+        self._metrics = metrics
+        self._lock = threading.Lock()
+        self._pending: Set[str] = set()
+        self._sequences: Dict[str, int] = {}
+
+    def next_sequence(self, room: str) -> int:
+        """Return the next sequence number for a room.
+
+        Sequences are seeded from wall-clock milliseconds so they keep growing
+        across restarts and stay comparable between processes.
+        """
+        with self._lock:
+            sequence = max(self._sequences.get(room, 0) + 1, int(time.time() * 1000))
+            self._sequences[room] = sequence
+            return sequence
+
+    def stamp(self, room: str, payload: Dict) -> Dict:
+        """Attach the next sequence number to a payload that is emitted directly."""
+        payload["sequence"] = self.next_sequence(room)
+        return payload
+
+    def schedule(self, room: str, build_payload: Callable[[str], Dict]) -> None:
+        """Emit ``dashboard_sync`` to ``room`` once the current coalescing window closes."""
+        app = current_app._get_current_object()
+        if self._window_seconds <= 0:
+            self._emit(room, build_payload)
+            return
+        with self._lock:
+            if room in self._pending:
+                return
+            self._pending.add(room)
+        self._socketio.start_background_task(self._flush_later, app, room, build_payload)
+
+    def _flush_later(self, app, room: str, build_payload: Callable[[str], Dict]) -> None:
+        self._socketio.sleep(self._window_seconds)
+        with self._lock:
+            self._pending.discard(room)
+        with app.app_context():
+            self._emit(room, build_payload)
+
+    def _emit(self, room: str, build_payload: Callable[[str], Dict]) -> None:
+        payload = self.stamp(room, build_payload(room))
+        self._socketio.emit("dashboard_sync", payload, room=room)
+        if self._metrics is not None:
+            self._metrics.record_emit("dashboard_sync", room, payload)
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import uuid
+from typing import Any, Dict, List, Optional
+
+from .dashboard_counters import DashboardCounters
+from .pubsub import PubSubBackend
+from .question_cache import QuestionCache
+
+
+class ChangeFanout:
+    """Apply progress changes to this worker's caches and publish them to every other worker.
+
+    Each process has its own ``DashboardCounters`` and ``QuestionCache``. Write
+    handlers call this class instead of touching them directly; the change is
+    applied locally and published, and peers apply the same change when the
+    message arrives. Messages from this process are ignored on receipt.
+    """
+
+    def __init__(
+        self,
+        backend: PubSubBackend,
+        counters: DashboardCounters,
+        cache: QuestionCache,
+        instance_id: Optional[str] = None,
+    ) -> None:
+        self._backend = backend
+        self._counters = counters
+        self._cache = cache
+        self.instance_id = instance_id or uuid.uuid4().hex
+        backend.subscribe(self._on_message)
+
+    def question_changed(
+        self,
+        category: str,
+        question_id: str,
+        user_field: str,
+        difficulty: Optional[str],
+        previous: bool,
+        current: bool,
+    ) -> None:
+        message = {
+            "type": "question_changed",
+            "category": category,
+            "id": question_id,
+            "user_field": user_field,
+            "difficulty": difficulty,
+            "previous": previous,
+            "current": current,
+        }
+        self._apply(message)
+        self._publish(message)
+
+    def contest_changed(self, category: str, contest_id: str, user_field: str, previous: int, current: int) -> None:
+        message = {
+            "type": "contest_changed",
+            "category": category,
+            "id": contest_id,
+            "user_field": user_field,
+            "previous": previous,
+            "current": current,
+        }
+        self._apply(message)
+        self._publish(message)
+
+    def bulk_changed(self, category: str, user_field: str, changes: List[Dict[str, Any]]) -> None:
+        """Apply and publish a batch of question or contest changes as one message."""
+        message = {
+            "type": "bulk_changed",
+            "category": category,
+            "user_field": user_field,
+            "changes": changes,
+        }
+        self._apply(message)
+        self._publish(message)
+
+    def category_invalidated(self, category: str) -> None:
+        message = {"type": "category_invalidated", "category": category}
+        self._apply(message)
+        self._publish(message)
+
+    def _publish(self, message: Dict[str, Any]) -> None:
+        self._backend.publish(dict(message, origin=self.instance_id))
+
+    def _on_message(self, message: Dict[str, Any]) -> None:
+        if message.get("origin") == self.instance_id:
+            return
+        self._apply(message)
+
+    def _apply(self, message: Dict[str, Any]) -> None:
+        kind = message.get("type")
+        category = message.get("category")
+        if kind == "question_changed":
+            self._counters.apply_question_change(
+                category,
+                message["user_field"],
+                message.get("difficulty"),
+                message["previous"],
+                message["current"],
+            )
+            self._cache.patch_status(category, message["id"], message["user_field"], message["current"])
+        elif kind == "contest_changed":
+            # Cache first: the contest page derives cold counters from cached entries
+            # and relies on the cache stamp moving no later than the counters epoch.
+            self._cache.patch_status(category, message["id"], message["user_field"], message["current"])
+            self._counters.apply_contest_change(message["user_field"], message["previous"], message["current"])
+        elif kind == "bulk_changed":
+            changes = message["changes"]
+            self._cache.patch_statuses(
+                category, {change["id"]: change["current"] for change in changes}, message["user_field"]
+            )
+            self._counters.apply_bulk_change(category, message["user_field"], changes)
+        elif kind == "category_invalidated":
+            self._cache.bump(category)
+            self._counters.invalidate(category)
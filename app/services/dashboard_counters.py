@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import copy
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .tracker_service import (
+    CONTEST_CATEGORY,
+    USER_FIELDS,
+    build_contest_dashboard,
+    build_dashboard_snapshot,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    """A dashboard build in progress that concurrent readers wait on."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[Dict] = None
+        self.version: Optional[int] = None
+        self.error: Optional[BaseException] = None
+        # Changes applied while the build runs, replayed onto its result.
+        self.pending: List[Tuple[str, Dict[Optional[str], int], bool]] = []
+
+
+class DashboardCounters:
+    """In-memory dashboard counters per category, adjusted in place on every write.
+
+    Each category is built once from Mongo and then kept current by applying the
+    before/after values reported by the write paths. Snapshots older than
+    ``reconcile_interval`` seconds are rebuilt on the next read, and
+    ``reconcile`` can be called at any time to force a rebuild.
+
+    Concurrent builds of the same category are single-flight: the first caller
+    queries Mongo and everyone else arriving meanwhile waits for its result.
+    Changes applied while a build runs are recorded and replayed onto it.
+    """
+
+    def __init__(self, user_fields: Sequence[str] = USER_FIELDS, reconcile_interval: float = 300.0) -> None:
+        self._user_fields = tuple(user_fields)
+        self._reconcile_interval = reconcile_interval
+        self._lock = threading.Lock()
+        self._snapshots: Dict[str, Dict] = {}
+        self._built_at: Dict[str, float] = {}
+        # Bumped on every invalidation so a rebuild racing with one is discarded.
+        self._epochs: Dict[str, int] = {}
+        # Bumped whenever the visible counters change; lets callers skip resending.
+        self._versions: Dict[str, int] = {}
+        self._inflight: Dict[str, _Flight] = {}
+
+    def version(self, category: str) -> int:
+        """Return a counter that changes whenever the dashboard for a category changes."""
+        with self._lock:
+            return self._versions.get(category, 0)
+
+    def stamp(self, category: str) -> Optional[int]:
+        """Return the version while the category is loaded and fresh, else None (it must be rebuilt first)."""
+        with self._lock:
+            if category not in self._snapshots or self._is_stale(self._built_at.get(category, 0.0)):
+                return None
+            return self._versions.get(category, 0)
+
+    def get(self, collection, category: str) -> Dict:
+        """Return the dashboard for a category, building it from Mongo when needed."""
+        return self.snapshot(collection, category)[0]
+
+    def snapshot(
+        self, collection, category: str, build: Optional[Callable[[], Dict]] = None
+    ) -> Tuple[Dict, Optional[int]]:
+        """Return the dashboard together with the version it corresponds to.
+
+        The version is None when the returned data may already be behind the
+        in-memory counters (the category was invalidated during the rebuild). ``build`` replaces
+        the Mongo query when the category has to be (re)built, letting callers
+        that already hold the underlying documents derive the dashboard from them.
+        """
+        with self._lock:
+            snapshot = self._snapshots.get(category)
+            built_at = self._built_at.get(category, 0.0)
+            if snapshot is not None and not self._is_stale(built_at):
+                return copy.deepcopy(snapshot), self._versions.get(category, 0)
+        return self._rebuild(collection, category, build)
+
+    def reconcile(self, collection, category: str) -> Dict:
+        """Rebuild a category from Mongo and replace the in-memory counters."""
+        return self._rebuild(collection, category)[0]
+
+    def _rebuild(
+        self, collection, category: str, build: Optional[Callable[[], Dict]] = None
+    ) -> Tuple[Dict, Optional[int]]:
+        with self._lock:
+            flight = self._inflight.get(category)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._inflight[category] = flight
+                epoch = self._epochs.get(category, 0)
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result), flight.version
+
+        try:
+            fresh = build() if build is not None else self._compute(collection, category)
+        except BaseException as exc:
+            flight.error = exc
+            with self._lock:
+                self._inflight.pop(category, None)
+            flight.done.set()
+            raise
+
+        with self._lock:
+            self._inflight.pop(category, None)
+            if self._epochs.get(category, 0) != epoch or not self._replay(fresh, flight.pending):
+                # The category was invalidated (or a change could not be replayed)
+                # while we were reading; leave it unloaded and rebuild on next read.
+                self._snapshots.pop(category, None)
+                self._built_at.pop(category, None)
+            else:
+                current = self._snapshots.get(category)
+                if current != fresh:
+                    if current is not None:
+                        logger.info("Dashboard counters for '%s' drifted from Mongo; reconciled", category)
+                    self._bump_version(category)
+                self._snapshots[category] = fresh
+                self._built_at[category] = time.monotonic()
+                flight.version = self._versions.get(category, 0)
+            flight.result = copy.deepcopy(fresh)
+        flight.done.set()
+        return copy.deepcopy(fresh), flight.version
+
+    def user_counters(self, category: str, user_field: str, *difficulties: Optional[str]) -> Optional[Dict]:
+        """Return the current completed counts for one user without copying the dashboard.
+
+        Completed counts of the given difficulty buckets are included. Returns
+        None when the category is not loaded.
+        """
+        with self._lock:
+            stats = (self._snapshots.get(category) or {}).get(user_field)
+            if stats is None:
+                return None
+            counters = {"completed": stats.get("completed", 0), "total": stats.get("total", 0)}
+            buckets = stats.get("difficulty", {})
+            touched = {
+                difficulty: buckets[difficulty].get("completed", 0)
+                for difficulty in difficulties
+                if difficulty is not None and difficulty in buckets
+            }
+            if touched:
+                counters["difficulty"] = touched
+            return counters
+
+    def invalidate(self, category: Optional[str] = None) -> None:
+        """Drop cached counters for one category, or for all when ``category`` is None."""
+        with self._lock:
+            categories = [category] if category else list(self._snapshots)
+            for name in categories:
+                self._snapshots.pop(name, None)
+                self._built_at.pop(name, None)
+                self._epochs[name] = self._epochs.get(name, 0) + 1
+                self._bump_version(name)
+
+    def apply_question_change(
+        self,
+        category: str,
+        user_field: str,
+        difficulty: Optional[str],
+        previous: bool,
+        current: bool,
+    ) -> None:
+        """Adjust completed counters after a question flag moved from ``previous`` to ``current``."""
+        delta = int(bool(current)) - int(bool(previous))
+        self._apply(category, user_field, difficulty, delta)
+
+    def apply_contest_change(self, user_field: str, previous: int, current: int) -> None:
+        """Adjust contest counters after a solved count moved from ``previous`` to ``current``."""
+        delta = int(current or 0) - int(previous or 0)
+        self._apply(CONTEST_CATEGORY, user_field, None, delta, track_difficulty=False)
+
+    def apply_bulk_change(self, category: str, user_field: str, changes: Sequence[Dict]) -> None:
+        """Adjust counters once for a batch of ``{"difficulty", "previous", "current"}`` changes."""
+        deltas: Dict[Optional[str], int] = {}
+        for change in changes:
+            delta = int(change["current"] or 0) - int(change["previous"] or 0)
+            deltas[change.get("difficulty")] = deltas.get(change.get("difficulty"), 0) + delta
+        self._apply_many(category, user_field, deltas, track_difficulty=category != CONTEST_CATEGORY)
+
+    def _apply(
+        self,
+        category: str,
+        user_field: str,
+        difficulty: Optional[str],
+        delta: int,
+        track_difficulty: bool = True,
+    ) -> None:
+        self._apply_many(category, user_field, {difficulty: delta}, track_difficulty)
+
+    def _apply_many(
+        self,
+        category: str,
+        user_field: str,
+        deltas: Dict[Optional[str], int],
+        track_difficulty: bool = True,
+    ) -> None:
+        deltas = {difficulty: delta for difficulty, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        with self._lock:
+            self._bump_version(category)
+            flight = self._inflight.get(category)
+            if flight is not None:
+                flight.pending.append((user_field, deltas, track_difficulty))
+            snapshot = self._snapshots.get(category)
+            if snapshot is not None and not self._add(snapshot, user_field, deltas, track_difficulty):
+                self._snapshots.pop(category, None)
+                self._built_at.pop(category, None)
+
+    def _replay(self, snapshot: Dict, pending: Sequence[Tuple[str, Dict[Optional[str], int], bool]]) -> bool:
+        return all(self._add(snapshot, *change) for change in pending)
+
+    @staticmethod
+    def _add(snapshot: Dict, user_field: str, deltas: Dict[Optional[str], int], track_difficulty: bool) -> bool:
+        """Add ``deltas`` to one user's completed counters; False when the user is missing."""
+        stats = snapshot.get(user_field)
+        if stats is None:
+            return False
+        stats["completed"] = stats.get("completed", 0) + sum(deltas.values())
+        if track_difficulty:
+            for difficulty, delta in deltas.items():
+                bucket = stats.setdefault("difficulty", {}).setdefault(difficulty, {"total": 0, "completed": 0})
+                bucket["completed"] += delta
+        return True
+
+    def _bump_version(self, category: str) -> None:
+        self._versions[category] = self._versions.get(category, 0) + 1
+
+    def _compute(self, collection, category: str) -> Dict:
+        if category == CONTEST_CATEGORY:
+            return build_contest_dashboard(collection, self._user_fields)
+        return build_dashboard_snapshot(collection, *self._user_fields, category=category)
+
+    def _is_stale(self, built_at: float) -> bool:
+        if self._reconcile_interval <= 0:
+            return False
+        return time.monotonic() - built_at >= self._reconcile_interval
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator
+
+from eventlet import patcher
+from eventlet.semaphore import Semaphore
+
+
+logger = logging.getLogger(__name__)
+
+
+def is_hub_friendly() -> bool:
+    """Return True when blocking socket I/O (and so PyMongo) yields to the eventlet hub."""
+    return patcher.is_monkey_patched("socket") and patcher.is_monkey_patched("thread")
+
+
+class DbExecutor:
+    """Run tracker_service calls with bounded concurrency and wait-time logging.
+
+    PyMongo only cooperates with the eventlet hub when the standard library is
+    monkey-patched (``wsgi.py`` does this before anything else is imported).
+    On top of that, this executor caps how many database calls run at once so
+    a burst of socket events queues here instead of piling onto the Mongo
+    pool, and it logs the queue depth and wait time whenever a call waits
+    longer than ``slow_wait_ms`` or runs longer than ``slow_call_ms``.
+
+    Calls must not be nested: run whole service operations, not their parts.
+    """
+
+    def __init__(self, max_concurrency: int = 8, slow_wait_ms: float = 50.0, slow_call_ms: float = 500.0) -> None:
+        self._semaphore = Semaphore(max(max_concurrency, 1))
+        self._max_concurrency = max(max_concurrency, 1)
+        self._slow_wait_ms = slow_wait_ms
+        self._slow_call_ms = slow_call_ms
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._active = 0
+        self._calls = 0
+        self._queued_calls = 0
+        self._max_queue_depth = 0
+        self._total_wait_ms = 0.0
+        self._max_wait_ms = 0.0
+
+    def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Call ``fn`` once a slot is free and return its result."""
+        name = getattr(fn, "__qualname__", repr(fn))
+        if not self._semaphore.acquire(blocking=False):
+            self._wait_for_slot(name)
+        with self._lock:
+            self._active += 1
+            self._calls += 1
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with self._lock:
+                self._active -= 1
+            self._semaphore.release()
+            if elapsed_ms >= self._slow_call_ms:
+                logger.warning("Slow database call %s took %.1f ms", name, elapsed_ms)
+
+    def iterate(self, iterable: Iterable[Any]) -> Iterator[Any]:
+        """Yield from a lazy database iterable, running each step through ``run``.
+
+        Used for streamed responses: every ``next`` (which may fetch a cursor
+        batch) takes a slot, but no slot is held while the response is sent.
+        """
+        iterator = iter(iterable)
+        sentinel = object()
+        try:
+            while True:
+                item = self.run(next, iterator, sentinel)
+                if item is sentinel:
+                    return
+                yield item
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue and wait-time counters since startup."""
+        with self._lock:
+            return {
+                "max_concurrency": self._max_concurrency,
+                "active": self._active,
+                "queue_depth": self._waiting,
+                "max_queue_depth": self._max_queue_depth,
+                "calls": self._calls,
+                "queued_calls": self._queued_calls,
+                "total_wait_ms": self._total_wait_ms,
+                "max_wait_ms": self._max_wait_ms,
+            }
+
+    def _wait_for_slot(self, name: str) -> None:
+        with self._lock:
+            self._waiting += 1
+            self._queued_calls += 1
+            depth = self._waiting
+            self._max_queue_depth = max(self._max_queue_depth, depth)
+        started = time.perf_counter()
+        try:
+            self._semaphore.acquire()
+        finally:
+            waited_ms = (time.perf_counter() - started) * 1000
+            with self._lock:
+                self._waiting -= 1
+                self._total_wait_ms += waited_ms
+                self._max_wait_ms = max(self._max_wait_ms, waited_ms)
+        if waited_ms >= self._slow_wait_ms:
+            logger.warning(
+                "Database call %s waited %.1f ms for a slot (queue depth %d, limit %d)",
+                name,
+                waited_ms,
+                depth,
+                self._max_concurrency,
+            )
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence
+
+from pymongo import ASCENDING, IndexModel
+
+
+EVENTS_COLLECTION = "progress_events"
+ROLLUPS_COLLECTION = "progress_daily"
+
+ROLLUP_INDEXES: List[IndexModel] = [
+    # daily_history / user_streaks: users over a range of days
+    IndexModel([("user", ASCENDING), ("day", ASCENDING)], name="user_day"),
+]
+
+
+def events_collection(collection):
+    """Return the append-only progress event log stored next to a tracker collection.
+
+    Events look like ``{user, item_id, category, difficulty, old, new, at}``
+    and expire through a TTL index on ``at`` (see ``event_indexes``).
+    """
+    return collection.database[EVENTS_COLLECTION]
+
+
+def rollups_collection(collection):
+    """Return the per-day rollups stored next to a tracker collection.
+
+    One document per UTC day, user and category, keyed ``"<day>|<user>|<category>"``,
+    holding ``gained``/``lost`` counts, the number of ``events`` and the net
+    change per difficulty.
+    """
+    return collection.database[ROLLUPS_COLLECTION]
+
+
+def event_indexes(ttl_seconds: int = 0) -> List[IndexModel]:
+    """Index on the event timestamp; with ``ttl_seconds`` MongoDB deletes older events."""
+    if ttl_seconds > 0:
+        return [IndexModel([("at", ASCENDING)], name="at", expireAfterSeconds=int(ttl_seconds))]
+    return [IndexModel([("at", ASCENDING)], name="at")]
+
+
+def _delta(change: Dict) -> int:
+    return int(change["current"] or 0) - int(change["previous"] or 0)
+
+
+def record_changes(
+    collection,
+    user: str,
+    category: str,
+    changes: Sequence[Dict],
+    at: Optional[datetime] = None,
+) -> int:
+    """Append one event per change and fold them into the day's rollup; return the events written.
+
+    ``changes`` are ``{"id", "difficulty", "previous", "current"}`` dicts as
+    returned by the tracker write paths. A batch costs one ``insert_many`` and
+    one ``$inc`` upsert however many changes it holds.
+    """
+    changes = [change for change in changes if _delta(change)]
+    if not changes:
+        return 0
+    at = at or datetime.now(timezone.utc)
+    events_collection(collection).insert_many(
+        [
+            {
+                "user": user,
+                "item_id": change["id"],
+                "category": category,
+                "difficulty": change.get("difficulty"),
+                "old": change["previous"],
+                "new": change["current"],
+                "at": at,
+            }
+            for change in changes
+        ],
+        ordered=False,
+    )
+
+    day = at.date().isoformat()
+    increments: Dict[str, int] = {"events": len(changes), "gained": 0, "lost": 0}
+    for change in changes:
+        delta = _delta(change)
+        increments["gained" if delta > 0 else "lost"] += abs(delta)
+        if change.get("difficulty"):
+            key = f"difficulty.{change['difficulty']}"
+            increments[key] = increments.get(key, 0) + delta
+    rollups_collection(collection).update_one(
+        {"_id": f"{day}|{user}|{category}"},
+        {"$inc": increments, "$setOnInsert": {"day": day, "user": user, "category": category}},
+        upsert=True,
+    )
+    return len(changes)
+
+
+def _rollup_query(users: Sequence[str], category: Optional[str]) -> Dict:
+    query: Dict = {"user": {"$in": list(users)}}
+    if category:
+        query["category"] = category
+    return query
+
+
+def daily_history(
+    collection,
+    users: Sequence[str],
+    category: Optional[str] = None,
+    days: int = 30,
+    today: Optional[date] = None,
+) -> List[Dict]:
+    """Return per-day gained/lost/net counts for each user over the last ``days`` UTC days.
+
+    Reads rollups only, so the cost depends on the number of days, not events.
+    Days without activity are included with zero counts, oldest first.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    days = max(int(days), 1)
+    first = today - timedelta(days=days - 1)
+    series = {
+        (first + timedelta(days=offset)).isoformat(): {user: {"gained": 0, "lost": 0, "net": 0} for user in users}
+        for offset in range(days)
+    }
+    query = _rollup_query(users, category)
+    query["day"] = {"$gte": first.isoformat(), "$lte": today.isoformat()}
+    for doc in rollups_collection(collection).find(query, projection={"day": 1, "user": 1, "gained": 1, "lost": 1}):
+        stats = series.get(doc["day"], {}).get(doc["user"])
+        if stats is None:
+            continue
+        stats["gained"] += doc.get("gained", 0)
+        stats["lost"] += doc.get("lost", 0)
+        stats["net"] = stats["gained"] - stats["lost"]
+    return [{"day": day, "users": users_stats} for day, users_stats in series.items()]
+
+
+def user_streaks(
+    collection,
+    users: Sequence[str],
+    category: Optional[str] = None,
+    today: Optional[date] = None,
+) -> Dict[str, Dict[str, int]]:
+    """Return the current and longest run of consecutive UTC days with progress for each user.
+
+    A day counts when the user gained at least one item. The current streak
+    is still alive if the last such day is today or yesterday.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    active: Dict[str, set] = {user: set() for user in users}
+    query = _rollup_query(users, category)
+    query["gained"] = {"$gt": 0}
+    for doc in rollups_collection(collection).find(query, projection={"_id": 0, "day": 1, "user": 1}):
+        active.setdefault(doc["user"], set()).add(date.fromisoformat(doc["day"]))
+
+    streaks: Dict[str, Dict[str, int]] = {}
+    for user, days in active.items():
+        longest = run = 0
+        previous: Optional[date] = None
+        for day in sorted(days):
+            run = run + 1 if previous is not None and day - previous == timedelta(days=1) else 1
+            longest = max(longest, run)
+            previous = day
+        current = run if previous is not None and today - previous <= timedelta(days=1) else 0
+        streaks[user] = {"current": current, "longest": longest}
+    return streaks
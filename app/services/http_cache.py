@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import gzip
+import zlib
+from typing import Iterable, Iterator, Optional
+
+from flask import Response, request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - gzip only when Brotli is not installed
+    brotli = None
+
+
+COMPRESSIBLE_MIMETYPES = {"text/html", "application/json", "text/plain"}
+
+# Appended to the ETag of a compressed body so each encoding keeps a distinct strong validator.
+_ENCODING_SUFFIXES = {"br": "-br", "gzip": "-gz"}
+
+
+def make_etag(*parts) -> str:
+    """Build an opaque strong validator from version parts (instance id, category, stamps)."""
+    return "-".join(str(part) for part in parts)
+
+
+def _base_tag(tag: str) -> str:
+    for suffix in _ENCODING_SUFFIXES.values():
+        if tag.endswith(suffix):
+            return tag[: -len(suffix)]
+    return tag
+
+
+def not_modified(etag: Optional[str]) -> Optional[Response]:
+    """Return a 304 response when the request's If-None-Match already names ``etag``."""
+    if not etag or not request.if_none_match:
+        return None
+    if request.if_none_match.star_tag:
+        matched = etag
+    else:
+        matched = next(
+            (tag for tag in request.if_none_match.as_set(include_weak=True) if _base_tag(tag) == etag),
+            None,
+        )
+    if matched is None:
+        return None
+    response = Response(status=304)
+    # Echo the client's tag so an encoding-suffixed validator stays valid.
+    response.set_etag(matched)
+    response.headers["Cache-Control"] = "no-cache"
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def with_etag(response: Response, etag: Optional[str]) -> Response:
+    """Attach a strong ETag and require revalidation on every use."""
+    if etag:
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def _choose_encoding() -> Optional[str]:
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"] > 0:
+        return "br"
+    if accepted["gzip"] > 0:
+        return "gzip"
+    return None
+
+
+def _compress_chunks(chunks: Iterable, encoding: str, level: int) -> Iterator[bytes]:
+    """Compress a streamed body chunk by chunk, flushing after each so the browser can paint early."""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=min(max(level, 0), 11))
+        flush, finish = compressor.flush, compressor.finish
+    else:
+        compressor = zlib.compressobj(min(max(level, 1), 9), zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+        def flush() -> bytes:
+            return compressor.flush(zlib.Z_SYNC_FLUSH)
+
+        finish = compressor.flush
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            data = (compressor.process(chunk) if encoding == "br" else compressor.compress(chunk)) + flush()
+            if data:
+                yield data
+        yield finish()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def install_compression(app, min_bytes: int = 500, level: int = 6) -> None:
+    """Compress HTML, JSON and text responses with brotli (when installed) or gzip.
+
+    File responses are left alone, as are buffered bodies smaller than
+    ``min_bytes`` where the encoding overhead outweighs the savings. Streamed
+    bodies are compressed incrementally.
+    """
+
+    @app.after_request
+    def _compress(response: Response) -> Response:
+        if (
+            response.status_code != 200
+            or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        ):
+            return response
+        response.vary.add("Accept-Encoding")
+        encoding = _choose_encoding()
+        if encoding is None:
+            return response
+        if response.is_streamed:
+            response.response = _compress_chunks(response.response, encoding, level)
+            response.headers["Content-Encoding"] = encoding
+            response.headers.pop("Content-Length", None)
+            _suffix_etag(response, encoding)
+            return response
+
+        body = response.get_data()
+        if len(body) < min_bytes:
+            return response
+
+        if encoding == "br":
+            compressed = brotli.compress(body, quality=min(max(level, 0), 11))
+        else:
+            compressed = gzip.compress(body, compresslevel=min(max(level, 1), 9))
+        response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+        _suffix_etag(response, encoding)
+        return response
+
+
+def _suffix_etag(response: Response, encoding: str) -> None:
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(etag + _ENCODING_SUFFIXES[encoding], weak=weak)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import OperationFailure, PyMongoError
+
+from .history import ROLLUP_INDEXES, event_indexes, events_collection, rollups_collection
+from .progress import PROGRESS_INDEXES, progress_collection
+from .tracker_service import (
+    CONTEST_CATEGORY,
+    QUESTION_CATEGORIES,
+    USER_FIELDS,
+    contest_entries_pipeline,
+    progress_snapshot_pipeline,
+    question_page_pipeline,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+TRACKER_INDEXES: List[IndexModel] = [
+    # iter_questions / dashboard aggregates: category filter sorted by day, order, title
+    IndexModel(
+        [("category", ASCENDING), ("day", ASCENDING), ("order", ASCENDING), ("title", ASCENDING)],
+        name="category_day_order_title",
+    ),
+    # get_contest_entries: category filter sorted by order, title
+    IndexModel(
+        [("category", ASCENDING), ("order", ASCENDING), ("title", ASCENDING)],
+        name="category_order_title",
+    ),
+    # Question seeding upsert key; contests carry no day and are excluded.
+    IndexModel(
+        [("category", ASCENDING), ("day", ASCENDING), ("title", ASCENDING)],
+        name="question_upsert_key",
+        unique=True,
+        partialFilterExpression={"day": {"$exists": True}},
+    ),
+    # Contest seeding upsert key
+    IndexModel(
+        [("category", ASCENDING), ("title", ASCENDING)],
+        name="contest_upsert_key",
+        unique=True,
+        partialFilterExpression={"category": CONTEST_CATEGORY},
+    ),
+]
+
+
+def ensure_tracker_indexes(collection, event_ttl_seconds: int = 0) -> List[str]:
+    """Create the tracker, progress and history indexes if missing and return the names that exist afterwards.
+
+    Each index is created on its own so one failure (for example duplicate
+    upsert keys blocking a unique index, or a changed event TTL) is logged
+    without skipping the rest.
+    """
+    created: List[str] = []
+    targets = (
+        (collection, TRACKER_INDEXES),
+        (progress_collection(collection), PROGRESS_INDEXES),
+        (events_collection(collection), event_indexes(event_ttl_seconds)),
+        (rollups_collection(collection), ROLLUP_INDEXES),
+    )
+    for target, models in targets:
+        for model in models:
+            name = model.document["name"]
+            try:
+                created.extend(target.create_indexes([model]))
+            except OperationFailure as exc:
+                logger.warning("Could not create index %s on %s: %s", name, target.name, exc)
+            except PyMongoError as exc:
+                logger.warning("Skipping index management for %s; MongoDB unavailable: %s", target.name, exc)
+                return created
+    return created
+
+
+def _main_pipelines(categories: Iterable[str]) -> List[Dict]:
+    pipelines = []
+    for category in categories:
+        pipelines.append({"name": f"iter_questions[{category}]", "pipeline": question_page_pipeline(category)})
+        pipelines.append(
+            {
+                "name": f"compute_progress_snapshots[{category}]",
+                "pipeline": progress_snapshot_pipeline(USER_FIELDS, category),
+            }
+        )
+    pipelines.append({"name": "get_contest_entries", "pipeline": contest_entries_pipeline()})
+    return pipelines
+
+
+def _plan_stages(plan: Dict) -> List[str]:
+    stage = plan.get("stage", "")
+    if stage == "EQ_LOOKUP":
+        # Lookups pushed down into the query plan name their join strategy;
+        # anything but an indexed loop join scans the foreign collection.
+        strategy = plan.get("strategy", "")
+        stage = f"EQ_LOOKUP({strategy})" if strategy == "IndexedLoopJoin" else f"EQ_LOOKUP({strategy}):COLLSCAN"
+    stages = [stage] if stage else []
+    for key in ("inputStage", "queryPlan"):
+        if isinstance(plan.get(key), dict):
+            stages.extend(_plan_stages(plan[key]))
+    for child in plan.get("inputStages", []) or []:
+        stages.extend(_plan_stages(child))
+    return stages
+
+
+def _pipeline_stages(explained: Dict) -> List[str]:
+    """Flatten an aggregate explain into plan stage names, marking unindexed ``$lookup`` joins."""
+    stages: List[str] = []
+    planner = explained.get("queryPlanner")
+    if planner is not None:
+        stages.extend(_plan_stages(planner.get("winningPlan", {})))
+    for stage in explained.get("stages", []) or []:
+        if "$cursor" in stage:
+            stages.extend(_plan_stages(stage["$cursor"].get("queryPlanner", {}).get("winningPlan", {})))
+        elif "$lookup" in stage:
+            # executionStats verbosity reports how the foreign collection was read.
+            scans = stage.get("collectionScans", 0)
+            stages.append("$lookup:COLLSCAN" if scans or not stage.get("indexesUsed") else "$lookup")
+        else:
+            stages.extend(name for name in stage if name.startswith("$"))
+    return stages
+
+
+def verify_index_usage(collection, categories: Optional[Iterable[str]] = None) -> Dict[str, List[str]]:
+    """Explain the main read pipelines and log any that scan a collection.
+
+    Uses ``executionStats`` verbosity, which runs each pipeline once, because
+    only then does the server report whether ``$lookup`` into progress used
+    an index. Returns the plan stages seen for each pipeline name.
+    """
+    results: Dict[str, List[str]] = {}
+    for query in _main_pipelines(categories or QUESTION_CATEGORIES):
+        try:
+            explained = collection.database.command(
+                "explain",
+                {"aggregate": collection.name, "pipeline": query["pipeline"], "cursor": {}},
+                verbosity="executionStats",
+            )
+        except PyMongoError as exc:
+            logger.warning("Could not explain %s: %s", query["name"], exc)
+            continue
+        stages = _pipeline_stages(explained)
+        results[query["name"]] = stages
+        if any("COLLSCAN" in stage for stage in stages):
+            logger.warning("Pipeline %s scans a collection (plan: %s)", query["name"], " <- ".join(stages))
+        else:
+            logger.info("Pipeline %s uses indexes (plan: %s)", query["name"], " <- ".join(stages))
+    return results
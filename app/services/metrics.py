@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+# Seconds; tuned for sub-millisecond cache hits up to multi-second Mongo stalls.
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Socket.IO payloads are serialized for sizing once per this many emits of an
+# event and room; the emits in between reuse the last measured size.
+EMIT_SIZE_SAMPLE_EVERY = 16
+
+LabelKey = Tuple[Tuple[str, str], ...]
+Collector = Callable[[], List[Tuple[str, str, str, Dict[str, str], float]]]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    rendered = ",".join(
+        '{}="{}"'.format(name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in pairs
+    )
+    return "{" + rendered + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Histogram:
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Process-local counters, gauges and histograms rendered in Prometheus text format.
+
+    Recording is a dict lookup and a few additions under one lock, cheap enough
+    to leave on in production. ``collectors`` are called only at scrape time to
+    export state owned by other components (executor queue, Mongo pool, cache).
+    """
+
+    def __init__(self, enabled: bool = True, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.enabled = enabled
+        self._buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+        self._collectors: List[Collector] = []
+        self._emit_sizes: Dict[LabelKey, List[int]] = {}
+
+    def describe(self, name: str, kind: str, help_text: str) -> None:
+        self._help[name] = (kind, help_text)
+
+    def add_collector(self, collector: Collector) -> None:
+        """Register a callable returning ``(name, kind, help, labels, value)`` samples at scrape time."""
+        self._collectors.append(collector)
+
+    def inc(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def gauge_add(self, name: str, amount: float, **labels: str) -> None:
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._gauges.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(self._buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def time(self, name: str, **labels: str) -> Iterator[None]:
+        """Observe the duration of the ``with`` block in seconds."""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def record_emit(self, event: str, room: str, payload) -> None:
+        """Count one Socket.IO emit and add an estimate of its JSON size.
+
+        Only one emit in ``EMIT_SIZE_SAMPLE_EVERY`` per event and room is
+        serialized; the others are counted at the last sampled size, so the
+        payload is not encoded twice on every emit.
+        """
+        if not self.enabled:
+            return
+        key = _label_key({"event": event, "room": room})
+        with self._lock:
+            sample = self._emit_sizes.setdefault(key, [0, 0])
+            measure = sample[0] % EMIT_SIZE_SAMPLE_EVERY == 0
+            sample[0] += 1
+            size = sample[1]
+        if measure:
+            size = len(json.dumps(payload, separators=(",", ":"), default=str))
+            with self._lock:
+                sample[1] = size
+        self.inc("sdetrack_socketio_emits_total", event=event, room=room)
+        self.inc("sdetrack_socketio_emit_bytes_total", size, event=event, room=room)
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            gauges = {name: dict(series) for name, series in self._gauges.items()}
+            histograms = {
+                name: {key: (list(h.counts), h.total, h.count) for key, h in series.items()}
+                for name, series in self._histograms.items()
+            }
+
+        collected: Dict[str, Dict[LabelKey, float]] = {}
+        for collector in self._collectors:
+            for name, kind, help_text, labels, value in collector():
+                self._help.setdefault(name, (kind, help_text))
+                collected.setdefault(name, {})[_label_key(labels)] = value
+
+        lines: List[str] = []
+        for kind, families in (("counter", counters), ("gauge", gauges), (None, collected)):
+            for name in sorted(families):
+                declared_kind, help_text = self._help.get(name, (kind or "gauge", ""))
+                self._header(lines, name, kind or declared_kind, help_text)
+                for key, value in sorted(families[name].items()):
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+
+        for name in sorted(histograms):
+            _kind, help_text = self._help.get(name, ("histogram", ""))
+            self._header(lines, name, "histogram", help_text)
+            for key, (counts, total, count) in sorted(histograms[name].items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self._buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    le = ("le", _format_value(bound))
+                    lines.append(f"{name}_bucket{_format_labels(key, le)} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(key)} {_format_value(total)}")
+                lines.append(f"{name}_count{_format_labels(key)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def _header(self, lines: List[str], name: str, kind: str, help_text: str) -> None:
+        if help_text:
+            lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+
+def register_default_metrics(registry: MetricsRegistry) -> None:
+    """Declare HELP/TYPE for the metrics recorded by routes and socket handlers."""
+    registry.describe("sdetrack_http_request_duration_seconds", "histogram", "Flask request latency by endpoint.")
+    registry.describe("sdetrack_http_requests_total", "counter", "Flask requests by endpoint and status code.")
+    registry.describe(
+        "sdetrack_socketio_handler_duration_seconds", "histogram", "Socket.IO handler latency by event."
+    )
+    registry.describe("sdetrack_socketio_handler_errors_total", "counter", "Socket.IO handlers that raised.")
+    registry.describe("sdetrack_socketio_emits_total", "counter", "Socket.IO emits by event and room.")
+    registry.describe(
+        "sdetrack_socketio_emit_bytes_total", "counter", "Estimated JSON payload bytes emitted by event and room."
+    )
+    registry.describe("sdetrack_socketio_connected_clients", "gauge", "Connected Socket.IO clients per category room.")
+
+
+def executor_collector(executor) -> Collector:
+    def collect():
+        stats = executor.stats()
+        return [
+            ("sdetrack_db_executor_active", "gauge", "Database calls currently running.", {}, stats["active"]),
+            ("sdetrack_db_executor_queue_depth", "gauge", "Database calls waiting for a slot.", {}, stats["queue_depth"]),
+            ("sdetrack_db_executor_calls_total", "counter", "Database calls run through the executor.", {}, stats["calls"]),
+            (
+                "sdetrack_db_executor_wait_seconds_total",
+                "counter",
+                "Time spent waiting for an executor slot.",
+                {},
+                stats["total_wait_ms"] / 1000.0,
+            ),
+        ]
+
+    return collect
+
+
+def mongo_collector(mongo_stats) -> Collector:
+    def collect():
+        stats = mongo_stats.stats()
+        samples = [
+            ("sdetrack_mongo_checkouts_total", "counter", "Connections checked out of the pool.", {}, stats["checkouts"]),
+            (
+                "sdetrack_mongo_checkout_wait_seconds_total",
+                "counter",
+                "Time spent waiting for a pooled connection.",
+                {},
+                stats["checkout_wait"]["total_ms"] / 1000.0,
+            ),
+            ("sdetrack_mongo_checked_out", "gauge", "Connections currently checked out.", {}, stats["checked_out"]),
+            ("sdetrack_mongo_connections_open", "gauge", "Open pooled connections.", {}, stats["connections_open"]),
+            ("sdetrack_mongo_pool_clears_total", "counter", "Times the connection pool was cleared.", {}, stats["pool_clears"]),
+        ]
+        for reason, count in stats["checkout_failures"].items():
+            samples.append(
+                ("sdetrack_mongo_checkout_failures_total", "counter", "Failed pool checkouts.", {"reason": reason}, count)
+            )
+        for command, entry in stats["commands"].items():
+            samples.append(
+                ("sdetrack_mongo_commands_total", "counter", "MongoDB commands sent.", {"command": command}, entry["count"])
+            )
+            samples.append(
+                (
+                    "sdetrack_mongo_command_seconds_total",
+                    "counter",
+                    "Total MongoDB command latency.",
+                    {"command": command},
+                    entry["total_ms"] / 1000.0,
+                )
+            )
+        return samples
+
+    return collect
+
+
+def cache_collector(cache) -> Collector:
+    def collect():
+        stats = cache.stats()
+        return [
+            ("sdetrack_question_cache_hits_total", "counter", "Question cache hits.", {}, stats["hits"]),
+            ("sdetrack_question_cache_misses_total", "counter", "Question cache misses.", {}, stats["misses"]),
+            ("sdetrack_question_cache_evictions_total", "counter", "Question cache evictions.", {}, stats["evictions"]),
+            ("sdetrack_question_cache_entries", "gauge", "Question cache entries.", {}, stats["entries"]),
+        ]
+
+    return collect
+
+
+def instrument_flask(app, registry: MetricsRegistry) -> None:
+    """Time every Flask request and count it by endpoint and status code."""
+    from flask import g, request
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        started = g.pop("metrics_started", None)
+        if started is not None:
+            endpoint = request.endpoint or "unmatched"
+            registry.observe("sdetrack_http_request_duration_seconds", time.perf_counter() - started, endpoint=endpoint)
+            registry.inc("sdetrack_http_requests_total", endpoint=endpoint, status=str(response.status_code))
+        return response
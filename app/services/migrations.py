@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from .progress import import_embedded_status
+from .tracker_service import DEFAULT_CATEGORY
+
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_COLLECTION = "schema_migrations"
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    apply: Callable[..., Dict]
+
+
+def _backfill_default_category(collection) -> Dict:
+    """Give legacy documents without a category the default one."""
+    result = collection.update_many({"category": {"$exists": False}}, {"$set": {"category": DEFAULT_CATEGORY}})
+    return {"matched": result.matched_count, "modified": result.modified_count}
+
+
+def _move_status_to_progress(collection) -> Dict:
+    """Copy per-user status embedded in tracker documents into the progress collection."""
+    return import_embedded_status(collection)
+
+
+# Ordered by version; each step must be idempotent so a crashed run can be repeated.
+MIGRATIONS: List[Migration] = [
+    Migration(1, "backfill_default_category", _backfill_default_category),
+    Migration(2, "move_status_to_progress", _move_status_to_progress),
+]
+
+
+def _record_id(collection, version: int) -> str:
+    return f"{collection.name}:{version:04d}"
+
+
+def _migrations_collection(collection, migrations_collection=None):
+    if migrations_collection is not None:
+        return migrations_collection
+    return collection.database[MIGRATIONS_COLLECTION]
+
+
+def migration_status(collection, migrations_collection=None) -> List[Dict]:
+    """Return every known migration with its applied timestamp (None when pending)."""
+    records = _migrations_collection(collection, migrations_collection)
+    applied = {doc["_id"]: doc for doc in records.find({"collection": collection.name})}
+    status = []
+    for migration in MIGRATIONS:
+        record = applied.get(_record_id(collection, migration.version))
+        status.append(
+            {
+                "version": migration.version,
+                "name": migration.name,
+                "applied_at": record.get("applied_at") if record else None,
+            }
+        )
+    return status
+
+
+def run_migrations(
+    collection,
+    migrations_collection=None,
+    target_version: Optional[int] = None,
+) -> List[Dict]:
+    """Apply pending migrations in version order and return what ran.
+
+    Applied versions are recorded in the migrations collection, so running
+    this repeatedly is cheap and only does work for new migrations.
+    """
+    records = _migrations_collection(collection, migrations_collection)
+    applied = {doc["_id"] for doc in records.find({"collection": collection.name}, {"_id": 1})}
+
+    ran: List[Dict] = []
+    for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+        if target_version is not None and migration.version > target_version:
+            break
+        record_id = _record_id(collection, migration.version)
+        if record_id in applied:
+            continue
+
+        logger.info("Applying migration %04d %s to %s", migration.version, migration.name, collection.name)
+        result = migration.apply(collection)
+        record = {
+            "collection": collection.name,
+            "version": migration.version,
+            "name": migration.name,
+            "applied_at": datetime.now(timezone.utc),
+            "result": result,
+        }
+        records.update_one({"_id": record_id}, {"$setOnInsert": record}, upsert=True)
+        ran.append(record)
+    return ran
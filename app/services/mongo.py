@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from pymongo import MongoClient, monitoring
+
+
+logger = logging.getLogger(__name__)
+
+
+class _LatencyStats:
+    __slots__ = ("count", "total_ms", "max_ms")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, value_ms: float) -> None:
+        self.count += 1
+        self.total_ms += value_ms
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "total_ms": self.total_ms,
+            "max_ms": self.max_ms,
+            "avg_ms": (self.total_ms / self.count) if self.count else 0.0,
+        }
+
+
+class MongoStats(monitoring.CommandListener, monitoring.ConnectionPoolListener):
+    """PyMongo listener that tracks pool checkouts, checkout waits and per-command latency.
+
+    Checkout waits show pool starvation, command latency shows how long Atlas
+    takes per operation; together they separate database time from app time.
+    """
+
+    def __init__(self, slow_command_ms: float = 0.0) -> None:
+        self._slow_command_ms = slow_command_ms
+        self._lock = threading.Lock()
+        # Checkout start times are per calling thread (or greenlet once patched).
+        self._local = threading.local()
+        self._commands: Dict[str, _LatencyStats] = {}
+        self._command_failures: Dict[str, int] = {}
+        self._checkout_wait = _LatencyStats()
+        self._checkout_failures: Dict[str, int] = {}
+        self._checked_out = 0
+        self._connections_open = 0
+        self._pool_clears = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "commands": {name: entry.as_dict() for name, entry in self._commands.items()},
+                "command_failures": dict(self._command_failures),
+                "checkouts": self._checkout_wait.count,
+                "checkout_wait": self._checkout_wait.as_dict(),
+                "checkout_failures": dict(self._checkout_failures),
+                "checked_out": self._checked_out,
+                "connections_open": self._connections_open,
+                "pool_clears": self._pool_clears,
+            }
+
+    # CommandListener
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        duration_ms = event.duration_micros / 1000.0
+        with self._lock:
+            self._commands.setdefault(event.command_name, _LatencyStats()).add(duration_ms)
+        if self._slow_command_ms and duration_ms >= self._slow_command_ms:
+            logger.warning("Slow MongoDB command %s took %.1f ms", event.command_name, duration_ms)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        with self._lock:
+            self._commands.setdefault(event.command_name, _LatencyStats()).add(event.duration_micros / 1000.0)
+            self._command_failures[event.command_name] = self._command_failures.get(event.command_name, 0) + 1
+
+    # ConnectionPoolListener
+
+    def connection_check_out_started(self, event: monitoring.ConnectionCheckOutStartedEvent) -> None:
+        self._local.checkout_started = time.perf_counter()
+
+    def connection_checked_out(self, event: monitoring.ConnectionCheckedOutEvent) -> None:
+        started = getattr(self._local, "checkout_started", None)
+        waited_ms = (time.perf_counter() - started) * 1000 if started is not None else 0.0
+        with self._lock:
+            self._checkout_wait.add(waited_ms)
+            self._checked_out += 1
+
+    def connection_check_out_failed(self, event: monitoring.ConnectionCheckOutFailedEvent) -> None:
+        with self._lock:
+            self._checkout_failures[event.reason] = self._checkout_failures.get(event.reason, 0) + 1
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        with self._lock:
+            self._checked_out = max(self._checked_out - 1, 0)
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        with self._lock:
+            self._connections_open += 1
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        with self._lock:
+            self._connections_open = max(self._connections_open - 1, 0)
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None:
+        pass
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        pass
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent) -> None:
+        pass
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        with self._lock:
+            self._pool_clears += 1
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        pass
+
+
+def mongo_client_options(settings) -> Dict[str, Any]:
+    """Translate the tuning fields of Settings into MongoClient keyword arguments.
+
+    Only options that were configured are returned, so anything set in the
+    connection string keeps working when the env var is absent.
+    """
+    candidates = {
+        "maxPoolSize": settings.mongo_max_pool_size,
+        "minPoolSize": settings.mongo_min_pool_size,
+        "waitQueueTimeoutMS": settings.mongo_wait_queue_timeout_ms,
+        "serverSelectionTimeoutMS": settings.mongo_server_selection_timeout_ms,
+        "connectTimeoutMS": settings.mongo_connect_timeout_ms,
+        "socketTimeoutMS": settings.mongo_socket_timeout_ms,
+        "readPreference": settings.mongo_read_preference,
+        "compressors": settings.mongo_compressors,
+    }
+    return {key: value for key, value in candidates.items() if value not in (None, "")}
+
+
+def build_mongo_client(settings, listeners: Optional[List] = None) -> MongoClient:
+    """Create the MongoClient used by the app and scripts from Settings."""
+    return MongoClient(settings.mongo_uri, event_listeners=listeners or [], **mongo_client_options(settings))
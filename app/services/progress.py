@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from bson import ObjectId
+from pymongo import ASCENDING, IndexModel, ReturnDocument, UpdateMany, UpdateOne
+
+from .seeding import DEFAULT_SEED_BATCH_SIZE
+from .users import is_valid_user_key
+
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_COLLECTION = "progress"
+
+# Bulk clears first claim documents by writing a token to ``clearing``; a claim
+# left behind by a writer that died before deleting is ignored after this long.
+CLAIM_TIMEOUT_SECONDS = 60
+
+PROGRESS_INDEXES: List[IndexModel] = [
+    # One document per collaborator and tracker item; the write key of every progress update.
+    IndexModel([("user", ASCENDING), ("question_id", ASCENDING)], name="user_question", unique=True),
+    # $lookup from tracker documents joins on question_id.
+    IndexModel([("question_id", ASCENDING), ("user", ASCENDING)], name="question_user"),
+]
+
+
+def progress_collection(collection):
+    """Return the progress collection stored next to a tracker collection.
+
+    Progress documents look like ``{user, question_id, category, value,
+    updated_at}``. Only truthy values are stored: a missing document means
+    "not done" (False for questions, 0 solved for contests).
+    """
+    return collection.database[PROGRESS_COLLECTION]
+
+
+def status_lookup_stages(user_fields: Optional[Sequence[str]] = None) -> List[Dict]:
+    """Pipeline stages that rebuild each tracker document's ``status`` map from progress.
+
+    With ``user_fields`` only those collaborators are joined; otherwise every
+    stored value is.
+    """
+    entries: object = "$_progress"
+    if user_fields is not None:
+        entries = {
+            "$filter": {"input": "$_progress", "as": "entry", "cond": {"$in": ["$$entry.user", list(user_fields)]}}
+        }
+    return [
+        {
+            "$lookup": {
+                "from": PROGRESS_COLLECTION,
+                "localField": "_id",
+                "foreignField": "question_id",
+                "as": "_progress",
+            }
+        },
+        {
+            "$addFields": {
+                "status": {
+                    "$arrayToObject": {
+                        "$map": {"input": entries, "as": "entry", "in": {"k": "$$entry.user", "v": "$$entry.value"}}
+                    }
+                }
+            }
+        },
+        {"$project": {"_progress": 0}},
+    ]
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _claim_cutoff() -> ObjectId:
+    """Claims older than this token have expired."""
+    return ObjectId.from_datetime(_now() - timedelta(seconds=CLAIM_TIMEOUT_SECONDS))
+
+
+def _unclaimed() -> Dict:
+    """Filter for documents no live bulk clear has claimed."""
+    return {"$or": [{"clearing": {"$exists": False}}, {"clearing": {"$lt": _claim_cutoff()}}]}
+
+
+def _stored(previous: Optional[Dict]) -> Optional[Dict]:
+    """Return a document read before a write, or None if it was absent or claimed by a live bulk clear."""
+    if previous is not None and "clearing" in previous and previous["clearing"] >= _claim_cutoff():
+        return None
+    return previous
+
+
+def set_flag(collection, user: str, question_id, category: str, value: bool) -> bool:
+    """Store a completion flag for one collaborator and return the previous flag.
+
+    Setting inserts a small document (or leaves the existing one alone) and
+    clearing deletes it, so each call is one single-document write. A flag
+    claimed by a running bulk clear counts as already clear: clearing leaves
+    it to the bulk clear, setting takes it back and reports it as newly set.
+    """
+    progress = progress_collection(collection)
+    key = {"user": user, "question_id": question_id}
+    if value:
+        previous = progress.find_one_and_update(
+            key,
+            {
+                "$setOnInsert": {"category": category, "value": True, "updated_at": _now()},
+                "$rename": {"clearing": "reclaimed"},
+            },
+            projection={"_id": 0, "clearing": 1},
+            upsert=True,
+            return_document=ReturnDocument.BEFORE,
+        )
+        return _stored(previous) is not None
+    return progress.delete_one(dict(key, **_unclaimed())).deleted_count == 1
+
+
+def set_count(collection, user: str, question_id, category: str, value: int):
+    """Store a solved count for one collaborator and return the previously stored raw value.
+
+    A count claimed by a running bulk clear counts as already reset: it is
+    taken back (reported as absent) when set, and left to the bulk clear when
+    reset to zero.
+    """
+    progress = progress_collection(collection)
+    key = {"user": user, "question_id": question_id}
+    if value:
+        previous = progress.find_one_and_update(
+            key,
+            {
+                "$set": {"category": category, "value": value, "updated_at": _now()},
+                "$rename": {"clearing": "reclaimed"},
+            },
+            projection={"_id": 0, "value": 1, "clearing": 1},
+            upsert=True,
+            return_document=ReturnDocument.BEFORE,
+        )
+    else:
+        previous = progress.find_one_and_delete(dict(key, **_unclaimed()), projection={"_id": 0, "value": 1})
+    return (_stored(previous) or {}).get("value")
+
+
+def _claim_and_delete(progress, user: str, filters: Sequence[Dict]) -> List:
+    """Delete one collaborator's progress matching ``filters`` and return the item ids this call deleted.
+
+    Documents are claimed with a token first, then deleted by token. The
+    claim is the moment of the clear: single writes treat claimed documents
+    as already clear, skipping them when clearing and reporting them as newly
+    set when taking them back. Taking back renames ``clearing`` to
+    ``reclaimed`` so the item is still reported here, exactly once. Costs
+    three round trips (claim, read, delete).
+    """
+    token = ObjectId()
+    claims = [
+        UpdateMany(dict(query, user=user, **_unclaimed()), {"$set": {"clearing": token}}) for query in filters
+    ]
+    if not progress.bulk_write(claims, ordered=False).modified_count:
+        return []
+    claimed = [
+        doc["question_id"]
+        for doc in progress.find(
+            {"user": user, "$or": [{"clearing": token}, {"reclaimed": token}]},
+            projection={"_id": 0, "question_id": 1},
+        )
+    ]
+    progress.delete_many({"user": user, "clearing": token})
+    return claimed
+
+
+def set_flags(collection, user: str, question_ids: Sequence, category: str, value: bool) -> List:
+    """Set or clear one collaborator's flag on many items and return the ids this call changed.
+
+    Setting is one unordered bulk of upserts tagged with a ``write_id``, read
+    back only when some items were already set. Clearing goes through
+    ``_claim_and_delete`` so items cleared concurrently by another writer are
+    not reported twice.
+    """
+    progress = progress_collection(collection)
+    if not question_ids:
+        return []
+    question_ids = list(question_ids)
+    if not value:
+        return _claim_and_delete(progress, user, [{"question_id": {"$in": question_ids}, "value": True}])
+    token = ObjectId()
+    fields = {"category": category, "value": True, "updated_at": _now(), "write_id": token}
+    result = progress.bulk_write(
+        [
+            UpdateOne({"user": user, "question_id": question_id}, {"$setOnInsert": fields}, upsert=True)
+            for question_id in question_ids
+        ],
+        ordered=False,
+    )
+    if result.upserted_count == len(question_ids):
+        return question_ids
+    return [
+        doc["question_id"]
+        for doc in progress.find(
+            {"user": user, "question_id": {"$in": question_ids}, "write_id": token},
+            projection={"_id": 0, "question_id": 1},
+        )
+    ]
+
+
+def set_counts(collection, user: str, category: str, targets: Sequence[Tuple[Any, Any, int]]) -> List:
+    """Move stored counts to new values and return the ids this call changed.
+
+    ``targets`` are ``(question_id, stored, value)`` with ``stored`` None when
+    absent. Each write only applies while the stored value is unchanged, so a
+    lost race leaves the item to the other writer. Non-zero values are one
+    bulk write tagged with a ``write_id`` that is read back only when some
+    writes did not apply; zeros go through ``_claim_and_delete``.
+    """
+    progress = progress_collection(collection)
+    changed: List = []
+    updates = [(question_id, stored, value) for question_id, stored, value in targets if value]
+    if updates:
+        token = ObjectId()
+        operations = []
+        for question_id, stored, value in updates:
+            key = {"user": user, "question_id": question_id}
+            fields = {"category": category, "value": value, "updated_at": _now(), "write_id": token}
+            if stored is None:
+                operations.append(UpdateOne(key, {"$setOnInsert": fields}, upsert=True))
+            else:
+                # A count claimed by a running bulk clear is left to it.
+                operations.append(
+                    UpdateOne(dict(key, value=stored, **_unclaimed()), {"$set": fields, "$unset": {"clearing": ""}})
+                )
+        result = progress.bulk_write(operations, ordered=False)
+        update_ids = [question_id for question_id, _stored, _value in updates]
+        if result.upserted_count + result.modified_count == len(updates):
+            changed.extend(update_ids)
+        else:
+            changed.extend(
+                doc["question_id"]
+                for doc in progress.find(
+                    {"user": user, "question_id": {"$in": update_ids}, "write_id": token},
+                    projection={"_id": 0, "question_id": 1},
+                )
+            )
+    clears = [{"question_id": question_id, "value": stored} for question_id, stored, value in targets if not value]
+    if clears:
+        changed.extend(_claim_and_delete(progress, user, clears))
+    return changed
+
+
+def prune_orphans(collection, category: str) -> int:
+    """Delete progress of a category whose tracker document no longer exists; return how many.
+
+    Closes the window where a progress write lands after its item was removed
+    by a re-seed.
+    """
+    existing = collection.distinct("_id", {"category": category})
+    return progress_collection(collection).delete_many(
+        {"category": category, "question_id": {"$nin": existing}}
+    ).deleted_count
+
+
+def import_embedded_status(
+    collection,
+    query: Optional[Dict] = None,
+    batch_size: int = DEFAULT_SEED_BATCH_SIZE,
+) -> Dict:
+    """Move ``status`` maps embedded in tracker documents into the progress collection.
+
+    Truthy values become progress documents unless one already exists for that
+    user and item (progress written through the app wins), and the embedded map
+    is then removed. Safe to repeat: documents without ``status`` are skipped.
+    """
+    progress = progress_collection(collection)
+    match = dict(query or {})
+    match["status"] = {"$exists": True}
+    counts = {"documents": 0, "imported": 0, "existing": 0}
+
+    def flush(batch: List[Dict]) -> None:
+        operations = [
+            UpdateOne(
+                {"user": user, "question_id": doc["_id"]},
+                {"$setOnInsert": {"category": doc.get("category"), "value": value, "updated_at": _now()}},
+                upsert=True,
+            )
+            for doc in batch
+            for user, value in (doc.get("status") or {}).items()
+            if value and is_valid_user_key(user)
+        ]
+        if operations:
+            result = progress.bulk_write(operations, ordered=False)
+            counts["imported"] += result.upserted_count
+            counts["existing"] += result.matched_count
+        collection.update_many({"_id": {"$in": [doc["_id"] for doc in batch]}}, {"$unset": {"status": ""}})
+        counts["documents"] += len(batch)
+
+    batch: List[Dict] = []
+    for doc in collection.find(match, projection={"category": 1, "status": 1}):
+        batch.append(doc)
+        if len(batch) >= max(batch_size, 1):
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+    if counts["documents"]:
+        logger.info("Moved embedded status of %d document(s) into %s", counts["documents"], PROGRESS_COLLECTION)
+    return counts
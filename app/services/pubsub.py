@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHANNEL = "sdetrack:events"
+
+MessageHandler = Callable[[Dict], None]
+
+
+class PubSubBackend(ABC):
+    """Minimal publish/subscribe interface used to fan events out to every worker."""
+
+    def __init__(self) -> None:
+        self._handlers: List[MessageHandler] = []
+
+    def subscribe(self, handler: MessageHandler) -> None:
+        self._handlers.append(handler)
+
+    @abstractmethod
+    def publish(self, message: Dict) -> None:
+        """Send ``message`` to the handlers of every subscribed process."""
+
+    def start(self, spawn: Callable[..., object]) -> None:
+        """Begin delivering messages; ``spawn`` starts a background task."""
+
+    def _dispatch(self, message: Dict) -> None:
+        for handler in list(self._handlers):
+            try:
+                handler(message)
+            except Exception:  # noqa: BLE001 - one bad handler must not stop delivery
+                logger.exception("Pub/sub handler failed for message type %s", message.get("type"))
+
+
+class InProcessPubSub(PubSubBackend):
+    """Deliver messages synchronously to handlers in this process only."""
+
+    def publish(self, message: Dict) -> None:
+        self._dispatch(message)
+
+
+class RedisPubSub(PubSubBackend):
+    """Fan messages out over a Redis (or Redis-protocol compatible) channel.
+
+    ``client`` may be any object implementing redis-py's ``publish`` and
+    ``pubsub`` API, which lets a local stand-in replace a real server.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        channel: str = DEFAULT_CHANNEL,
+        client=None,
+        retry_seconds: float = 1.0,
+        sleep: Optional[Callable[[float], None]] = None,
+    ) -> None:
+        super().__init__()
+        if client is None:
+            try:
+                import redis
+            except ImportError as exc:  # pragma: no cover - depends on optional package
+                raise RuntimeError("The redis package is required for a redis:// pub/sub URL.") from exc
+            client = redis.Redis.from_url(url)
+        self._client = client
+        self._channel = channel
+        self._retry_seconds = retry_seconds
+        self._sleep = sleep
+        self._stopped = threading.Event()
+
+    def publish(self, message: Dict) -> None:
+        self._client.publish(self._channel, json.dumps(message, separators=(",", ":")))
+
+    def start(self, spawn: Callable[..., object]) -> None:
+        spawn(self._listen)
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _listen(self) -> None:
+        sleep = self._sleep or self._stopped.wait
+        while not self._stopped.is_set():
+            pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self._channel)
+                while not self._stopped.is_set():
+                    raw = pubsub.get_message(timeout=1.0)
+                    if raw and raw.get("type") == "message":
+                        self._dispatch(json.loads(raw["data"]))
+            except Exception:  # noqa: BLE001 - keep listening through broker restarts
+                logger.exception("Pub/sub listener on %s failed; retrying", self._channel)
+                sleep(self._retry_seconds)
+            finally:
+                try:
+                    pubsub.close()
+                except Exception:  # noqa: BLE001
+                    pass
+
+
+def create_pubsub(url: Optional[str], channel: str = DEFAULT_CHANNEL) -> PubSubBackend:
+    """Build a backend from a URL: empty or ``memory://`` stays in-process, Redis URLs use Redis."""
+    if not url or url.startswith("memory://"):
+        return InProcessPubSub()
+    scheme = urlparse(url).scheme
+    if scheme in {"redis", "rediss", "unix"}:
+        return RedisPubSub(url, channel=channel)
+    raise ValueError(f"Unsupported pub/sub URL scheme '{scheme}'.")
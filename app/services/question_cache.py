@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from .tracker_service import (
+    CONTEST_CATEGORY,
+    DayGroupPage,
+    get_all_questions,
+    get_contest_entries,
+    group_questions_by_day,
+    stream_day_groups,
+)
+
+
+@dataclass
+class _CacheEntry:
+    version: int
+    loaded_at: float
+    data: List[Dict]
+    index: Dict[str, Dict] = field(default_factory=dict)
+    generation: int = 0
+
+
+class QuestionCache:
+    """Process-local read-through cache of normalized page data per category.
+
+    Question categories are stored grouped by day (as produced by
+    ``group_questions_by_day``) and the contest category as its ordered entry
+    list. Every category carries a version stamp that writers bump; a cached
+    entry is only served while its stamp matches. ``patch_status`` applies a
+    single status change in place and advances the stamp without a reload.
+    Every load from Mongo also gets a new generation, so ``stamp`` changes when
+    a reload picks up writes made by other processes.
+
+    Cached structures are shared between requests and must be treated as
+    read-only by callers.
+    """
+
+    def __init__(self, max_entries: int = 16, ttl_seconds: float = 600.0) -> None:
+        self._max_entries = max(max_entries, 0)
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._generation = 0
+
+    def version(self, category: str) -> int:
+        """Return the current version stamp for a category."""
+        with self._lock:
+            return self._versions.get(category, 0)
+
+    def stamp(self, category: str, data: Optional[List[Dict]] = None) -> Optional[str]:
+        """Return an HTTP validator for the cached category, or None when it is not loaded or expired.
+
+        With ``data`` the stamp is only returned while that exact object is
+        still the cached entry, so it describes what the caller served.
+        """
+        with self._lock:
+            entry = self._entries.get(category)
+            if entry is None or entry.version != self._versions.get(category, 0) or self._expired(entry):
+                return None
+            if data is not None and entry.data is not data:
+                return None
+            return f"{entry.version}.{entry.generation}"
+
+    def get_grouped_questions(self, collection, category: str) -> List[Dict]:
+        """Return the day-grouped questions for a category, loading them on a miss."""
+        return self._read_through(
+            category,
+            lambda: group_questions_by_day(get_all_questions(collection, category=category)),
+            lambda groups: {q["id"]: q for group in groups for q in group["questions"]},
+        )
+
+    def get_day_page(
+        self,
+        collection,
+        category: str,
+        after_day: Optional[int] = None,
+        limit_days: Optional[int] = None,
+    ) -> DayGroupPage:
+        """Return one page of day groups (all groups when ``limit_days`` is None).
+
+        Served by slicing the cached category, which is loaded in full on a
+        miss. With the cache disabled the page is a lazy stream over a Mongo
+        cursor that the caller iterates while rendering.
+        """
+        if not self._max_entries:
+            with self._lock:
+                self._misses += 1
+            return stream_day_groups(collection, category, after_day, limit_days)
+
+        groups = self.get_grouped_questions(collection, category)
+        stamp = self.stamp(category, groups)
+        start = 0
+        if after_day is not None:
+            while start < len(groups) and groups[start]["day"] <= after_day:
+                start += 1
+        end = start + limit_days if limit_days else len(groups)
+        page = groups[start:end]
+        next_cursor = page[-1]["day"] if page and end < len(groups) else None
+        return DayGroupPage(page, next_cursor, stamp=stamp)
+
+    def get_contest_entries(self, collection) -> List[Dict]:
+        """Return the ordered contest entries, loading them on a miss."""
+        return self._read_through(
+            CONTEST_CATEGORY,
+            lambda: get_contest_entries(collection),
+            lambda entries: {entry["id"]: entry for entry in entries if "id" in entry},
+        )
+
+    def cached_item(self, category: str, item_id: str) -> Optional[Dict]:
+        """Return the cached question or contest ``item_id`` without loading, or None.
+
+        Used by write paths to skip reading item metadata; not counted as a hit or miss.
+        """
+        with self._lock:
+            entry = self._entries.get(category)
+            if entry is None or entry.version != self._versions.get(category, 0) or self._expired(entry):
+                return None
+            return entry.index.get(item_id)
+
+    def bump(self, category: str) -> int:
+        """Invalidate a category and return its new version stamp."""
+        with self._lock:
+            self._entries.pop(category, None)
+            return self._advance(category)
+
+    def patch_status(self, category: str, item_id: str, user_field: str, value: Any) -> int:
+        """Apply a status change to the cached entry in place and return the new stamp.
+
+        Falls back to a plain ``bump`` when the category or item is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(category)
+            current = self._versions.get(category, 0)
+            item = entry.index.get(item_id) if entry and entry.version == current else None
+            if item is None:
+                self._entries.pop(category, None)
+                return self._advance(category)
+            item["status"][user_field] = value
+            entry.version = self._advance(category)
+            return entry.version
+
+    def patch_statuses(self, category: str, values: Dict[str, Any], user_field: str) -> int:
+        """Apply a batch of ``{item_id: value}`` status changes under a single new stamp.
+
+        Falls back to a plain ``bump`` when the category or any item is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(category)
+            current = self._versions.get(category, 0)
+            index = entry.index if entry and entry.version == current else {}
+            items = [index.get(item_id) for item_id in values]
+            if not index or any(item is None for item in items):
+                self._entries.pop(category, None)
+                return self._advance(category)
+            for item, value in zip(items, values.values()):
+                item["status"][user_field] = value
+            entry.version = self._advance(category)
+            return entry.version
+
+    def clear(self) -> None:
+        """Drop every cached entry and advance all known version stamps."""
+        with self._lock:
+            for category in list(self._entries):
+                self._advance(category)
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current occupancy."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "hit_ratio": (self._hits / lookups) if lookups else 0.0,
+            }
+
+    def _read_through(
+        self,
+        category: str,
+        loader: Callable[[], List[Dict]],
+        indexer: Callable[[List[Dict]], Dict[str, Dict]],
+    ) -> List[Dict]:
+        with self._lock:
+            version = self._versions.get(category, 0)
+            entry = self._entries.get(category)
+            if entry is not None and entry.version == version and not self._expired(entry):
+                self._entries.move_to_end(category)
+                self._hits += 1
+                return entry.data
+            self._misses += 1
+
+        data = loader()
+        if not self._max_entries:
+            return data
+
+        with self._lock:
+            # Only publish the load if no writer bumped the stamp in the meantime.
+            if self._versions.get(category, 0) == version:
+                self._generation += 1
+                self._entries[category] = _CacheEntry(
+                    version, time.monotonic(), data, indexer(data), self._generation
+                )
+                self._entries.move_to_end(category)
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+        return data
+
+    def _advance(self, category: str) -> int:
+        version = self._versions.get(category, 0) + 1
+        self._versions[category] = version
+        return version
+
+    def _expired(self, entry: _CacheEntry) -> bool:
+        if self._ttl_seconds <= 0:
+            return False
+        return time.monotonic() - entry.loaded_at >= self._ttl_seconds
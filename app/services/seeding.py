@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List
+
+DEFAULT_SEED_BATCH_SIZE = 500
+
+_WHITESPACE = " \t\r\n"
+_READ_SIZE = 64 * 1024
+
+
+@dataclass
+class SeedResult:
+    """Write counts accumulated across the bulk batches of one seeding run."""
+
+    inserted: int = 0
+    matched: int = 0
+    modified: int = 0
+    deleted: int = 0
+    batches: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.inserted or self.modified or self.deleted)
+
+    def as_dict(self) -> dict:
+        return {
+            "inserted": self.inserted,
+            "matched": self.matched,
+            "modified": self.modified,
+            "deleted": self.deleted,
+            "batches": self.batches,
+        }
+
+
+def iter_json_array(path: Path) -> Iterator[Any]:
+    """Yield the items of a top-level JSON array one at a time.
+
+    The file is read in fixed-size chunks, so memory use is bounded by the
+    largest single item rather than the whole file.
+    """
+    decoder = json.JSONDecoder()
+    with Path(path).open("r", encoding="utf-8") as handle:
+        buffer = ""
+        position = 0
+        eof = False
+
+        def fill() -> bool:
+            nonlocal buffer, position, eof
+            chunk = handle.read(_READ_SIZE)
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[position:] + chunk
+            position = 0
+            return True
+
+        def skip_whitespace() -> None:
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position] in _WHITESPACE:
+                    position += 1
+                if position < len(buffer) or not fill():
+                    return
+
+        skip_whitespace()
+        if position >= len(buffer) or buffer[position] != "[":
+            raise ValueError(f"{path} must contain a JSON array.")
+        position += 1
+
+        expect_item = True
+        while True:
+            skip_whitespace()
+            if position >= len(buffer):
+                raise ValueError(f"{path} ends before the JSON array is closed.")
+            char = buffer[position]
+            if char == "]":
+                return
+            if char == ",":
+                if expect_item:
+                    raise ValueError(f"{path} contains an unexpected ',' at offset {position}.")
+                position += 1
+                expect_item = True
+                continue
+            if not expect_item:
+                raise ValueError(f"{path} is missing a ',' between array items.")
+            while True:
+                try:
+                    item, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if eof or not fill():
+                        raise
+                    continue
+                # A scalar that touches the end of the buffer may continue in the next chunk.
+                if end == len(buffer) and not eof and fill():
+                    continue
+                break
+            position = end
+            expect_item = False
+            yield item
+
+
+def bulk_write_batched(collection, operations: Iterable, batch_size: int = DEFAULT_SEED_BATCH_SIZE) -> SeedResult:
+    """Send write operations as unordered ``bulk_write`` calls of ``batch_size`` each."""
+    result = SeedResult()
+    batch: List = []
+    batch_size = max(int(batch_size), 1)
+
+    def flush() -> None:
+        if not batch:
+            return
+        outcome = collection.bulk_write(batch, ordered=False)
+        result.inserted += outcome.upserted_count + outcome.inserted_count
+        result.matched += outcome.matched_count
+        result.modified += outcome.modified_count
+        result.deleted += outcome.deleted_count
+        result.batches += 1
+        batch.clear()
+
+    for operation in operations:
+        batch.append(operation)
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+    return result
@@ -1,155 +1,426 @@
 from __future__ import annotations
 
-import json
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
 
 from bson import ObjectId
+from pymongo import UpdateOne
+
+from .progress import (
+    import_embedded_status,
+    progress_collection,
+    set_count,
+    set_counts,
+    set_flag,
+    set_flags,
+    status_lookup_stages,
+)
+from .seeding import DEFAULT_SEED_BATCH_SIZE, SeedResult, bulk_write_batched, iter_json_array
+from .users import is_valid_user_key
 
 
 DEFAULT_CATEGORY = "striver"
 CONTEST_CATEGORY = "contest_tracker"
+QUESTION_CATEGORIES = (DEFAULT_CATEGORY, "binary_search")
 DEFAULT_CONTEST_PROBLEMS = 4
+USER_FIELDS = ("user_one", "user_two")
+
+# Projection profiles: the tracker-document fields each kind of caller reads.
+# Progress itself lives in the progress collection (see ``progress.py``).
+PAGE_RENDER = "page-render"
+SOCKET_DELTA = "socket-delta"
+DASHBOARD = "dashboard"
+
+QUESTION_PROJECTIONS: Dict[str, Dict[str, int]] = {
+    PAGE_RENDER: {
+        "day": 1,
+        "day_label": 1,
+        "title": 1,
+        "difficulty": 1,
+        "notes": 1,
+        "key_concept": 1,
+        "companies": 1,
+        "practice_link": 1,
+        "editorial_link": 1,
+    },
+    SOCKET_DELTA: {"category": 1, "difficulty": 1},
+    DASHBOARD: {"difficulty": 1},
+}
+CONTEST_PROJECTIONS: Dict[str, Dict[str, int]] = {
+    PAGE_RENDER: {"order": 1, "title": 1, "contest_link": 1, "max_problems": 1},
+    SOCKET_DELTA: {"category": 1, "max_problems": 1},
+    DASHBOARD: {"max_problems": 1},
+}
+
+
+class _Record:
+    """Item access (``record["title"]``, ``record.get("notes")``) for templates and callers."""
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def __contains__(self, key: str) -> bool:
+        return hasattr(self, key)
+
+
+@dataclass(slots=True)
+class QuestionRecord(_Record):
+    """A question as read for rendering; fields outside the profile stay None."""
+
+    id: str
+    day: int = 0
+    day_label: Optional[str] = None
+    title: Optional[str] = None
+    difficulty: Optional[str] = None
+    notes: Optional[str] = None
+    key_concept: Optional[str] = None
+    companies: Optional[List[str]] = None
+    practice_link: Optional[str] = None
+    editorial_link: Optional[str] = None
+    status: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class ContestRecord(_Record):
+    """A contest entry with solved counts clamped to ``max_problems``."""
+
+    id: str
+    order: Optional[int] = None
+    title: Optional[str] = None
+    contest_link: Optional[str] = None
+    max_problems: int = DEFAULT_CONTEST_PROBLEMS
+    status: Dict[str, int] = field(default_factory=dict)
 
 
 def _normalize_category(category: Optional[str]) -> str:
     return (category or DEFAULT_CATEGORY).lower()
 
 
-def _build_category_filter(category: Optional[str], include_missing_default: bool = True) -> Dict:
-    normalized = _normalize_category(category)
-    if normalized == DEFAULT_CATEGORY:
-        if include_missing_default:
-            return {"$or": [{"category": DEFAULT_CATEGORY}, {"category": {"$exists": False}}]}
-        return {"category": DEFAULT_CATEGORY}
-    return {"category": normalized}
+def _build_category_filter(category: Optional[str]) -> Dict:
+    # Legacy documents without a category are backfilled by the
+    # ``backfill_default_category`` migration, so a plain equality match suffices.
+    return {"category": _normalize_category(category)}
+
 
+QUESTION_SORT = [("day", 1), ("order", 1), ("title", 1)]
 
-def get_all_questions(collection, category: Optional[str] = None) -> List[Dict]:
+
+def question_page_pipeline(
+    category: Optional[str] = None,
+    after_day: Optional[int] = None,
+    profile: str = PAGE_RENDER,
+) -> List[Dict]:
+    """Aggregation behind ``iter_questions``: ordered questions with their ``status`` joined."""
+    query = _build_category_filter(category)
+    if after_day is not None:
+        query["day"] = {"$gt": after_day}
+    return [
+        {"$match": query},
+        {"$sort": dict(QUESTION_SORT)},
+        {"$project": QUESTION_PROJECTIONS[profile]},
+        *status_lookup_stages(),
+    ]
+
+
+def iter_questions(
+    collection,
+    category: Optional[str] = None,
+    after_day: Optional[int] = None,
+    profile: str = PAGE_RENDER,
+) -> Iterator[QuestionRecord]:
+    """Yield questions for a category in (day, order, title) order straight from the cursor.
+
+    Only the fields of the projection ``profile`` are fetched, and each
+    question's ``status`` map is joined from the progress collection in the
+    same aggregation. The cursor is closed when the generator is exhausted or
+    closed early.
+    """
+    cursor = collection.aggregate(question_page_pipeline(category, after_day, profile))
+    try:
+        for doc in cursor:
+            status = doc.get("status") or {}
+            for user_field in USER_FIELDS:
+                status.setdefault(user_field, False)
+            yield QuestionRecord(
+                id=str(doc["_id"]),
+                day=doc.get("day", 0),
+                day_label=doc.get("day_label"),
+                title=doc.get("title"),
+                difficulty=doc.get("difficulty"),
+                notes=doc.get("notes"),
+                key_concept=doc.get("key_concept"),
+                companies=doc.get("companies"),
+                practice_link=doc.get("practice_link"),
+                editorial_link=doc.get("editorial_link"),
+                status=status,
+            )
+    finally:
+        cursor.close()
+
+
+def get_all_questions(
+    collection, category: Optional[str] = None, profile: str = PAGE_RENDER
+) -> List[QuestionRecord]:
     """Fetch questions for a category ordered by section/pattern and declared order."""
-    cursor = collection.find(
-        _build_category_filter(category), sort=[("day", 1), ("order", 1), ("title", 1)]
-    )
-    questions = []
-    for doc in cursor:
-        doc["id"] = str(doc.pop("_id"))
-        doc.setdefault("status", {"user_one": False, "user_two": False})
-        if "category" not in doc:
-            doc["category"] = DEFAULT_CATEGORY
-        questions.append(doc)
-    return questions
-
-
-def group_questions_by_day(questions: List[Dict]) -> List[Dict]:
-    grouped: Dict[int, Dict] = {}
+    return list(iter_questions(collection, category, profile=profile))
+
+
+def iter_day_groups(
+    questions: Iterable[Dict],
+    limit_days: Optional[int] = None,
+    on_more: Optional[Callable[[int], None]] = None,
+) -> Iterator[Dict]:
+    """Group day-ordered questions into day groups in a single pass.
+
+    Consecutive questions with the same ``day`` form one group, so the input
+    must already be ordered by day (as ``iter_questions`` returns it); no
+    sorting happens here. With ``limit_days`` iteration stops at the first
+    question of the group after the limit and ``on_more`` receives the last
+    emitted day, which is the cursor for the next page.
+    """
+    group: Optional[Dict] = None
+    emitted = 0
     for question in questions:
-        day_number = question.get("day", 0)
-        day_label = question.get("day_label", f"Day {day_number}")
-        if day_number not in grouped:
-            grouped[day_number] = {
-                "day": day_number,
-                "label": day_label,
-                "questions": [],
-            }
-        grouped[day_number]["questions"].append(question)
-    ordered_days = sorted(grouped.values(), key=lambda d: d["day"])
-    for entry in ordered_days:
-        entry["questions"].sort(key=lambda q: q.get("order", 0))
-    return ordered_days
+        day_number = question.get("day") or 0
+        if group is None or group["day"] != day_number:
+            if group is not None:
+                yield group
+                emitted += 1
+                if limit_days and emitted >= limit_days:
+                    if on_more is not None:
+                        on_more(group["day"])
+                    return
+            group = {"day": day_number, "label": question.get("day_label") or f"Day {day_number}", "questions": []}
+        group["questions"].append(question)
+    if group is not None:
+        yield group
+
+
+def group_questions_by_day(questions: Iterable[Dict]) -> List[Dict]:
+    """Return the day groups of day-ordered questions as a list."""
+    return list(iter_day_groups(questions))
+
+
+class DayGroupPage:
+    """A page of day groups to iterate once, followed by the cursor of the next page.
+
+    ``groups`` may be a list or a lazy generator reading from Mongo; in the
+    lazy case ``next_cursor`` is only known after iteration finished, which is
+    why templates read it after the loop.
+    """
+
+    def __init__(
+        self,
+        groups: Iterable[Dict],
+        next_cursor: Optional[int] = None,
+        lazy: bool = False,
+        stamp: Optional[str] = None,
+    ) -> None:
+        self.groups = groups
+        self.next_cursor = next_cursor
+        self.lazy = lazy
+        # Question cache stamp of the data the page was sliced from; None for lazy pages.
+        self.stamp = stamp
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.groups)
+
+
+def stream_day_groups(
+    collection,
+    category: Optional[str] = None,
+    after_day: Optional[int] = None,
+    limit_days: Optional[int] = None,
+    profile: str = PAGE_RENDER,
+) -> DayGroupPage:
+    """Return a lazy page of day groups after ``after_day`` read straight from a cursor.
 
+    Nothing is read until the page is iterated; memory holds one day group at
+    a time, and with ``limit_days`` reading stops at the first question past
+    the page.
+    """
+    page = DayGroupPage((), lazy=True)
 
-def compute_progress_snapshot(collection, user_field: str, category: Optional[str] = None) -> Dict:
-    """Return totals and per-difficulty stats for a given user field."""
-    base_filter = _build_category_filter(category)
-    completed_filter = dict(base_filter)
-    completed_filter[f"status.{user_field}"] = True
-
-    total_questions = collection.count_documents(base_filter)
-    completed_total = collection.count_documents(completed_filter)
-
-    pipeline = []
-    if base_filter:
-        pipeline.append({"$match": base_filter})
-    pipeline.append(
-        {
-            "$group": {
-                "_id": "$difficulty",
-                "total": {"$sum": 1},
-                "completed": {
-                    "$sum": {
-                        "$cond": [
-                            {"$ifNull": [f"$status.{user_field}", False]},
-                            1,
-                            0,
-                        ]
-                    }
-                },
-            }
-        }
-    )
-    difficulty_results = {
+    def set_next_cursor(day_number: int) -> None:
+        page.next_cursor = day_number
+
+    def generate() -> Iterator[Dict]:
+        questions = iter_questions(collection, category, after_day, profile)
+        try:
+            yield from iter_day_groups(questions, limit_days, on_more=set_next_cursor)
+        finally:
+            questions.close()
+
+    page.groups = generate()
+    return page
+
+
+def _empty_difficulty_stats() -> Dict[str, Dict[str, int]]:
+    return {
         "Easy": {"total": 0, "completed": 0},
         "Medium": {"total": 0, "completed": 0},
         "Hard": {"total": 0, "completed": 0},
     }
-    for row in collection.aggregate(pipeline):
-        difficulty = row.get("_id", "Unknown")
-        difficulty_results.setdefault(difficulty, {"total": 0, "completed": 0})
-        difficulty_results[difficulty]["total"] = row.get("total", 0)
-        difficulty_results[difficulty]["completed"] = row.get("completed", 0)
 
-    return {
-        "total": total_questions,
-        "completed": completed_total,
-        "difficulty": difficulty_results,
+
+def compute_progress_snapshots(
+    collection, user_fields: Sequence[str], category: Optional[str] = None
+) -> Dict[str, Dict]:
+    """Return totals and per-difficulty stats for every user field using a single aggregate.
+
+    Works for any set of registered users: each one only adds an accumulator.
+    """
+    aliases = _snapshot_aliases(user_fields)
+    snapshots = {
+        field: {"total": 0, "completed": 0, "difficulty": _empty_difficulty_stats()} for field in aliases
     }
+    for row in collection.aggregate(progress_snapshot_pipeline(user_fields, category)):
+        difficulty = row.get("_id", "Unknown")
+        total = row.get("total", 0)
+        for field, alias in aliases.items():
+            completed = row.get(alias, 0)
+            snapshot = snapshots[field]
+            snapshot["total"] += total
+            snapshot["completed"] += completed
+            snapshot["difficulty"][difficulty] = {"total": total, "completed": completed}
+    return snapshots
+
+
+def _snapshot_aliases(user_fields: Sequence[str]) -> Dict[str, str]:
+    fields = [field for field in dict.fromkeys(user_fields) if is_valid_user_key(field)]
+    # Accumulator names cannot contain dots, so each user field gets a positional alias.
+    return {field: f"completed_{index}" for index, field in enumerate(fields)}
+
+
+def progress_snapshot_pipeline(user_fields: Sequence[str], category: Optional[str] = None) -> List[Dict]:
+    """Aggregation behind ``compute_progress_snapshots``: one row per difficulty with per-user counts."""
+    aliases = _snapshot_aliases(user_fields)
+    group_stage: Dict = {"_id": "$difficulty", "total": {"$sum": 1}}
+    for field, alias in aliases.items():
+        group_stage[alias] = {
+            "$sum": {
+                "$cond": [
+                    {"$ifNull": [f"$status.{field}", False]},
+                    1,
+                    0,
+                ]
+            }
+        }
+    return [
+        {"$match": _build_category_filter(category)},
+        {"$project": QUESTION_PROJECTIONS[DASHBOARD]},
+        *status_lookup_stages(list(aliases)),
+        {"$group": group_stage},
+    ]
+
+
+def compute_progress_snapshot(collection, user_field: str, category: Optional[str] = None) -> Dict:
+    """Return totals and per-difficulty stats for a given user field."""
+    return compute_progress_snapshots(collection, [user_field], category=category)[user_field]
 
 
 def build_dashboard_snapshot(
     collection,
-    user_one_field: str,
-    user_two_field: str,
+    *user_fields: str,
     category: Optional[str] = None,
 ) -> Dict:
-    """Produce a combined dashboard view for both users."""
-    user_one_stats = compute_progress_snapshot(collection, user_one_field, category=category)
-    user_two_stats = compute_progress_snapshot(collection, user_two_field, category=category)
-    return {
-        "user_one": user_one_stats,
-        "user_two": user_two_stats,
-    }
+    """Produce a combined dashboard view keyed by user field in one round trip."""
+    return compute_progress_snapshots(collection, user_fields, category=category)
 
 
-def toggle_question_status(collection, question_id: str, user_field: str, completed: bool) -> Dict:
-    """Flip the completion flag for a single question and return the updated doc."""
-    obj_id = ObjectId(question_id)
-    collection.update_one({"_id": obj_id}, {"$set": {f"status.{user_field}": completed}})
-    updated = collection.find_one({"_id": obj_id})
-    if not updated:
+def toggle_question_status(
+    collection, question_id: str, user_field: str, completed: bool, item: Optional[Dict] = None
+) -> Dict:
+    """Set the completion flag of one user on a single question and return the question.
+
+    The flag is a single small write to the progress collection. ``item``
+    carries the question's ``category`` and ``difficulty`` when the caller
+    already has them (from the question cache); otherwise the question is read
+    first, which costs a second round trip. The result carries
+    ``previous_status`` with the flag value before the write so callers can
+    adjust derived counters without re-reading.
+    """
+    if not is_valid_user_key(user_field) or not ObjectId.is_valid(question_id):
         return {}
-    updated["id"] = str(updated.pop("_id"))
-    if "category" not in updated:
-        updated["category"] = DEFAULT_CATEGORY
-    return updated
+    if item is not None:
+        question = {
+            "_id": ObjectId(question_id),
+            "category": item.get("category"),
+            "difficulty": item.get("difficulty"),
+        }
+    else:
+        question = collection.find_one({"_id": ObjectId(question_id)}, projection=QUESTION_PROJECTIONS[SOCKET_DELTA])
+    if not question:
+        return {}
+    completed = bool(completed)
+    previous = set_flag(collection, user_field, question["_id"], question.get("category"), completed)
+    question["id"] = str(question.pop("_id"))
+    question["status"] = {user_field: completed}
+    question["previous_status"] = {user_field: previous}
+    return question
 
 
-def ensure_category_seeded(collection, category: str, data_path: Path) -> None:
-    """Seed a category from a JSON file if it does not already exist in the collection."""
-    normalized = _normalize_category(category)
-    existing = collection.count_documents(_build_category_filter(normalized, include_missing_default=False))
-    if existing:
-        return
+def _object_ids(ids: Iterable[str]) -> List[ObjectId]:
+    return [ObjectId(value) for value in dict.fromkeys(str(item) for item in ids) if ObjectId.is_valid(value)]
 
-    path = Path(data_path)
-    if not path.exists():
-        raise FileNotFoundError(f"Seed file not found for category '{normalized}': {path}")
 
-    with path.open("r", encoding="utf-8") as handle:
-        records = json.load(handle)
+def bulk_set_question_status(
+    collection,
+    category: str,
+    user_field: str,
+    completed: bool,
+    day: Optional[int] = None,
+    question_ids: Optional[Sequence[str]] = None,
+) -> Dict:
+    """Set one user's flag on every question in scope with a single progress write.
+
+    The scope is ``question_ids`` when given, otherwise ``day`` within the
+    category, otherwise the whole category. Only questions whose flag actually
+    changes are written; the ones this call changed are listed under
+    ``changes`` with their previous and current values. ``exact`` is False when
+    a concurrent write changed some of them between the read and the write;
+    those are left out of ``changes`` and derived counters should be rebuilt
+    rather than adjusted.
+    """
+    if category not in QUESTION_CATEGORIES or not is_valid_user_key(user_field):
+        return {}
+    completed = bool(completed)
+    query: Dict = {"category": category}
+    if question_ids is not None:
+        query["_id"] = {"$in": _object_ids(question_ids)}
+    elif day is not None:
+        query["day"] = int(day)
+
+    pipeline = [
+        {"$match": query},
+        {"$project": QUESTION_PROJECTIONS[DASHBOARD]},
+        *status_lookup_stages([user_field]),
+        {"$match": {f"status.{user_field}": {"$ne": True} if completed else True}},
+    ]
+    changed = list(collection.aggregate(pipeline))
+    written = set(set_flags(collection, user_field, [doc["_id"] for doc in changed], category, completed))
+    return {
+        "category": category,
+        "user_field": user_field,
+        "changes": [
+            {"id": str(doc["_id"]), "difficulty": doc.get("difficulty"), "previous": not completed, "current": completed}
+            for doc in changed
+            if doc["_id"] in written
+        ],
+        "exact": len(written) == len(changed),
+    }
 
-    if not isinstance(records, list):
-        raise ValueError(f"Seed file for category '{normalized}' must contain a list of questions.")
 
+def _question_seed_operations(records: Iterable[Dict], category: str) -> Iterator[UpdateOne]:
     for index, raw in enumerate(records):
         companies_raw = raw.get("companies") or []
         if isinstance(companies_raw, str):
@@ -158,7 +429,7 @@ def ensure_category_seeded(collection, category: str, data_path: Path) -> None:
             companies_processed = list(companies_raw)
 
         document = {
-            "category": normalized,
+            "category": category,
             "day": raw.get("day", 0),
             "day_label": raw.get("day_label") or f"Pattern {raw.get('day', 0)}",
             "order": raw.get("order", index + 1),
@@ -169,146 +440,274 @@ def ensure_category_seeded(collection, category: str, data_path: Path) -> None:
             "companies": companies_processed,
             "key_concept": raw.get("key_concept"),
             "notes": raw.get("notes"),
-            "status": raw.get("status") or {"user_one": False, "user_two": False},
         }
-
         query = {
-            "category": normalized,
+            "category": category,
             "day": document["day"],
             "title": document["title"],
         }
-        collection.update_one(query, {"$set": document}, upsert=True)
+        update: Dict = {"$set": document}
+        if raw.get("status"):
+            # Seeded status only applies to new questions, so re-syncing metadata
+            # keeps progress; ``import_embedded_status`` moves it to the progress collection.
+            update["$setOnInsert"] = {"status": raw["status"]}
+        yield UpdateOne(query, update, upsert=True)
 
 
-def ensure_contests_seeded(collection, data_path: Path) -> None:
-    """Ensure contest tracker entries match the JSON seed file."""
+def ensure_category_seeded(
+    collection,
+    category: str,
+    data_path: Path,
+    batch_size: int = DEFAULT_SEED_BATCH_SIZE,
+    force: bool = False,
+) -> Optional[SeedResult]:
+    """Seed a category from a JSON file if it does not already exist in the collection.
+
+    With ``force`` the file is upserted even when the category has documents,
+    refreshing metadata while keeping existing completion status. Returns the
+    bulk write counts, or None when the category was already present.
+    """
+    normalized = _normalize_category(category)
+    if not force:
+        existing = collection.count_documents(_build_category_filter(normalized), limit=1)
+        if existing:
+            return None
+
     path = Path(data_path)
     if not path.exists():
-        raise FileNotFoundError(f"Contest seed file not found: {path}")
+        raise FileNotFoundError(f"Seed file not found for category '{normalized}': {path}")
 
-    with path.open("r", encoding="utf-8") as handle:
-        records = json.load(handle)
+    records = iter_json_array(path)
+    result = bulk_write_batched(collection, _question_seed_operations(records, normalized), batch_size)
+    import_embedded_status(collection, {"category": normalized}, batch_size)
+    return result
 
-    if not isinstance(records, list):
-        raise ValueError("Contest seed file must be a list of contest entries.")
 
-    valid_titles = set()
-    for index, raw in enumerate(records):
-        title = raw.get("title")
-        if not title:
-            continue
-        max_problems = int(raw.get("max_problems", DEFAULT_CONTEST_PROBLEMS) or DEFAULT_CONTEST_PROBLEMS)
-        max_problems = max(max_problems, 0)
-        status_raw = raw.get("status") or {}
-        status_defaults = {
-            "user_one": int(status_raw.get("user_one", 0) or 0),
-            "user_two": int(status_raw.get("user_two", 0) or 0),
-        }
-        for key, value in status_defaults.items():
-            status_defaults[key] = max(0, min(value, max_problems))
-
-        query = {
-            "category": CONTEST_CATEGORY,
-            "title": title,
-        }
-        document = {
-            "category": CONTEST_CATEGORY,
-            "order": raw.get("order", index + 1),
-            "title": title,
-            "contest_link": raw.get("contest_link"),
-            "max_problems": max_problems,
-        }
+def ensure_contests_seeded(
+    collection,
+    data_path: Path,
+    batch_size: int = DEFAULT_SEED_BATCH_SIZE,
+) -> SeedResult:
+    """Ensure contest tracker entries match the JSON seed file and return the write counts."""
+    path = Path(data_path)
+    if not path.exists():
+        raise FileNotFoundError(f"Contest seed file not found: {path}")
 
-        collection.update_one(
-            query,
-            {
-                "$set": document,
-                "$setOnInsert": {"status": status_defaults},
-            },
-            upsert=True,
-        )
-        valid_titles.add(title)
+    valid_titles = set()
 
+    def operations() -> Iterator[UpdateOne]:
+        for index, raw in enumerate(iter_json_array(path)):
+            title = raw.get("title")
+            if not title:
+                continue
+            max_problems = _contest_max_problems(raw)
+            status_raw = raw.get("status") or {}
+
+            query = {
+                "category": CONTEST_CATEGORY,
+                "title": title,
+            }
+            document = {
+                "category": CONTEST_CATEGORY,
+                "order": raw.get("order", index + 1),
+                "title": title,
+                "contest_link": raw.get("contest_link"),
+                "max_problems": max_problems,
+            }
+            valid_titles.add(title)
+            update: Dict = {"$set": document}
+            if status_raw:
+                update["$setOnInsert"] = {
+                    "status": {key: _clamp_solved(value, max_problems) for key, value in status_raw.items()}
+                }
+            yield UpdateOne(query, update, upsert=True)
+
+    result = bulk_write_batched(collection, operations(), batch_size)
+    import_embedded_status(collection, {"category": CONTEST_CATEGORY}, batch_size)
     if valid_titles:
-        collection.delete_many({"category": CONTEST_CATEGORY, "title": {"$nin": list(valid_titles)}})
-
-
-def get_contest_entries(collection) -> List[Dict]:
-    """Return contest tracker entries ordered by their configured rank."""
-    cursor = collection.find({"category": CONTEST_CATEGORY}, sort=[("order", 1), ("title", 1)])
-    entries: List[Dict] = []
-    for doc in cursor:
-        doc_id = doc.pop("_id", None)
-        if doc_id is not None:
-            doc["id"] = str(doc_id)
-        status = doc.setdefault("status", {"user_one": 0, "user_two": 0})
-        max_problems = int(doc.get("max_problems", DEFAULT_CONTEST_PROBLEMS) or DEFAULT_CONTEST_PROBLEMS)
-        max_problems = max(max_problems, 0)
-        doc["max_problems"] = max_problems
-        for key in ("user_one", "user_two"):
-            value = int(status.get(key, 0) or 0)
-            status[key] = max(0, min(value, max_problems))
-        doc["category"] = CONTEST_CATEGORY
-        entries.append(doc)
+        stale = {"category": CONTEST_CATEGORY, "title": {"$nin": list(valid_titles)}}
+        stale_ids = [doc["_id"] for doc in collection.find(stale, projection={"_id": 1})]
+        if stale_ids:
+            result.deleted += collection.delete_many({"_id": {"$in": stale_ids}}).deleted_count
+            progress_collection(collection).delete_many({"question_id": {"$in": stale_ids}})
+    return result
+
+
+def _contest_max_problems(doc: Dict) -> int:
+    max_problems = int(doc.get("max_problems", DEFAULT_CONTEST_PROBLEMS) or DEFAULT_CONTEST_PROBLEMS)
+    return max(max_problems, 0)
+
+
+def _clamp_solved(value, max_problems: int) -> int:
+    return max(0, min(int(value or 0), max_problems))
+
+
+def _contest_max_expr() -> Dict:
+    """Pipeline twin of ``_contest_max_problems``: a missing or zero max falls back to the default."""
+    stored_max = {"$toInt": {"$ifNull": ["$max_problems", 0]}}
+    return {"$cond": [{"$eq": [stored_max, 0]}, DEFAULT_CONTEST_PROBLEMS, {"$max": [stored_max, 0]}]}
+
+
+def _clamp_solved_expr(value, max_expr) -> Dict:
+    """Pipeline twin of ``_clamp_solved``."""
+    return {"$max": [0, {"$min": [{"$toInt": {"$ifNull": [value, 0]}}, max_expr]}]}
+
+
+def contest_entries_pipeline(profile: str = PAGE_RENDER) -> List[Dict]:
+    """Aggregation behind ``get_contest_entries``: contests in rank order with solved counts joined."""
+    return [
+        {"$match": {"category": CONTEST_CATEGORY}},
+        {"$sort": {"order": 1, "title": 1}},
+        {"$project": CONTEST_PROJECTIONS[profile]},
+        *status_lookup_stages(),
+    ]
+
+
+def get_contest_entries(collection, profile: str = PAGE_RENDER) -> List[ContestRecord]:
+    """Return contest tracker entries ordered by their configured rank, with solved counts joined."""
+    entries: List[ContestRecord] = []
+    for doc in collection.aggregate(contest_entries_pipeline(profile)):
+        status = doc.get("status") or {}
+        for key in USER_FIELDS:
+            status.setdefault(key, 0)
+        max_problems = _contest_max_problems(doc)
+        for key, value in status.items():
+            status[key] = _clamp_solved(value, max_problems)
+        entries.append(
+            ContestRecord(
+                id=str(doc["_id"]),
+                order=doc.get("order"),
+                title=doc.get("title"),
+                contest_link=doc.get("contest_link"),
+                max_problems=max_problems,
+                status=status,
+            )
+        )
     return entries
 
 
-def build_contest_dashboard(collection) -> Dict:
-    """Aggregate contest progress for both users in dashboard format."""
-    entries = get_contest_entries(collection)
-    user_one_total = 0
-    user_one_completed = 0
-    user_two_total = 0
-    user_two_completed = 0
+def build_contest_dashboard(collection, user_fields: Sequence[str] = USER_FIELDS) -> Dict:
+    """Aggregate contest progress for the given users in dashboard format.
+
+    Solved counts are joined from the progress collection and clamped inside
+    the pipeline, so the server returns a single summary row however many
+    contests exist.
+    """
+    fields = [field for field in dict.fromkeys(user_fields) if is_valid_user_key(field)]
+    aliases = {field: f"completed_{index}" for index, field in enumerate(fields)}
+    group_stage: Dict = {"_id": None, "contest_count": {"$sum": 1}, "total": {"$sum": "$max_problems"}}
+    for field, alias in aliases.items():
+        group_stage[alias] = {"$sum": _clamp_solved_expr(f"$status.{field}", "$max_problems")}
+    pipeline = [
+        {"$match": {"category": CONTEST_CATEGORY}},
+        {"$project": CONTEST_PROJECTIONS[DASHBOARD]},
+        *status_lookup_stages(fields),
+        {"$project": {"_id": 0, "status": 1, "max_problems": _contest_max_expr()}},
+        {"$group": group_stage},
+    ]
+    row = next(iter(collection.aggregate(pipeline)), None) or {}
+    return _contest_dashboard(
+        row.get("total", 0),
+        {field: row.get(alias, 0) for field, alias in aliases.items()},
+        row.get("contest_count", 0),
+    )
+
 
+def contest_dashboard_from_entries(entries: Sequence[Dict], user_fields: Sequence[str] = USER_FIELDS) -> Dict:
+    """Build the contest dashboard from entries already returned by ``get_contest_entries``."""
+    total = 0
+    completed = {field: 0 for field in user_fields}
     for entry in entries:
-        max_problems = entry.get("max_problems", DEFAULT_CONTEST_PROBLEMS) or DEFAULT_CONTEST_PROBLEMS
-        user_one_total += max_problems
-        user_two_total += max_problems
-        status = entry.get("status", {})
-        user_one_completed += int(status.get("user_one", 0) or 0)
-        user_two_completed += int(status.get("user_two", 0) or 0)
+        total += entry.get("max_problems", 0)
+        status = entry.get("status") or {}
+        for field in completed:
+            completed[field] += status.get(field, 0)
+    return _contest_dashboard(total, completed, len(entries))
 
-    return {
-        "user_one": {
-            "total": user_one_total,
-            "completed": user_one_completed,
-            "difficulty": {},
-        },
-        "user_two": {
-            "total": user_two_total,
-            "completed": user_two_completed,
-            "difficulty": {},
-        },
-        "metadata": {
-            "contest_count": len(entries),
-        },
+
+def _contest_dashboard(total: int, completed: Dict[str, int], contest_count: int) -> Dict:
+    dashboard: Dict = {
+        field: {"total": total, "completed": value, "difficulty": {}} for field, value in completed.items()
     }
+    dashboard["metadata"] = {"contest_count": contest_count}
+    return dashboard
 
 
-def update_contest_solved(collection, contest_id: str, user_field: str, solved: int) -> Dict:
-    """Persist solved count for a contest entry and return the updated document."""
-    if user_field not in {"user_one", "user_two"}:
+def update_contest_solved(
+    collection, contest_id: str, user_field: str, solved: int, item: Optional[Dict] = None
+) -> Dict:
+    """Persist one user's solved count for a contest entry and return the entry.
+
+    The clamped count is a single small write to the progress collection.
+    ``item`` carries the contest's ``max_problems`` when the caller already has
+    it (from the question cache); otherwise the contest is read first. Like
+    ``toggle_question_status``, the result includes ``previous_status`` with
+    the clamped solved count before the write.
+    """
+    if not is_valid_user_key(user_field) or not ObjectId.is_valid(contest_id):
         return {}
 
-    obj_id = ObjectId(contest_id)
-    existing = collection.find_one({"_id": obj_id, "category": CONTEST_CATEGORY})
-    if not existing:
+    if item is not None:
+        contest = {"_id": ObjectId(contest_id), "max_problems": item.get("max_problems")}
+    else:
+        contest = collection.find_one(
+            {"_id": ObjectId(contest_id), "category": CONTEST_CATEGORY}, projection=CONTEST_PROJECTIONS[SOCKET_DELTA]
+        )
+    if not contest:
         return {}
 
-    max_problems = int(existing.get("max_problems", DEFAULT_CONTEST_PROBLEMS) or DEFAULT_CONTEST_PROBLEMS)
-    max_problems = max(max_problems, 0)
-    value = int(solved or 0)
-    value = max(0, min(value, max_problems))
+    max_problems = _contest_max_problems(contest)
+    current = _clamp_solved(solved, max_problems)
+    previous = set_count(collection, user_field, contest["_id"], CONTEST_CATEGORY, current)
+    return {
+        "id": str(contest["_id"]),
+        "category": CONTEST_CATEGORY,
+        "max_problems": max_problems,
+        "status": {user_field: current},
+        "previous_status": {user_field: _clamp_solved(previous, max_problems)},
+    }
+
 
-    collection.update_one({"_id": obj_id}, {"$set": {f"status.{user_field}": value}})
-    updated = collection.find_one({"_id": obj_id})
-    if not updated:
+def bulk_set_contest_solved(
+    collection,
+    user_field: str,
+    completed: bool,
+    contest_ids: Optional[Sequence[str]] = None,
+) -> Dict:
+    """Mark contests fully solved (or reset them to zero) for one user in one ``bulk_write``.
+
+    The scope is ``contest_ids`` when given, otherwise every contest. The
+    result has the same shape as ``bulk_set_question_status``. Each write is
+    conditioned on the value that was read, so ``exact`` turns False (and the
+    contest is left out of ``changes``) when a concurrent write got there first.
+    """
+    if not is_valid_user_key(user_field):
         return {}
+    query: Dict = {"category": CONTEST_CATEGORY}
+    if contest_ids is not None:
+        query["_id"] = {"$in": _object_ids(contest_ids)}
+    pipeline = [
+        {"$match": query},
+        {"$project": CONTEST_PROJECTIONS[DASHBOARD]},
+        *status_lookup_stages([user_field]),
+    ]
+
+    changes: Dict = {}
+    targets = []
+    for doc in collection.aggregate(pipeline):
+        max_problems = _contest_max_problems(doc)
+        stored = (doc.get("status") or {}).get(user_field)
+        previous = _clamp_solved(stored, max_problems)
+        current = max_problems if completed else 0
+        if previous == current:
+            continue
+        changes[doc["_id"]] = {"id": str(doc["_id"]), "difficulty": None, "previous": previous, "current": current}
+        targets.append((doc["_id"], stored, current))
 
-    updated["id"] = str(updated.pop("_id"))
-    status = updated.setdefault("status", {"user_one": 0, "user_two": 0})
-    status[user_field] = value
-    updated.setdefault("max_problems", max_problems)
-    updated["category"] = CONTEST_CATEGORY
-    return updated
+    written = set(set_counts(collection, user_field, CONTEST_CATEGORY, targets))
+    return {
+        "category": CONTEST_CATEGORY,
+        "user_field": user_field,
+        "changes": [change for contest_id, change in changes.items() if contest_id in written],
+        "exact": len(written) == len(changes),
+    }
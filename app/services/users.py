@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, List, Sequence, Tuple
+
+from pymongo import UpdateOne
+
+
+USERS_COLLECTION = "users"
+
+# Keys are used as progress ``user`` values and as field names in status maps
+# and aggregation aliases, so they are restricted to a safe alphabet.
+USER_KEY_PATTERN = re.compile(r"^[a-z][a-z0-9_]{0,31}$")
+
+
+def is_valid_user_key(key) -> bool:
+    return isinstance(key, str) and bool(USER_KEY_PATTERN.match(key))
+
+
+def users_collection(collection):
+    """Return the user registry stored next to a tracker collection."""
+    return collection.database[USERS_COLLECTION]
+
+
+def sync_users(collection, users: Sequence[Tuple[str, str]]) -> List[Dict]:
+    """Register the configured ``(key, name)`` collaborators and return every registered user.
+
+    Configured users are upserted with their display name and position, in one
+    bulk write. Users registered earlier but no longer configured stay in the
+    registry.
+    """
+    registry = users_collection(collection)
+    operations = [
+        UpdateOne({"_id": key}, {"$set": {"name": name, "order": index}}, upsert=True)
+        for index, (key, name) in enumerate(users)
+        if is_valid_user_key(key)
+    ]
+    if operations:
+        registry.bulk_write(operations, ordered=False)
+    return list_users(collection)
+
+
+def list_users(collection) -> List[Dict]:
+    """Return registered users as ``{"key", "name"}`` dicts in display order."""
+    return [
+        {"key": doc["_id"], "name": doc.get("name") or doc["_id"]}
+        for doc in users_collection(collection).find({}, sort=[("order", 1), ("_id", 1)])
+        if is_valid_user_key(doc["_id"])
+    ]
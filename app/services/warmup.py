@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from pymongo.errors import PyMongoError
+
+from .seeding import DEFAULT_SEED_BATCH_SIZE, SeedResult
+from .tracker_service import (
+    CONTEST_CATEGORY,
+    _build_category_filter,
+    ensure_category_seeded,
+    ensure_contests_seeded,
+)
+
+
+logger = logging.getLogger(__name__)
+
+SEED_MANIFEST_COLLECTION = "seed_manifest"
+
+
+@dataclass(frozen=True)
+class SeedSource:
+    category: str
+    filename: str
+    contests: bool = False
+
+
+# Categories that are seeded from files shipped in app/static/data.
+SEED_SOURCES: Tuple[SeedSource, ...] = (
+    SeedSource("binary_search", "binary_search_questions.json"),
+    SeedSource(CONTEST_CATEGORY, "contest_tracker.json", contests=True),
+)
+
+
+def _manifest_collection(collection):
+    return collection.database[SEED_MANIFEST_COLLECTION]
+
+
+def clear_seed_manifest(collection) -> int:
+    """Forget the synced fingerprints of a tracker collection so the next warm-up re-seeds it.
+
+    Scripts that delete tracker documents outside the app call this, otherwise
+    the manifest would still claim the wiped categories are up to date.
+    """
+    prefix = re.escape(f"{collection.name}:")
+    return _manifest_collection(collection).delete_many({"_id": {"$regex": f"^{prefix}"}}).deleted_count
+
+
+class SeedWarmup:
+    """Seed every registered category once, re-syncing only when a seed file changes.
+
+    Each file is fingerprinted by SHA-256. The fingerprint of the last
+    successful sync is stored in a manifest collection, so restarts with
+    unchanged files do no seeding writes, and local mtime/size checks avoid
+    re-hashing files that have not been touched. A fingerprint is only trusted
+    while the category still has documents, so data deleted behind the app's
+    back is re-seeded.
+    """
+
+    def __init__(
+        self,
+        collection,
+        data_dir: Path,
+        batch_size: int = DEFAULT_SEED_BATCH_SIZE,
+        on_change: Optional[Callable[[str, SeedResult], None]] = None,
+        manifest_collection=None,
+    ) -> None:
+        self._collection = collection
+        self._data_dir = Path(data_dir)
+        self._batch_size = batch_size
+        self._on_change = on_change
+        self._manifest = (
+            manifest_collection
+            if manifest_collection is not None
+            else _manifest_collection(collection)
+        )
+        self._stat_cache: Dict[Path, Tuple[int, int, str]] = {}
+        self._synced: Dict[str, str] = {}
+
+    def run(self) -> Dict[str, SeedResult]:
+        """Sync every source whose file changed since the last run and return the results."""
+        results: Dict[str, SeedResult] = {}
+        for source in SEED_SOURCES:
+            try:
+                result = self._sync(source)
+            except (OSError, ValueError, PyMongoError) as exc:
+                logger.warning("Seeding %s failed: %s", source.category, exc)
+                continue
+            if result is not None:
+                results[source.category] = result
+        return results
+
+    def watch(self, interval: float, sleep: Callable[[float], None]) -> None:
+        """Re-run the warm-up every ``interval`` seconds; intended for a background task."""
+        while True:
+            sleep(interval)
+            try:
+                self.run()
+            except Exception:
+                # A malformed seed entry must not end the thread and stop reloading for good.
+                logger.exception("Seed warm-up pass failed; retrying in %ss", interval)
+
+    def _sync(self, source: SeedSource) -> Optional[SeedResult]:
+        path = self._data_dir / source.filename
+        if not path.exists():
+            logger.warning("Seed file for %s missing at %s; keeping existing data", source.category, path)
+            return None
+
+        digest = self._fingerprint(path)
+        manifest_id = f"{self._collection.name}:{source.category}"
+        if self._synced.get(source.category) != digest:
+            manifest = self._manifest.find_one({"_id": manifest_id}) or {}
+            if manifest.get("sha256") == digest:
+                self._synced[source.category] = digest
+        if self._synced.get(source.category) == digest and self._has_documents(source.category):
+            return None
+
+        if source.contests:
+            result = ensure_contests_seeded(self._collection, path, batch_size=self._batch_size)
+        else:
+            result = ensure_category_seeded(
+                self._collection, source.category, path, batch_size=self._batch_size, force=True
+            )
+
+        self._manifest.update_one(
+            {"_id": manifest_id},
+            {"$set": {"sha256": digest, "file": source.filename, "synced_at": datetime.now(timezone.utc)}},
+            upsert=True,
+        )
+        self._synced[source.category] = digest
+        logger.info("Synced %s from %s: %s", source.category, source.filename, result.as_dict())
+        if result.changed and self._on_change is not None:
+            self._on_change(source.category, result)
+        return result
+
+    def _has_documents(self, category: str) -> bool:
+        return bool(self._collection.count_documents(_build_category_filter(category), limit=1))
+
+    def _fingerprint(self, path: Path) -> str:
+        stat = os.stat(path)
+        cached = self._stat_cache.get(path)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        self._stat_cache[path] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
@@ -1,21 +1,77 @@
+from functools import wraps
+
 from flask import current_app, request
 from flask_socketio import SocketIO, emit, join_room
+from pymongo.errors import PyMongoError
+
+from .services.history import record_changes
 
 from .services.tracker_service import (
-    build_dashboard_snapshot,
-    build_contest_dashboard,
+    CONTEST_CATEGORY,
+    QUESTION_CATEGORIES,
+    bulk_set_contest_solved,
+    bulk_set_question_status,
     toggle_question_status,
     update_contest_solved,
 )
 
 
-VALID_USER_FIELDS = {"user_one", "user_two"}
 VALID_CATEGORIES = {"striver", "binary_search", "contest_tracker"}
+# bulk_toggle scopes: one day group, an explicit id list, or the whole category.
+BULK_SCOPES = {"day", "ids", "category"}
+MAX_BULK_IDS = 1000
+
+# Bump when the progress_delta payload shape changes; clients ignore unknown versions.
+DELTA_SCHEMA_VERSION = 1
 
 
 def register_socketio_events(socketio: SocketIO) -> None:
     """Attach Socket.IO event handlers for real-time updates."""
 
+    # sid -> (category, counters version) of the dashboard sent on connect, so the
+    # request_dashboard that main.js sends right after connecting can be skipped.
+    connect_snapshots = {}
+    # sid -> category room joined on connect, for the connected-clients gauge.
+    client_rooms = {}
+
+    def _timed(event: str):
+        def decorator(handler):
+            @wraps(handler)
+            def wrapper(*args, **kwargs):
+                metrics = current_app.metrics
+                try:
+                    with metrics.time("sdetrack_socketio_handler_duration_seconds", event=event):
+                        return handler(*args, **kwargs)
+                except Exception:
+                    metrics.inc("sdetrack_socketio_handler_errors_total", event=event)
+                    raise
+
+            return wrapper
+
+        return decorator
+
+    def _emit_to_room(event: str, payload, room: str) -> None:
+        socketio.emit(event, payload, room=room)
+        current_app.metrics.record_emit(event, room, payload)
+
+    def _emit_to_sender(event: str, payload, room: str) -> None:
+        emit(event, payload, to=request.sid)
+        current_app.metrics.record_emit(event, room, payload)
+
+    def _cached_question(question_id):
+        """Category and difficulty of a question in the sender's cached page, or None."""
+        category = client_rooms.get(request.sid)
+        if category not in QUESTION_CATEGORIES:
+            return None
+        question = current_app.question_cache.cached_item(category, question_id)
+        if question is None:
+            return None
+        return {"category": category, "difficulty": question.get("difficulty")}
+
+    def _cached_contest(contest_id):
+        contest = current_app.question_cache.cached_item(CONTEST_CATEGORY, contest_id)
+        return {"max_problems": contest.get("max_problems")} if contest is not None else None
+
     def _resolve_category(raw_category):
         if not raw_category:
             return "striver"
@@ -24,16 +80,10 @@ def register_socketio_events(socketio: SocketIO) -> None:
             return normalized
         return "striver"
 
-    def _build_dashboard_payload(category: str):
-        collection = current_app.tracker_collection
-        if category == "contest_tracker":
-            dashboard = build_contest_dashboard(collection)
-        else:
-            dashboard = build_dashboard_snapshot(
-                collection,
-                "user_one",
-                "user_two",
-                category=category,
+    def _build_dashboard_payload(category: str, dashboard=None):
+        if dashboard is None:
+            dashboard = current_app.db_executor.run(
+                current_app.dashboard_counters.get, current_app.tracker_collection, category
             )
         return {
             "dashboard": dashboard,
@@ -42,82 +92,223 @@ def register_socketio_events(socketio: SocketIO) -> None:
             "category": category,
         }
 
+    def _build_delta(kind: str, category: str, item_id: str, user_field: str, value, difficulty=None):
+        delta = {
+            "v": DELTA_SCHEMA_VERSION,
+            "kind": kind,
+            "category": category,
+            "id": item_id,
+            "user_field": user_field,
+            "value": value,
+            "sequence": current_app.dashboard_broadcaster.next_sequence(category),
+        }
+        counters = current_app.dashboard_counters.user_counters(category, user_field, difficulty)
+        if counters is not None:
+            delta["counters"] = counters
+        return delta
+
+    def _build_bulk_delta(kind: str, category: str, user_field: str, changes):
+        difficulties = {change.get("difficulty") for change in changes}
+        delta = {
+            "v": DELTA_SCHEMA_VERSION,
+            "kind": kind,
+            "category": category,
+            "user_field": user_field,
+            "values": {change["id"]: change["current"] for change in changes},
+            "sequence": current_app.dashboard_broadcaster.next_sequence(category),
+        }
+        counters = current_app.dashboard_counters.user_counters(category, user_field, *difficulties)
+        if counters is not None:
+            delta["counters"] = counters
+        return delta
+
+    def _record_history(category: str, user_field: str, changes) -> None:
+        # Runs after the broadcasts so the history write never delays what clients see.
+        if not current_app.config["HISTORY_ENABLED"]:
+            return
+        try:
+            current_app.db_executor.run(
+                record_changes, current_app.tracker_collection, user_field, category, changes
+            )
+        except PyMongoError as exc:
+            current_app.logger.warning("Could not record progress history for '%s': %s", category, exc)
+
     @socketio.on("connect")  # type: ignore[misc]
-    def handle_connect():
+    @_timed("connect")
+    def handle_connect(auth=None):
         category = _resolve_category(request.args.get("category"))
         join_room(category)
-        emit("dashboard_sync", _build_dashboard_payload(category))
+        dashboard, version = current_app.db_executor.run(
+            current_app.dashboard_counters.snapshot, current_app.tracker_collection, category
+        )
+        broadcaster = current_app.dashboard_broadcaster
+        _emit_to_sender(
+            "dashboard_sync", broadcaster.stamp(category, _build_dashboard_payload(category, dashboard)), category
+        )
+        if version is not None:
+            connect_snapshots[request.sid] = (category, version)
+        # Counted only once the connect succeeded, so a failed snapshot does not leak the gauge.
+        if request.sid not in client_rooms:
+            client_rooms[request.sid] = category
+            current_app.metrics.gauge_add("sdetrack_socketio_connected_clients", 1, room=category)
+
+    @socketio.on("disconnect")  # type: ignore[misc]
+    def handle_disconnect():
+        connect_snapshots.pop(request.sid, None)
+        category = client_rooms.pop(request.sid, None)
+        if category is not None:
+            current_app.metrics.gauge_add("sdetrack_socketio_connected_clients", -1, room=category)
 
     @socketio.on("request_dashboard")  # type: ignore[misc]
+    @_timed("request_dashboard")
     def handle_dashboard_request(payload=None):
         payload = payload or {}
         category = _resolve_category(payload.get("category"))
         join_room(category)
-        emit("dashboard_sync", _build_dashboard_payload(category), to=request.sid)
+        sent_on_connect = connect_snapshots.pop(request.sid, None)
+        if sent_on_connect == (category, current_app.dashboard_counters.version(category)):
+            return
+        broadcaster = current_app.dashboard_broadcaster
+        _emit_to_sender("dashboard_sync", broadcaster.stamp(category, _build_dashboard_payload(category)), category)
 
     @socketio.on("toggle_status")  # type: ignore[misc]
+    @_timed("toggle_status")
     def handle_toggle(payload):
         payload = payload or {}
         question_id = payload.get("question_id")
         user_field = payload.get("user_field")
         completed = bool(payload.get("completed", False))
 
-        if not question_id or user_field not in VALID_USER_FIELDS:
+        if not question_id or user_field not in current_app.user_fields:
             return
 
         collection = current_app.tracker_collection
-        updated_question = toggle_question_status(collection, question_id, user_field, completed)
+        updated_question = current_app.db_executor.run(
+            toggle_question_status, collection, question_id, user_field, completed, _cached_question(question_id)
+        )
         if not updated_question:
             return
 
         category = _resolve_category(updated_question.get("category"))
+        previous = updated_question.pop("previous_status", {}).get(user_field, False)
+        current = updated_question.get("status", {}).get(user_field, False)
+        current_app.change_fanout.question_changed(
+            category,
+            updated_question["id"],
+            user_field,
+            updated_question.get("difficulty"),
+            previous,
+            current,
+        )
 
-        socketio.emit(
-            "status_updated",
-            {
-                "question": updated_question,
-                "user_field": user_field,
-                "category": category,
-            },
-            room=category,
+        _emit_to_room(
+            "progress_delta",
+            _build_delta(
+                "question",
+                category,
+                updated_question["id"],
+                user_field,
+                bool(current),
+                difficulty=updated_question.get("difficulty"),
+            ),
+            category,
         )
-        socketio.emit(
-            "dashboard_sync",
-            _build_dashboard_payload(category),
-            room=category,
+        current_app.dashboard_broadcaster.schedule(category, _build_dashboard_payload)
+        _record_history(
+            category,
+            user_field,
+            [
+                {
+                    "id": updated_question["id"],
+                    "difficulty": updated_question.get("difficulty"),
+                    "previous": previous,
+                    "current": current,
+                }
+            ],
         )
 
     @socketio.on("update_contest_solved")  # type: ignore[misc]
+    @_timed("update_contest_solved")
     def handle_contest_update(payload):
         payload = payload or {}
         contest_id = payload.get("contest_id")
         user_field = payload.get("user_field")
         solved = payload.get("solved")
 
-        if not contest_id or user_field not in VALID_USER_FIELDS:
+        if not contest_id or user_field not in current_app.user_fields:
             return
 
         collection = current_app.tracker_collection
-        updated_contest = update_contest_solved(collection, contest_id, user_field, solved)
+        updated_contest = current_app.db_executor.run(
+            update_contest_solved, collection, contest_id, user_field, solved, _cached_contest(contest_id)
+        )
         if not updated_contest:
             return
 
         category = _resolve_category(updated_contest.get("category"))
-        dashboard_payload = _build_dashboard_payload(category)
-
-        contest_payload = {
-            "contest": updated_contest,
-            "user_field": user_field,
-        }
-        contest_payload.update(dashboard_payload)
-
-        socketio.emit(
-            "contest_progress_updated",
-            contest_payload,
-            room=category,
+        previous = updated_contest.pop("previous_status", {}).get(user_field, 0)
+        current = updated_contest.get("status", {}).get(user_field, 0)
+        current_app.change_fanout.contest_changed(category, updated_contest["id"], user_field, previous, current)
+        _emit_to_room(
+            "progress_delta",
+            _build_delta("contest", category, updated_contest["id"], user_field, current),
+            category,
         )
-        socketio.emit(
-            "dashboard_sync",
-            dashboard_payload,
-            room=category,
+        current_app.dashboard_broadcaster.schedule(category, _build_dashboard_payload)
+        _record_history(
+            category,
+            user_field,
+            [{"id": updated_contest["id"], "difficulty": None, "previous": previous, "current": current}],
         )
+
+    @socketio.on("bulk_toggle")  # type: ignore[misc]
+    @_timed("bulk_toggle")
+    def handle_bulk_toggle(payload):
+        """Mark or clear a day, an id list or a whole category; acknowledges with the changed ids."""
+        payload = payload or {}
+        user_field = payload.get("user_field")
+        scope = payload.get("scope")
+        completed = bool(payload.get("completed", False))
+        category = _resolve_category(payload.get("category"))
+
+        if user_field not in current_app.user_fields or scope not in BULK_SCOPES:
+            return
+        ids = None
+        day = None
+        if scope == "ids":
+            ids = payload.get("ids")
+            if not isinstance(ids, list) or not ids or len(ids) > MAX_BULK_IDS:
+                return
+        elif scope == "day":
+            try:
+                day = int(payload.get("day"))
+            except (TypeError, ValueError):
+                return
+            if category == CONTEST_CATEGORY:
+                return
+
+        collection = current_app.tracker_collection
+        if category == CONTEST_CATEGORY:
+            result = current_app.db_executor.run(bulk_set_contest_solved, collection, user_field, completed, ids)
+        else:
+            result = current_app.db_executor.run(
+                bulk_set_question_status, collection, category, user_field, completed, day, ids
+            )
+        if not result:
+            return {"ids": []}
+        # Only the items this call changed; ones a concurrent writer got to first
+        # are left out, so neither the delta nor the history repeats them.
+        changes = result["changes"]
+        if not result["exact"]:
+            # A concurrent write overlapped the batch; rebuild rather than adjust counters.
+            current_app.change_fanout.category_invalidated(category)
+        elif changes:
+            current_app.change_fanout.bulk_changed(category, user_field, changes)
+        if not changes:
+            return {"ids": []}
+
+        kind = "contest_bulk" if category == CONTEST_CATEGORY else "question_bulk"
+        _emit_to_room("progress_delta", _build_bulk_delta(kind, category, user_field, changes), category)
+        current_app.dashboard_broadcaster.schedule(category, _build_dashboard_payload)
+        _record_history(category, user_field, changes)
+        return {"ids": [change["id"] for change in changes]}
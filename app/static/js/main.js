@@ -2,6 +2,8 @@
   const category = (window.APP_CATEGORY || 'striver').toLowerCase();
   const socket = io({ query: { category } });
   const isContestTracker = category === 'contest_tracker';
+  let lastDashboardSequence = 0;
+  const DELTA_SCHEMA_VERSION = 1;
 
   const getRowByQuestionId = (questionId) =>
     document.querySelector(`tr[data-question-id="${questionId}"]`);
@@ -9,14 +11,14 @@
   const getContestRow = (contestId) =>
     document.querySelector(`tr[data-contest-id="${contestId}"]`);
 
-  const updateCheckboxState = (question, userField) => {
-    const row = getRowByQuestionId(question.id);
+  const setCheckboxState = (questionId, userField, checked) => {
+    const row = getRowByQuestionId(questionId);
     if (!row) {
       return;
     }
     const checkbox = row.querySelector(`.status-checkbox[data-user-field="${userField}"]`);
     if (checkbox) {
-      checkbox.checked = Boolean(question.status?.[userField]);
+      checkbox.checked = Boolean(checked);
     }
   };
 
@@ -79,8 +81,8 @@
     });
   };
 
-  const updateContestInputState = (contest, userField) => {
-    const row = getContestRow(contest.id);
+  const setContestInputState = (contestId, userField, solved) => {
+    const row = getContestRow(contestId);
     if (!row) {
       return;
     }
@@ -90,13 +92,38 @@
     }
     const parsedMax = parseInt(input.getAttribute('data-max-problems') || '0', 10);
     const max = Number.isFinite(parsedMax) ? Math.max(parsedMax, 0) : 0;
-    const value = Number(contest?.status?.[userField]);
+    const value = Number(solved);
     if (Number.isFinite(value)) {
       const clamped = Math.min(Math.max(Math.round(value), 0), max);
       input.value = String(clamped);
     }
   };
 
+  // Apply the counters carried by a progress delta to a single user's card.
+  const applyDeltaCounters = (userField, counters) => {
+    const card = document.querySelector(`[data-user-card="${userField}"]`);
+    if (!card || !counters) {
+      return;
+    }
+    const completedSpan = card.querySelector(`[data-progress-completed="${userField}"]`);
+    if (completedSpan) {
+      completedSpan.textContent = counters.completed ?? 0;
+    }
+    const total = Math.max(counters.total ?? 0, 1);
+    const progressBar = card.querySelector(`[data-progress-bar="${userField}"]`);
+    if (progressBar) {
+      const percent = ((counters.completed ?? 0) / total) * 100;
+      progressBar.style.width = `${percent.toFixed(1)}%`;
+      progressBar.setAttribute('aria-valuenow', percent.toFixed(1));
+    }
+    Object.entries(counters.difficulty || {}).forEach(([difficulty, completed]) => {
+      const label = card.querySelector(`[data-difficulty-list] [data-difficulty-completed="${difficulty}"]`);
+      if (label) {
+        label.textContent = completed ?? 0;
+      }
+    });
+  };
+
   const clampSolvedValue = (value, min, max) => {
     const numeric = Number(value);
     if (!Number.isFinite(numeric)) {
@@ -162,8 +189,110 @@
     });
   };
 
-  document.querySelectorAll('.status-checkbox').forEach((checkbox) => {
-    checkbox.addEventListener('change', handleCheckboxChange);
+  // Delegated so rows from lazily loaded day groups are covered too.
+  document.addEventListener('change', (event) => {
+    const target = event.target;
+    if (target instanceof HTMLInputElement && target.classList.contains('status-checkbox')) {
+      handleCheckboxChange(event);
+    }
+  });
+
+  // Day groups beyond the first page are fetched when the sentinel scrolls into
+  // view (or its "Load more" button is clicked). Question deltas received while
+  // a page is in flight are replayed onto it, since its rows may predate them.
+  const pendingRowDeltas = new Map();
+  let dayGroupsLoading = false;
+  let dayGroupsObserver = null;
+
+  const observeDaySentinel = () => {
+    const sentinel = document.querySelector('[data-day-sentinel]');
+    if (sentinel && dayGroupsObserver) {
+      dayGroupsObserver.observe(sentinel);
+    }
+  };
+
+  const loadMoreDayGroups = async (sentinel) => {
+    const url = sentinel?.getAttribute('data-next-url');
+    if (!url || dayGroupsLoading) {
+      return;
+    }
+    dayGroupsLoading = true;
+    pendingRowDeltas.clear();
+    try {
+      const response = await fetch(url, { headers: { Accept: 'text/html' } });
+      if (!response.ok) {
+        throw new Error(`HTTP ${response.status}`);
+      }
+      const template = document.createElement('template');
+      template.innerHTML = await response.text();
+      if (dayGroupsObserver) {
+        dayGroupsObserver.unobserve(sentinel);
+      }
+      const container = sentinel.parentElement;
+      sentinel.replaceWith(template.content);
+      pendingRowDeltas.forEach(({ id, userField, value }) => setCheckboxState(id, userField, value));
+      container?.dispatchEvent(new CustomEvent('daygroups:loaded', { bubbles: true }));
+      observeDaySentinel();
+    } catch (_) {
+      // keep the sentinel; the next scroll or click retries
+    } finally {
+      pendingRowDeltas.clear();
+      dayGroupsLoading = false;
+    }
+  };
+
+  if ('IntersectionObserver' in window) {
+    dayGroupsObserver = new IntersectionObserver(
+      (entries) => {
+        entries.forEach((entry) => {
+          if (entry.isIntersecting) {
+            loadMoreDayGroups(entry.target);
+          }
+        });
+      },
+      { rootMargin: '400px 0px' },
+    );
+    observeDaySentinel();
+  }
+
+  // Day/pattern and contest-set buttons send one bulk_toggle; rows and counters
+  // follow from the single progress_delta the server broadcasts back.
+  const handleBulkToggle = (button) => {
+    const scope = button.getAttribute('data-scope');
+    const payload = {
+      category,
+      scope,
+      user_field: button.getAttribute('data-user-field'),
+      completed: button.getAttribute('data-completed') === 'true',
+    };
+    if (scope === 'day') {
+      const day = Number(button.closest('[data-day]')?.getAttribute('data-day'));
+      if (!Number.isFinite(day)) {
+        return;
+      }
+      payload.day = day;
+    }
+    const confirmation = button.getAttribute('data-confirm');
+    if (confirmation && !window.confirm(confirmation)) {
+      return;
+    }
+    button.disabled = true;
+    socket.emit('bulk_toggle', payload, () => {
+      button.disabled = false;
+    });
+  };
+
+  document.addEventListener('click', (event) => {
+    const target = event.target instanceof Element ? event.target : null;
+    const button = target?.closest('[data-load-more]');
+    if (button) {
+      loadMoreDayGroups(button.closest('[data-day-sentinel]'));
+      return;
+    }
+    const bulkButton = target?.closest('[data-bulk-toggle]');
+    if (bulkButton) {
+      handleBulkToggle(bulkButton);
+    }
   });
 
   const handleContestInputChange = (event) => {
@@ -207,32 +336,57 @@
     });
   }
 
-  socket.on('status_updated', ({ question, user_field: userField, category: updateCategory }) => {
-    if (!question || !userField) {
-      return;
-    }
-    if (updateCategory && updateCategory !== category) {
-      return;
-    }
-    updateCheckboxState(question, userField);
-  });
-
   socket.on('dashboard_sync', (payload) => {
     if (payload?.category && payload.category !== category) {
       return;
     }
+    // Broadcasts are coalesced server-side; ignore any that arrive out of order.
+    const sequence = Number(payload?.sequence);
+    if (Number.isFinite(sequence)) {
+      if (sequence <= lastDashboardSequence) {
+        return;
+      }
+      lastDashboardSequence = sequence;
+    }
     updateDashboard(payload);
   });
 
-  socket.on('contest_progress_updated', (payload) => {
-    if (!payload || payload.category !== category) {
+  socket.on('progress_delta', (delta) => {
+    if (!delta || delta.category !== category) {
       return;
     }
-    const { contest, user_field: userField } = payload;
-    if (contest && userField) {
-      updateContestInputState(contest, userField);
+    if (delta.v !== DELTA_SCHEMA_VERSION) {
+      // Unknown payload shape (e.g. mid-deploy): fall back to a full sync.
+      socket.emit('request_dashboard', { category });
+      return;
+    }
+    const { id, user_field: userField, value } = delta;
+    const isBulk = delta.kind === 'question_bulk' || delta.kind === 'contest_bulk';
+    if (!userField || (!id && !isBulk)) {
+      return;
+    }
+    const isContest = delta.kind === 'contest' || delta.kind === 'contest_bulk';
+    const applyRow = (rowId, rowValue) => {
+      if (isContest) {
+        setContestInputState(rowId, userField, rowValue);
+        return;
+      }
+      // Rows of groups that are not loaded yet are skipped; only the counters below apply.
+      setCheckboxState(rowId, userField, rowValue);
+      if (dayGroupsLoading) {
+        pendingRowDeltas.set(`${rowId}:${userField}`, { id: rowId, userField, value: rowValue });
+      }
+    };
+    if (isBulk) {
+      Object.entries(delta.values || {}).forEach(([rowId, rowValue]) => applyRow(rowId, rowValue));
+    } else {
+      applyRow(id, value);
+    }
+    const sequence = Number(delta.sequence);
+    if (delta.counters && Number.isFinite(sequence) && sequence > lastDashboardSequence) {
+      lastDashboardSequence = sequence;
+      applyDeltaCounters(userField, delta.counters);
     }
-    updateDashboard(payload);
   });
 
   socket.emit('request_dashboard', { category });
@@ -245,7 +399,7 @@
   }
 
   const applySavedState = () => {
-    document.querySelectorAll('[data-day-body].collapse').forEach((el) => {
+    document.querySelectorAll('[data-day-body].collapse:not(.show)').forEach((el) => {
       const key = `day-open-#${el.id}`;
       const shouldOpen = localStorage.getItem(key) === '1';
       if (shouldOpen) {
@@ -257,16 +411,21 @@
     });
   };
 
-  document.addEventListener('DOMContentLoaded', () => {
-    applySavedState();
+  const isDayBody = (target) => target instanceof Element && target.matches('[data-day-body]');
 
-    document.querySelectorAll('[data-day-body].collapse').forEach((el) => {
-      el.addEventListener('shown.bs.collapse', () => {
-        localStorage.setItem(`day-open-#${el.id}`, '1');
-      });
-      el.addEventListener('hidden.bs.collapse', () => {
-        localStorage.removeItem(`day-open-#${el.id}`);
-      });
-    });
+  document.addEventListener('DOMContentLoaded', applySavedState);
+  // Lazily loaded day groups restore their saved state as they arrive.
+  document.addEventListener('daygroups:loaded', applySavedState);
+
+  // Collapse events bubble, so one listener covers groups added later.
+  document.addEventListener('shown.bs.collapse', (event) => {
+    if (isDayBody(event.target)) {
+      localStorage.setItem(`day-open-#${event.target.id}`, '1');
+    }
+  });
+  document.addEventListener('hidden.bs.collapse', (event) => {
+    if (isDayBody(event.target)) {
+      localStorage.removeItem(`day-open-#${event.target.id}`);
+    }
   });
 })();
@@ -0,0 +1,263 @@
+"""Benchmark tracker_service functions against a local mongod at several dataset sizes.
+
+Usage:
+    python benchmarks/bench_tracker_service.py --sizes 1000,10000,100000
+    python benchmarks/bench_tracker_service.py --save-baseline benchmarks/results/baseline.json
+    python benchmarks/bench_tracker_service.py --compare benchmarks/results/baseline.json
+
+The benchmark drops and refills its own database (``sdetrack_bench`` by
+default); never point it at the database the app uses.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pymongo
+from pymongo import MongoClient
+
+# Ensure project root is on sys.path when running as a script (python benchmarks/bench_tracker_service.py)
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.services.indexes import ensure_tracker_indexes
+from app.services.mongo import MongoStats
+from app.services.tracker_service import (
+    CONTEST_CATEGORY,
+    DEFAULT_CATEGORY,
+    build_contest_dashboard,
+    build_dashboard_snapshot,
+    compute_progress_snapshot,
+    ensure_category_seeded,
+    ensure_contests_seeded,
+    get_all_questions,
+    get_contest_entries,
+    group_questions_by_day,
+    toggle_question_status,
+    update_contest_solved,
+)
+from benchmarks.generate_dataset import write_dataset
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark tracker_service against a local MongoDB")
+    parser.add_argument("--uri", default="mongodb://localhost:27017", help="MongoDB URI of the benchmark server.")
+    parser.add_argument("--db", default="sdetrack_bench", help="Database to create and drop.")
+    parser.add_argument(
+        "--sizes",
+        default="1000,10000,100000",
+        help="Comma separated question counts to benchmark.",
+    )
+    parser.add_argument("--contests", type=int, default=500, help="Contests generated for each size.")
+    parser.add_argument("--iterations", type=int, default=20, help="Timed calls per function.")
+    parser.add_argument("--warmup", type=int, default=2, help="Untimed calls per function before measuring.")
+    parser.add_argument("--seed", type=int, default=42, help="Dataset and workload random seed.")
+    parser.add_argument("--save-baseline", type=Path, help="Write the results to this JSON file.")
+    parser.add_argument("--compare", type=Path, help="Compare the results with a saved baseline JSON file.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=20.0,
+        help="p95 slowdown in percent that --compare reports as a regression (exit status 1).",
+    )
+    return parser.parse_args()
+
+
+def _percentile(samples: List[float], percent: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(int(round(percent / 100.0 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def _command_count(stats: MongoStats) -> int:
+    return sum(entry["count"] for entry in stats.stats()["commands"].values())
+
+
+def measure(
+    stats: MongoStats,
+    fn: Callable[[], object],
+    iterations: int,
+    warmup: int,
+) -> Dict[str, float]:
+    """Time ``fn`` and count the MongoDB commands (round trips) each call sends."""
+    for _ in range(warmup):
+        fn()
+    samples: List[float] = []
+    commands_before = _command_count(stats)
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    round_trips = (_command_count(stats) - commands_before) / max(iterations, 1)
+    return {
+        "iterations": iterations,
+        "mean_ms": statistics.fmean(samples) if samples else 0.0,
+        "p50_ms": _percentile(samples, 50),
+        "p95_ms": _percentile(samples, 95),
+        "p99_ms": _percentile(samples, 99),
+        "max_ms": max(samples) if samples else 0.0,
+        "round_trips": round_trips,
+    }
+
+
+def bench_size(
+    client: MongoClient,
+    stats: MongoStats,
+    db_name: str,
+    questions: int,
+    contests: int,
+    iterations: int,
+    warmup: int,
+    seed: int,
+) -> Dict[str, Dict[str, float]]:
+    client.drop_database(db_name)
+    collection = client[db_name]["questions"]
+    ensure_tracker_indexes(collection)
+    rng = random.Random(seed)
+    results: Dict[str, Dict[str, float]] = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        questions_path, contests_path = write_dataset(Path(tmp), questions, contests, seed=seed)
+        # Seeding writes data, so it is timed once on an empty collection and
+        # once more as a no-op re-sync of unchanged files.
+        results["ensure_category_seeded"] = measure(
+            stats, lambda: ensure_category_seeded(collection, DEFAULT_CATEGORY, questions_path), 1, 0
+        )
+        results["ensure_contests_seeded"] = measure(
+            stats, lambda: ensure_contests_seeded(collection, contests_path), 1, 0
+        )
+        results["ensure_category_seeded_resync"] = measure(
+            stats,
+            lambda: ensure_category_seeded(collection, DEFAULT_CATEGORY, questions_path, force=True),
+            1,
+            0,
+        )
+
+    question_ids = [str(doc["_id"]) for doc in collection.find({"category": DEFAULT_CATEGORY}, {"_id": 1})]
+    contest_ids = [str(doc["_id"]) for doc in collection.find({"category": CONTEST_CATEGORY}, {"_id": 1})]
+    loaded = get_all_questions(collection, DEFAULT_CATEGORY)
+
+    cases: Dict[str, Callable[[], object]] = {
+        "get_all_questions": lambda: get_all_questions(collection, DEFAULT_CATEGORY),
+        "group_questions_by_day": lambda: group_questions_by_day(loaded),
+        "compute_progress_snapshot": lambda: compute_progress_snapshot(collection, "user_one", DEFAULT_CATEGORY),
+        "build_dashboard_snapshot": lambda: build_dashboard_snapshot(
+            collection, "user_one", "user_two", category=DEFAULT_CATEGORY
+        ),
+        "get_contest_entries": lambda: get_contest_entries(collection),
+        "build_contest_dashboard": lambda: build_contest_dashboard(collection),
+        "toggle_question_status": lambda: toggle_question_status(
+            collection, rng.choice(question_ids), rng.choice(("user_one", "user_two")), rng.random() < 0.5
+        ),
+        "update_contest_solved": lambda: update_contest_solved(
+            collection, rng.choice(contest_ids), rng.choice(("user_one", "user_two")), rng.randint(0, 4)
+        ),
+    }
+    for name, fn in cases.items():
+        results[name] = measure(stats, fn, iterations, warmup)
+    return results
+
+
+def print_results(results: Dict[str, Dict[str, Dict[str, float]]]) -> None:
+    header = f"{'size':>8}  {'function':<30} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'trips':>7}"
+    print(header)
+    print("-" * len(header))
+    for size, functions in results.items():
+        for name, row in functions.items():
+            print(
+                f"{size:>8}  {name:<30} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} "
+                f"{row['p99_ms']:>9.2f} {row['max_ms']:>9.2f} {row['round_trips']:>7.1f}"
+            )
+
+
+def compare_results(
+    baseline: Dict[str, Dict[str, Dict[str, float]]],
+    current: Dict[str, Dict[str, Dict[str, float]]],
+    threshold: float,
+) -> List[str]:
+    """Print p50/p95 changes against a baseline and return the regressed rows."""
+    regressions: List[str] = []
+    print(f"{'size':>8}  {'function':<30} {'p50 Δ%':>8} {'p95 Δ%':>8} {'trips':>12}")
+    for size, functions in current.items():
+        for name, row in functions.items():
+            base = baseline.get(size, {}).get(name)
+            if base is None:
+                continue
+            p50_change = _change(base["p50_ms"], row["p50_ms"])
+            p95_change = _change(base["p95_ms"], row["p95_ms"])
+            trips = f"{base['round_trips']:.1f}->{row['round_trips']:.1f}"
+            flag = ""
+            if p95_change > threshold or row["round_trips"] > base["round_trips"]:
+                regressions.append(f"{size}/{name}")
+                flag = "  REGRESSION"
+            print(f"{size:>8}  {name:<30} {p50_change:>+8.1f} {p95_change:>+8.1f} {trips:>12}{flag}")
+    return regressions
+
+
+def _change(before: float, after: float) -> float:
+    if before <= 0:
+        return 0.0
+    return (after - before) / before * 100.0
+
+
+def _environment(args: argparse.Namespace, client: MongoClient) -> Dict[str, object]:
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pymongo": pymongo.version,
+        "mongodb": client.server_info().get("version"),
+        "iterations": args.iterations,
+        "contests": args.contests,
+        "seed": args.seed,
+    }
+
+
+def main() -> Optional[int]:
+    args = parse_args()
+    sizes = [int(value) for value in args.sizes.split(",") if value.strip()]
+
+    stats = MongoStats()
+    client = MongoClient(args.uri, event_listeners=[stats])
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    try:
+        environment = _environment(args, client)
+        for size in sizes:
+            results[str(size)] = bench_size(
+                client, stats, args.db, size, args.contests, args.iterations, args.warmup, args.seed
+            )
+    finally:
+        client.drop_database(args.db)
+        client.close()
+
+    print_results(results)
+
+    if args.save_baseline:
+        args.save_baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.save_baseline.write_text(json.dumps({"environment": environment, "results": results}, indent=2))
+        print(f"Saved baseline to {args.save_baseline}.")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        print(f"\nCompared with {args.compare} ({baseline.get('environment', {}).get('created_at', 'unknown date')}):")
+        regressions = compare_results(baseline.get("results", {}), results, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    return None
+
+
+if __name__ == "__main__":
+    sys.exit(main())
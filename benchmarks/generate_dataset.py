@@ -0,0 +1,116 @@
+"""Generate synthetic seed files in the same shape as app/static/data.
+
+Usage:
+    python benchmarks/generate_dataset.py --questions 100000 --contests 2000 --out-dir /tmp/sdetrack-bench
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+from pathlib import Path
+from typing import Dict, Iterator, Tuple
+
+DIFFICULTIES = ("Easy", "Medium", "Hard")
+COMPANIES = ("Amazon", "Google", "Microsoft", "Facebook", "Apple", "Adobe", "Uber", "Flipkart")
+USER_FIELDS = ("user_one", "user_two")
+
+QUESTIONS_FILENAME = "questions.json"
+CONTESTS_FILENAME = "contests.json"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate synthetic question and contest seed files")
+    parser.add_argument("--questions", type=int, default=10_000, help="Number of questions to generate.")
+    parser.add_argument("--contests", type=int, default=500, help="Number of contests to generate.")
+    parser.add_argument("--per-day", type=int, default=7, help="Questions per day group.")
+    parser.add_argument(
+        "--completion",
+        type=float,
+        default=0.5,
+        help="Fraction of questions/contest problems marked solved for each user (0 disables status).",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Random seed; the same seed yields the same files.")
+    parser.add_argument("--out-dir", type=Path, default=Path("benchmarks/data"), help="Directory to write into.")
+    return parser.parse_args()
+
+
+def iter_questions(count: int, per_day: int, completion: float, rng: random.Random) -> Iterator[Dict]:
+    per_day = max(per_day, 1)
+    for index in range(count):
+        day = index // per_day + 1
+        record = {
+            "day": day,
+            "day_label": f"Day {day}: Synthetic Topic {day}",
+            "order": index % per_day + 1,
+            "title": f"Synthetic Question {index + 1}",
+            "difficulty": rng.choice(DIFFICULTIES),
+            "companies": rng.sample(COMPANIES, k=rng.randint(0, 3)),
+            "key_concept": f"Concept {rng.randint(1, 50)}",
+            "practice_link": f"https://example.com/problems/synthetic-{index + 1}/",
+            "notes": "",
+        }
+        if completion > 0:
+            record["status"] = {field: rng.random() < completion for field in USER_FIELDS}
+        yield record
+
+
+def iter_contests(count: int, completion: float, rng: random.Random) -> Iterator[Dict]:
+    for index in range(count):
+        max_problems = 4
+        record = {
+            "order": index + 1,
+            "title": f"Synthetic Contest {index + 1}",
+            "contest_link": f"https://example.com/contest/synthetic-{index + 1}/",
+            "max_problems": max_problems,
+        }
+        if completion > 0:
+            record["status"] = {
+                field: sum(rng.random() < completion for _ in range(max_problems)) for field in USER_FIELDS
+            }
+        yield record
+
+
+def _write_array(path: Path, records: Iterator[Dict]) -> int:
+    # Written record by record so 100k+ datasets never sit in memory as one list.
+    written = 0
+    with path.open("w", encoding="utf-8") as handle:
+        handle.write("[\n")
+        for record in records:
+            if written:
+                handle.write(",\n")
+            handle.write(json.dumps(record))
+            written += 1
+        handle.write("\n]\n")
+    return written
+
+
+def write_dataset(
+    out_dir: Path,
+    questions: int,
+    contests: int,
+    per_day: int = 7,
+    completion: float = 0.5,
+    seed: int = 42,
+) -> Tuple[Path, Path]:
+    """Write the question and contest seed files and return their paths."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    questions_path = out_dir / QUESTIONS_FILENAME
+    contests_path = out_dir / CONTESTS_FILENAME
+    _write_array(questions_path, iter_questions(questions, per_day, completion, rng))
+    _write_array(contests_path, iter_contests(contests, completion, rng))
+    return questions_path, contests_path
+
+
+def main() -> None:
+    args = parse_args()
+    questions_path, contests_path = write_dataset(
+        args.out_dir, args.questions, args.contests, args.per_day, args.completion, args.seed
+    )
+    print(f"Wrote {args.questions} question(s) to {questions_path} and {args.contests} contest(s) to {contests_path}.")
+
+
+if __name__ == "__main__":
+    main()
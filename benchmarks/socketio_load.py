@@ -0,0 +1,475 @@
+"""Load-test the real-time path with many concurrent Socket.IO collaborators.
+
+Starts the app (gunicorn + eventlet, like the Procfile) against a local
+MongoDB, seeds a throwaway database, and connects ``--clients`` Socket.IO
+clients spread across the three category rooms exactly like ``main.js``
+(``?category=...``). Each client then replays a weighted mix of
+``toggle_status``, ``update_contest_solved`` and reconnects.
+
+Reported per run:
+- end-to-end latency from an emit to every ``progress_delta`` it causes in
+  the room, and to the next ``dashboard_sync`` seen by the sender;
+- dropped events: room members connected at emit time that never received
+  the ``progress_delta``;
+- server CPU and resident memory sampled from /proc (Linux only).
+
+Usage:
+    pip install -r benchmarks/requirements.txt
+    python benchmarks/socketio_load.py --clients 200 --duration 60 --mix toggle=70,contest=20,reconnect=10
+    python benchmarks/socketio_load.py --url http://127.0.0.1:8000 --server-pid 1234   # existing server
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+import socketio
+from pymongo import MongoClient
+
+# Ensure project root is on sys.path when running as a script (python benchmarks/socketio_load.py)
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.services.indexes import ensure_tracker_indexes
+from app.services.tracker_service import (
+    CONTEST_CATEGORY,
+    QUESTION_CATEGORIES,
+    ensure_category_seeded,
+    ensure_contests_seeded,
+)
+from benchmarks.bench_tracker_service import _percentile
+from benchmarks.generate_dataset import write_dataset
+
+CATEGORIES = QUESTION_CATEGORIES + (CONTEST_CATEGORY,)
+USER_FIELDS = ("user_one", "user_two")
+ACTIONS = ("toggle", "contest", "reconnect")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Socket.IO load test for the real-time tracker path")
+    parser.add_argument("--clients", type=int, default=50, help="Concurrent Socket.IO clients.")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to generate load.")
+    parser.add_argument("--rate", type=float, default=1.0, help="Actions per second per client.")
+    parser.add_argument(
+        "--mix",
+        default="toggle=70,contest=20,reconnect=10",
+        help="Weighted action mix, e.g. toggle=70,contest=20,reconnect=10.",
+    )
+    parser.add_argument("--drain", type=float, default=5.0, help="Seconds to wait for late events after the run.")
+    parser.add_argument("--questions", type=int, default=200, help="Synthetic questions per question category.")
+    parser.add_argument("--contests", type=int, default=50, help="Synthetic contests.")
+    parser.add_argument("--seed", type=int, default=42, help="Dataset and workload random seed.")
+    parser.add_argument("--mongo-uri", default="mongodb://localhost:27017", help="MongoDB URI for the test server.")
+    parser.add_argument("--db", default="sdetrack_loadtest", help="Database to create and drop.")
+    parser.add_argument("--port", type=int, default=0, help="Port for the spawned server (default: a free port).")
+    parser.add_argument("--workers", type=int, default=1, help="Gunicorn eventlet workers for the spawned server.")
+    parser.add_argument("--url", help="Target an already running server instead of spawning one.")
+    parser.add_argument("--server-pid", type=int, help="PID to sample CPU/memory from when using --url.")
+    return parser.parse_args()
+
+
+def parse_mix(raw: str) -> Dict[str, float]:
+    weights: Dict[str, float] = {}
+    for part in raw.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ACTIONS:
+            raise SystemExit(f"Unknown action '{name}' in --mix; expected one of {', '.join(ACTIONS)}.")
+        weights[name] = float(weight or 1)
+    if not weights or sum(weights.values()) <= 0:
+        raise SystemExit("--mix needs at least one action with a positive weight.")
+    return weights
+
+
+# ---------------------------------------------------------------------------
+# Server lifecycle and resource sampling
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def seed_database(mongo_uri: str, db_name: str, questions: int, contests: int, seed: int) -> Dict[str, List[Dict]]:
+    """Fill a fresh database and return the ids the clients will act on, per category."""
+    client = MongoClient(mongo_uri)
+    client.drop_database(db_name)
+    collection = client[db_name]["questions"]
+    ensure_tracker_indexes(collection)
+    with tempfile.TemporaryDirectory() as tmp:
+        questions_path, contests_path = write_dataset(Path(tmp), questions, contests, seed=seed)
+        for category in QUESTION_CATEGORIES:
+            ensure_category_seeded(collection, category, questions_path)
+        ensure_contests_seeded(collection, contests_path)
+    targets = {
+        category: list(collection.find({"category": category}, {"_id": 1, "max_problems": 1}))
+        for category in CATEGORIES
+    }
+    client.close()
+    return targets
+
+
+def start_server(args: argparse.Namespace, port: int) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        MONGO_URI=args.mongo_uri,
+        MONGO_DB_NAME=args.db,
+        MONGO_COLLECTION_NAME="questions",
+        # The load test seeds its own data; startup seeding would replace the synthetic contests.
+        SEED_WARMUP="off",
+    )
+    command = [
+        sys.executable,
+        "-m",
+        "gunicorn",
+        "--worker-class",
+        "eventlet",
+        "-w",
+        str(args.workers),
+        "-b",
+        f"127.0.0.1:{port}",
+        "wsgi:app",
+    ]
+    return subprocess.Popen(command, cwd=PROJECT_ROOT, env=env)
+
+
+def wait_for_server(url: str, process: Optional[subprocess.Popen], timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise SystemExit(f"Server exited early with status {process.returncode}.")
+        try:
+            with urllib.request.urlopen(url, timeout=2):
+                return
+        except urllib.error.HTTPError:
+            return  # the server answered, even if with an error page
+        except Exception:  # noqa: BLE001 - not up yet
+            time.sleep(0.25)
+    raise SystemExit(f"Server at {url} did not become ready within {timeout:.0f}s.")
+
+
+def _process_tree(root_pid: int) -> List[int]:
+    """Return ``root_pid`` and its descendants (gunicorn master plus workers)."""
+    children: Dict[int, List[int]] = defaultdict(list)
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            fields = (entry / "stat").read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        children[int(fields[1])].append(int(entry.name))
+    tree, stack = [], [root_pid]
+    while stack:
+        pid = stack.pop()
+        tree.append(pid)
+        stack.extend(children.get(pid, []))
+    return tree
+
+
+def _cpu_seconds_and_rss(pids: List[int]) -> Tuple[float, int]:
+    ticks = os.sysconf("SC_CLK_TCK")
+    cpu, rss_kb = 0.0, 0
+    for pid in pids:
+        try:
+            fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+            cpu += (int(fields[11]) + int(fields[12])) / ticks
+            for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+                if line.startswith("VmRSS:"):
+                    rss_kb += int(line.split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+    return cpu, rss_kb
+
+
+class ResourceSampler(threading.Thread):
+    """Sample CPU percent and RSS of a process tree once per second from /proc."""
+
+    def __init__(self, pid: int, interval: float = 1.0) -> None:
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.cpu_percent: List[float] = []
+        self.rss_mb: List[float] = []
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        if not Path("/proc").exists():
+            return
+        last_cpu, _ = _cpu_seconds_and_rss(_process_tree(self.pid))
+        last_time = time.monotonic()
+        while not self._stopped.wait(self.interval):
+            cpu, rss_kb = _cpu_seconds_and_rss(_process_tree(self.pid))
+            now = time.monotonic()
+            self.cpu_percent.append((cpu - last_cpu) / max(now - last_time, 1e-6) * 100.0)
+            self.rss_mb.append(rss_kb / 1024.0)
+            last_cpu, last_time = cpu, now
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+
+# ---------------------------------------------------------------------------
+# Clients and event accounting
+
+
+class Tracker:
+    """Shared bookkeeping that matches broadcasts back to the emits that caused them."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.members: Dict[str, Set[int]] = defaultdict(set)
+        # (kind, id, user_field, value) -> FIFO of [emitted_at, expected client ids, received client ids]
+        self._pending: Dict[Tuple, Deque[list]] = defaultdict(deque)
+        self.delta_latency: List[float] = []
+        self.sync_latency: List[float] = []
+        self.emitted: Dict[str, int] = defaultdict(int)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def joined(self, room: str, client_id: int) -> None:
+        with self._lock:
+            self.members[room].add(client_id)
+
+    def left(self, room: str, client_id: int) -> None:
+        with self._lock:
+            self.members[room].discard(client_id)
+
+    def emitted_change(self, action: str, room: str, key: Tuple) -> float:
+        with self._lock:
+            now = time.perf_counter()
+            self._pending[key].append([now, set(self.members[room]), set()])
+            self.emitted[action] += 1
+            return now
+
+    def count(self, action: str) -> None:
+        with self._lock:
+            self.emitted[action] += 1
+
+    def received_sync(self, emitted_at: List[float]) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            self.sync_latency.extend((now - started) * 1000 for started in emitted_at)
+
+    def received_delta(self, key: Tuple, client_id: int) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            for record in self._pending.get(key, ()):
+                if client_id in record[1] and client_id not in record[2]:
+                    record[2].add(client_id)
+                    self.delta_latency.append((now - record[0]) * 1000)
+                    return
+
+    def dropped(self) -> Tuple[int, int]:
+        """Return (missing deliveries, expected deliveries)."""
+        with self._lock:
+            expected = missing = 0
+            for records in self._pending.values():
+                for _emitted_at, members, received in records:
+                    expected += len(members)
+                    missing += len(members - received)
+            return missing, expected
+
+
+class LoadClient:
+    def __init__(self, client_id: int, url: str, room: str, tracker: Tracker, targets: List[Dict]) -> None:
+        self.client_id = client_id
+        self.url = url
+        self.room = room
+        self.tracker = tracker
+        self.targets = targets
+        self.sync_waiting: List[float] = []
+        self._lock = threading.Lock()
+        self.sio = socketio.Client(reconnection=False)
+        self.sio.on("progress_delta", self._on_delta)
+        self.sio.on("dashboard_sync", self._on_sync)
+        self.sio.on("disconnect", self._on_disconnect)
+
+    def connect(self) -> None:
+        self.sio.connect(f"{self.url}?category={self.room}", transports=["websocket"], wait_timeout=10)
+        self.tracker.joined(self.room, self.client_id)
+
+    def disconnect(self) -> None:
+        self.tracker.left(self.room, self.client_id)
+        if self.sio.connected:
+            self.sio.disconnect()
+
+    def reconnect(self) -> None:
+        self.disconnect()
+        self.connect()
+        self.sio.emit("request_dashboard", {"category": self.room})
+
+    def act(self, action: str, rng: random.Random) -> None:
+        if action == "reconnect":
+            self.tracker.count("reconnect")
+            self.reconnect()
+            return
+        target = rng.choice(self.targets)
+        user_field = rng.choice(USER_FIELDS)
+        item_id = str(target["_id"])
+        if self.room == CONTEST_CATEGORY:
+            value = rng.randint(0, int(target.get("max_problems") or 4))
+            emitted_at = self.tracker.emitted_change("contest", self.room, ("contest", item_id, user_field, value))
+            payload = {"contest_id": item_id, "user_field": user_field, "solved": value, "category": self.room}
+            event = "update_contest_solved"
+        else:
+            value = rng.random() < 0.5
+            emitted_at = self.tracker.emitted_change("toggle", self.room, ("question", item_id, user_field, value))
+            payload = {"question_id": item_id, "user_field": user_field, "completed": value, "category": self.room}
+            event = "toggle_status"
+        with self._lock:
+            self.sync_waiting.append(emitted_at)
+        self.sio.emit(event, payload)
+
+    def _on_delta(self, delta) -> None:
+        key = (delta.get("kind"), delta.get("id"), delta.get("user_field"), delta.get("value"))
+        self.tracker.received_delta(key, self.client_id)
+
+    def _on_sync(self, _payload) -> None:
+        with self._lock:
+            waiting, self.sync_waiting = self.sync_waiting, []
+        self.tracker.received_sync(waiting)
+
+    def _on_disconnect(self, *_args) -> None:
+        self.tracker.left(self.room, self.client_id)
+
+
+def run_client(client: LoadClient, args: argparse.Namespace, weights: Dict[str, float], stop_at: float) -> None:
+    rng = random.Random(args.seed + client.client_id)
+    actions = list(weights)
+    while time.monotonic() < stop_at:
+        time.sleep(rng.expovariate(args.rate) if args.rate > 0 else 1.0)
+        action = rng.choices(actions, weights=[weights[name] for name in actions])[0]
+        # Question rooms cannot update contests and vice versa; use the room's own write.
+        if action == "contest" and client.room != CONTEST_CATEGORY:
+            action = "toggle"
+        elif action == "toggle" and client.room == CONTEST_CATEGORY:
+            action = "contest"
+        try:
+            client.act(action, rng)
+        except Exception as exc:  # noqa: BLE001 - count and keep the load going
+            client.tracker.errors[type(exc).__name__] += 1
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+
+
+def _summary(samples: List[float]) -> str:
+    if not samples:
+        return "no samples"
+    return (
+        f"n={len(samples)} p50={_percentile(samples, 50):.1f} p95={_percentile(samples, 95):.1f} "
+        f"p99={_percentile(samples, 99):.1f} max={max(samples):.1f} ms"
+    )
+
+
+def report(tracker: Tracker, sampler: Optional[ResourceSampler], duration: float) -> None:
+    missing, expected = tracker.dropped()
+    total_actions = sum(tracker.emitted.values())
+    print(f"Actions: {dict(tracker.emitted)} ({total_actions / max(duration, 1e-6):.1f}/s)")
+    print(f"progress_delta latency (emit -> each room member): {_summary(tracker.delta_latency)}")
+    print(f"dashboard_sync latency (emit -> sender's next sync): {_summary(tracker.sync_latency)}")
+    ratio = (missing / expected * 100.0) if expected else 0.0
+    print(f"Dropped progress_delta deliveries: {missing}/{expected} ({ratio:.2f}%)")
+    if tracker.errors:
+        print(f"Client errors: {dict(tracker.errors)}")
+    if sampler is not None and sampler.cpu_percent:
+        print(
+            f"Server CPU: avg={sum(sampler.cpu_percent) / len(sampler.cpu_percent):.1f}% "
+            f"max={max(sampler.cpu_percent):.1f}%  RSS: max={max(sampler.rss_mb):.1f} MiB"
+        )
+    elif sampler is not None:
+        print("Server CPU/memory: not available (needs /proc).")
+
+
+def main() -> None:
+    args = parse_args()
+    weights = parse_mix(args.mix)
+
+    process: Optional[subprocess.Popen] = None
+    mongo_uri = args.mongo_uri
+    if args.url:
+        url = args.url.rstrip("/")
+        server_pid = args.server_pid
+        targets = None
+    else:
+        targets = seed_database(mongo_uri, args.db, args.questions, args.contests, args.seed)
+        port = args.port or _free_port()
+        url = f"http://127.0.0.1:{port}"
+        process = start_server(args, port)
+        server_pid = process.pid
+
+    try:
+        wait_for_server(url, process)
+        if targets is None:
+            # Against an external server, act on whatever its database holds.
+            print("Reading target ids from --mongo-uri/--db for the external server.")
+            client = MongoClient(mongo_uri)
+            collection = client[args.db]["questions"]
+            targets = {
+                category: list(collection.find({"category": category}, {"_id": 1, "max_problems": 1}))
+                for category in CATEGORIES
+            }
+            client.close()
+
+        tracker = Tracker()
+        rooms = [category for category in CATEGORIES if targets.get(category)]
+        clients = [
+            LoadClient(index, url, rooms[index % len(rooms)], tracker, targets[rooms[index % len(rooms)]])
+            for index in range(args.clients)
+        ]
+        for client in clients:
+            client.connect()
+        print(f"Connected {len(clients)} client(s) across rooms {', '.join(rooms)} at {url}.")
+
+        sampler = ResourceSampler(server_pid) if server_pid else None
+        if sampler is not None:
+            sampler.start()
+        started = time.monotonic()
+        stop_at = started + args.duration
+        workers = [
+            threading.Thread(target=run_client, args=(client, args, weights, stop_at), daemon=True)
+            for client in clients
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        time.sleep(args.drain)
+        if sampler is not None:
+            sampler.stop()
+
+        report(tracker, sampler, time.monotonic() - started - args.drain)
+        for client in clients:
+            client.disconnect()
+    finally:
+        if process is not None:
+            process.send_signal(signal.SIGTERM)
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+            cleanup = MongoClient(mongo_uri)
+            cleanup.drop_database(args.db)
+            cleanup.close()
+
+
+if __name__ == "__main__":
+    main()
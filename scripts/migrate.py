@@ -0,0 +1,67 @@
+"""Apply versioned data migrations to the tracker collection.
+
+Usage:
+    python scripts/migrate.py
+    python scripts/migrate.py --status
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Ensure project root is on sys.path when running as a script (python scripts/migrate.py)
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.config import get_settings
+from app.services.mongo import build_mongo_client
+from app.services.migrations import migration_status, run_migrations
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Apply pending data migrations")
+    parser.add_argument(
+        "--status",
+        action="store_true",
+        help="List applied and pending migrations without running anything.",
+    )
+    parser.add_argument(
+        "--target",
+        type=int,
+        default=None,
+        help="Only apply migrations up to and including this version.",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    env_path = PROJECT_ROOT / '.env'
+    if env_path.exists():
+        load_dotenv(env_path, override=True)
+    else:
+        load_dotenv(override=True)
+    settings = get_settings()
+
+    args = parse_args()
+
+    mongo_client = build_mongo_client(settings)
+    collection = mongo_client[settings.mongo_db][settings.mongo_collection]
+
+    if args.status:
+        for entry in migration_status(collection):
+            state = entry["applied_at"].isoformat() if entry["applied_at"] else "pending"
+            print(f"{entry['version']:04d} {entry['name']}: {state}")
+        return
+
+    applied = run_migrations(collection, target_version=args.target)
+    for record in applied:
+        print(f"Applied {record['version']:04d} {record['name']}: {record['result']}")
+    print(f"{len(applied)} migration(s) applied to {settings.mongo_collection} collection.")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,12 +6,13 @@ Usage:
 from __future__ import annotations
 
 import argparse
-import json
+import itertools
 import sys
 from pathlib import Path
+from typing import Iterable, Iterator
 
 from dotenv import load_dotenv
-from pymongo import MongoClient
+from pymongo import UpdateOne
 
 # Ensure project root is on sys.path when running as a script (python scripts/seed_data.py)
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -19,6 +20,10 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from app.config import get_settings
+from app.services.mongo import build_mongo_client
+from app.services.progress import import_embedded_status, progress_collection
+from app.services.seeding import bulk_write_batched, iter_json_array
+from app.services.warmup import clear_seed_manifest
 
 
 def parse_args() -> argparse.Namespace:
@@ -34,17 +39,19 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Update metadata without resetting completion status.",
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Upserts per bulk_write call (defaults to SEED_BATCH_SIZE).",
+    )
     return parser.parse_args()
 
 
-def load_questions(file_path: Path) -> list[dict]:
+def load_questions(file_path: Path) -> Iterator[dict]:
     if not file_path.exists():
         raise FileNotFoundError(f"Question file not found: {file_path}")
-    with file_path.open("r", encoding="utf-8") as handle:
-        data = json.load(handle)
-    if not isinstance(data, list):
-        raise ValueError("Expected a list of questions in the JSON file.")
-    return data
+    return iter_json_array(file_path)
 
 
 def build_document(raw: dict, index: int, preserve_status: bool) -> dict:
@@ -59,10 +66,19 @@ def build_document(raw: dict, index: int, preserve_status: bool) -> dict:
         "practice_link": raw.get("practice_link"),
         "editorial_link": raw.get("editorial_link"),
         "notes": raw.get("notes"),
-        "status": status or {"user_one": False, "user_two": False},
+        # Moved into the progress collection by import_embedded_status after the write;
+        # without --preserve-status everything starts as not done.
+        "status": status or {},
     }
 
 
+def build_operations(questions: Iterable[dict], preserve_status: bool) -> Iterator[UpdateOne]:
+    for idx, question in enumerate(questions):
+        doc = build_document(question, idx, preserve_status)
+        query = {"category": doc["category"], "day": doc["day"], "title": doc["title"]}
+        yield UpdateOne(query, {"$set": doc}, upsert=True)
+
+
 def main() -> None:
     # Load .env path relative to project root explicitly to avoid picking example or defaults
     env_path = PROJECT_ROOT / '.env'
@@ -75,19 +91,31 @@ def main() -> None:
     args = parse_args()
     questions = load_questions(args.file)
 
-    mongo_client = MongoClient(settings.mongo_uri)
+    mongo_client = build_mongo_client(settings)
     collection = mongo_client[settings.mongo_db][settings.mongo_collection]
 
-    # Build documents
-    documents = [build_document(question, idx, args.preserve_status) for idx, question in enumerate(questions)]
+    # Parse the first record before deleting anything so a malformed file fails early.
+    first = next(questions, None)
+    if first is not None:
+        questions = itertools.chain([first], questions)
 
+    deleted = 0
     if not args.preserve_status:
-        collection.delete_many({})
-    for doc in documents:
-        query = {"category": doc["category"], "day": doc["day"], "title": doc["title"]}
-        collection.update_one(query, {"$set": doc}, upsert=True)
-
-    print(f"Upserted {len(documents)} questions into {settings.mongo_collection} collection.")
+        deleted = collection.delete_many({}).deleted_count
+        progress_collection(collection).delete_many({})
+        # Every category is gone, so the warm-up must re-seed the ones this file does not cover.
+        clear_seed_manifest(collection)
+
+    batch_size = args.batch_size or settings.seed_batch_size
+    result = bulk_write_batched(collection, build_operations(questions, args.preserve_status), batch_size)
+    result.deleted += deleted
+    # Stored progress wins over the file's status, so --preserve-status only fills gaps.
+    import_embedded_status(collection, batch_size=batch_size)
+
+    print(
+        f"Seeded {settings.mongo_collection} collection in {result.batches} batch(es): "
+        f"{result.inserted} inserted, {result.modified} modified, {result.deleted} deleted."
+    )
 
 
 if __name__ == "__main__":
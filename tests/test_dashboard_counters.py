@@ -0,0 +1,40 @@
+"""Changes applied while the dashboard counters are being rebuilt."""
+
+from app.services.dashboard_counters import DashboardCounters
+
+
+def _dashboard(completed=0):
+    return {
+        "user_one": {"total": 2, "completed": completed, "difficulty": {"Easy": {"total": 2, "completed": completed}}},
+    }
+
+
+def test_changes_during_a_rebuild_are_replayed_onto_it():
+    counters = DashboardCounters(reconcile_interval=0)
+
+    def build():
+        counters.apply_question_change("striver", "user_one", "Easy", False, True)
+        return _dashboard()
+
+    dashboard, version = counters.snapshot(None, "striver", build=build)
+
+    assert dashboard == _dashboard(completed=1)
+    assert version is not None and version == counters.stamp("striver")
+    assert counters.user_counters("striver", "user_one", "Easy") == {
+        "completed": 1,
+        "total": 2,
+        "difficulty": {"Easy": 1},
+    }
+
+
+def test_invalidation_during_a_rebuild_discards_it():
+    counters = DashboardCounters(reconcile_interval=0)
+
+    def build():
+        counters.invalidate("striver")
+        return _dashboard()
+
+    dashboard, version = counters.snapshot(None, "striver", build=build)
+
+    assert dashboard == _dashboard() and version is None
+    assert counters.stamp("striver") is None
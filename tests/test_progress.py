@@ -0,0 +1,186 @@
+"""Progress writes: single toggles, bulk sets/clears and their race handling.
+
+Runs against mongomock instead of a MongoDB server (``pip install pytest mongomock``).
+"""
+
+from datetime import timedelta
+
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+from bson import ObjectId  # noqa: E402
+
+import app.services.tracker_service as tracker_service  # noqa: E402
+from app.services import progress  # noqa: E402
+from app.services.tracker_service import (  # noqa: E402
+    CONTEST_CATEGORY,
+    bulk_set_contest_solved,
+    bulk_set_question_status,
+)
+
+USER = "user_one"
+
+
+@pytest.fixture
+def collection():
+    collection = mongomock.MongoClient().db.tracker
+    collection.insert_many(
+        [
+            {"category": "striver", "day": day, "title": f"q{day}-{index}", "difficulty": difficulty}
+            for day in (1, 2)
+            for index, difficulty in enumerate(("Easy", "Hard"))
+        ]
+        + [{"category": "binary_search", "day": 1, "title": "other", "difficulty": "Medium"}]
+        + [{"category": CONTEST_CATEGORY, "title": f"c{index}", "max_problems": 4} for index in range(3)]
+    )
+    return collection
+
+
+def _ids(collection, **query):
+    return [doc["_id"] for doc in collection.find(query).sort("_id", 1)]
+
+
+def _done(collection, user=USER):
+    return {doc["question_id"]: doc["value"] for doc in progress.progress_collection(collection).find({"user": user})}
+
+
+def _claim(collection, question_id, age=0):
+    token = ObjectId.from_datetime(progress._now() - timedelta(seconds=age))
+    progress.progress_collection(collection).update_one(
+        {"user": USER, "question_id": question_id}, {"$set": {"clearing": token}}
+    )
+
+
+def test_bulk_question_status_by_day_ids_and_category(collection):
+    day_one = _ids(collection, category="striver", day=1)
+    result = bulk_set_question_status(collection, "striver", USER, True, day=1)
+    assert result["exact"]
+    assert {change["id"] for change in result["changes"]} == {str(item) for item in day_one}
+    assert set(_done(collection)) == set(day_one)
+
+    result = bulk_set_question_status(collection, "striver", USER, True)
+    striver = _ids(collection, category="striver")
+    assert {change["id"] for change in result["changes"]} == {str(item) for item in striver if item not in day_one}
+    assert set(_done(collection)) == set(striver)
+
+    result = bulk_set_question_status(collection, "striver", USER, False, question_ids=[str(day_one[0])])
+    assert [(change["id"], change["previous"], change["current"]) for change in result["changes"]] == [
+        (str(day_one[0]), True, False)
+    ]
+
+    result = bulk_set_question_status(collection, "striver", USER, False)
+    assert len(result["changes"]) == len(striver) - 1 and result["exact"]
+    assert _done(collection) == {}
+
+
+def test_bulk_contest_solved_by_ids_and_all(collection):
+    contests = _ids(collection, category=CONTEST_CATEGORY)
+    result = bulk_set_contest_solved(collection, USER, True, contest_ids=[str(contests[0])])
+    assert [(change["previous"], change["current"]) for change in result["changes"]] == [(0, 4)]
+
+    progress.set_count(collection, USER, contests[1], CONTEST_CATEGORY, 2)
+    result = bulk_set_contest_solved(collection, USER, True)
+    assert sorted(change["previous"] for change in result["changes"]) == [0, 2] and result["exact"]
+    assert _done(collection) == {contest: 4 for contest in contests}
+
+    result = bulk_set_contest_solved(collection, USER, False)
+    assert len(result["changes"]) == 3 and result["exact"]
+    assert _done(collection) == {}
+
+
+def test_items_flipped_by_another_writer_are_left_out(collection, monkeypatch):
+    day_one = {str(item) for item in _ids(collection, category="striver", day=1)}
+    set_flags = tracker_service.set_flags
+    flipped = []
+
+    def racing_set_flags(collection, user, question_ids, category, value):
+        flipped.append(str(question_ids[0]))
+        progress.set_flag(collection, user, question_ids[0], category, value)
+        return set_flags(collection, user, question_ids, category, value)
+
+    monkeypatch.setattr(tracker_service, "set_flags", racing_set_flags)
+    result = bulk_set_question_status(collection, "striver", USER, True, day=1)
+    assert not result["exact"]
+    assert {change["id"] for change in result["changes"]} == day_one - {flipped[0]}
+
+    result = bulk_set_question_status(collection, "striver", USER, False, day=1)
+    assert not result["exact"]
+    assert {change["id"] for change in result["changes"]} == day_one - {flipped[1]}
+    assert _done(collection) == {}
+
+
+def test_contest_counts_changed_by_another_writer_are_left_out(collection, monkeypatch):
+    contests = _ids(collection, category=CONTEST_CATEGORY)
+    set_counts = tracker_service.set_counts
+    flipped, raced = [], {}
+
+    def racing_set_counts(collection, user, category, targets):
+        question_id, stored, _value = targets[0]
+        flipped.append(question_id)
+        progress.set_count(collection, user, question_id, category, (stored or 0) + 1)
+        raced[question_id] = (stored or 0) + 1
+        return set_counts(collection, user, category, targets)
+
+    monkeypatch.setattr(tracker_service, "set_counts", racing_set_counts)
+    result = bulk_set_contest_solved(collection, USER, True)
+    assert not result["exact"]
+    assert {change["id"] for change in result["changes"]} == {str(item) for item in contests if item != flipped[0]}
+    assert _done(collection)[flipped[0]] == raced[flipped[0]] == 1
+
+    result = bulk_set_contest_solved(collection, USER, False)
+    assert not result["exact"]
+    assert {change["id"] for change in result["changes"]} == {str(item) for item in contests if item != flipped[1]}
+    assert _done(collection) == {flipped[1]: raced[flipped[1]]}
+
+
+def test_overlapping_bulk_clears_report_each_item_once(collection):
+    items = _ids(collection, category="striver")
+    progress.set_flags(collection, USER, items, "striver", True)
+    collection_progress = progress.progress_collection(collection)
+
+    first = progress._claim_and_delete(collection_progress, USER, [{"question_id": {"$in": items[:3]}}])
+    second = progress._claim_and_delete(collection_progress, USER, [{"question_id": {"$in": items[1:]}}])
+
+    assert sorted(first) == items[:3]
+    assert second == [items[3]]
+
+
+def test_live_claims_count_as_cleared(collection):
+    first, second = _ids(collection, category="striver")[:2]
+    progress.set_flags(collection, USER, [first, second], "striver", True)
+    _claim(collection, first)
+    _claim(collection, second)
+
+    # A single clear leaves the claimed flag to the bulk clear.
+    assert progress.set_flag(collection, USER, first, "striver", False) is False
+    # A single set takes the claimed flag back and reports it as newly set.
+    assert progress.set_flag(collection, USER, second, "striver", True) is False
+    taken_back = progress.progress_collection(collection).find_one({"question_id": second})
+    # The bulk clear still finds the item it claimed and reports it.
+    assert "clearing" not in taken_back and "reclaimed" in taken_back
+
+    assert progress.set_flag(collection, USER, second, "striver", True) is True
+
+
+def test_expired_claims_are_taken_over(collection):
+    items = _ids(collection, category="striver")[:2]
+    progress.set_flags(collection, USER, items, "striver", True)
+    _claim(collection, items[0], age=progress.CLAIM_TIMEOUT_SECONDS + 5)
+    _claim(collection, items[1])
+
+    result = bulk_set_question_status(collection, "striver", USER, False, question_ids=[str(item) for item in items])
+
+    assert [change["id"] for change in result["changes"]] == [str(items[0])]
+    assert not result["exact"]
+    assert set(_done(collection)) == {items[1]}
+
+
+def test_set_counts_skips_live_claims(collection):
+    contest = _ids(collection, category=CONTEST_CATEGORY)[0]
+    progress.set_count(collection, USER, contest, CONTEST_CATEGORY, 2)
+    _claim(collection, contest)
+
+    assert progress.set_counts(collection, USER, CONTEST_CATEGORY, [(contest, 2, 4)]) == []
+    assert progress.set_count(collection, USER, contest, CONTEST_CATEGORY, 1) is None
+    assert progress.set_count(collection, USER, contest, CONTEST_CATEGORY, 3) == 1
@@ -0,0 +1,138 @@
+"""Cross-worker fan-out of cache and counter changes over the Redis backend.
+
+A fake client implementing redis-py's ``publish``/``pubsub`` API stands in
+for the server, so no Redis or MongoDB is needed.
+"""
+
+import queue
+import threading
+import time
+
+import pytest
+
+from app.services.change_fanout import ChangeFanout
+from app.services.dashboard_counters import DashboardCounters
+from app.services.pubsub import PubSubBackend, RedisPubSub
+from app.services.question_cache import QuestionCache
+
+
+class FakeBroker:
+    def __init__(self):
+        self.subscribers = []
+        self.lock = threading.Lock()
+
+    def client(self):
+        return FakeRedis(self)
+
+
+class FakeRedis:
+    def __init__(self, broker):
+        self.broker = broker
+
+    def publish(self, channel, data):
+        with self.broker.lock:
+            subscribers = list(self.broker.subscribers)
+        for subscriber in subscribers:
+            if channel in subscriber.channels:
+                subscriber.messages.put({"type": "message", "channel": channel, "data": data})
+        return len(subscribers)
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return FakePubSub(self.broker)
+
+
+class FakePubSub:
+    def __init__(self, broker):
+        self.broker = broker
+        self.channels = set()
+        self.messages = queue.Queue()
+
+    def subscribe(self, channel):
+        self.channels.add(channel)
+        with self.broker.lock:
+            self.broker.subscribers.append(self)
+
+    def get_message(self, timeout=0.0):
+        try:
+            return self.messages.get(timeout=min(timeout, 0.05))
+        except queue.Empty:
+            return None
+
+    def close(self):
+        with self.broker.lock:
+            if self in self.broker.subscribers:
+                self.broker.subscribers.remove(self)
+
+
+def _dashboard():
+    stats = {
+        "total": 3,
+        "completed": 0,
+        "difficulty": {name: {"total": 1, "completed": 0} for name in ("Easy", "Medium", "Hard")},
+    }
+    return {"user_one": dict(stats), "user_two": dict(stats, difficulty={})}
+
+
+class Worker:
+    def __init__(self, broker, name):
+        self.backend = RedisPubSub(channel="test:events", client=broker.client())
+        self.counters = DashboardCounters(reconcile_interval=0)
+        self.counters.snapshot(None, "striver", build=_dashboard)
+        self.cache = QuestionCache()
+        self.fanout = ChangeFanout(self.backend, self.counters, self.cache, instance_id=name)
+        self.backend.start(lambda target: threading.Thread(target=target, daemon=True).start())
+
+    def completed(self, user_field="user_one"):
+        return self.counters.user_counters("striver", user_field)["completed"]
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.fixture
+def workers():
+    broker = FakeBroker()
+    first, second = Worker(broker, "first"), Worker(broker, "second")
+    assert _wait_for(lambda: len(broker.subscribers) == 2)
+    yield first, second
+    first.backend.stop()
+    second.backend.stop()
+
+
+def test_backend_requires_publish():
+    with pytest.raises(TypeError):
+        PubSubBackend()
+
+
+def test_question_change_reaches_the_peer_and_is_applied_once_locally(workers):
+    first, second = workers
+    first.fanout.question_changed("striver", "q1", "user_one", "Easy", False, True)
+
+    assert _wait_for(lambda: second.completed() == 1)
+    # The publisher also receives its own message but must not apply it again.
+    time.sleep(0.1)
+    assert first.completed() == 1
+    assert second.cache.version("striver") == first.cache.version("striver") == 1
+
+
+def test_bulk_change_and_invalidation_are_applied_by_the_peer(workers):
+    first, second = workers
+    changes = [
+        {"id": "q1", "difficulty": "Easy", "previous": False, "current": True},
+        {"id": "q2", "difficulty": "Hard", "previous": False, "current": True},
+    ]
+    first.fanout.bulk_changed("striver", "user_one", changes)
+    assert _wait_for(lambda: second.completed() == 2)
+    assert first.completed() == 2
+
+    version = second.counters.version("striver")
+    first.fanout.category_invalidated("striver")
+    assert _wait_for(lambda: second.counters.stamp("striver") is None)
+    assert second.counters.version("striver") > version
+    assert second.cache.version("striver") == first.cache.version("striver")
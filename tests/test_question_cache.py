@@ -0,0 +1,61 @@
+"""Page loads are served from the in-process question cache.
+
+Runs against mongomock instead of a MongoDB server (``pip install pytest mongomock``).
+"""
+
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+import app.services.mongo as mongo  # noqa: E402
+from app import create_app  # noqa: E402
+
+
+@pytest.fixture
+def application(monkeypatch):
+    monkeypatch.setenv("MONGO_ENSURE_INDEXES", "false")
+    monkeypatch.setenv("METRICS_ENABLED", "false")
+    client = mongomock.MongoClient()
+    monkeypatch.setattr(mongo, "MongoClient", lambda *args, **kwargs: client)
+    return create_app()
+
+
+def test_second_page_load_is_a_cache_hit(application):
+    client = application.test_client()
+    aggregate = application.tracker_collection.aggregate
+    calls = []
+
+    def counting_aggregate(pipeline, *args, **kwargs):
+        calls.append(pipeline)
+        return aggregate(pipeline, *args, **kwargs)
+
+    application.tracker_collection.aggregate = counting_aggregate
+
+    assert client.get("/binary-search").status_code == 200
+    first = application.question_cache.stats()
+    reads = len(calls)
+    assert client.get("/binary-search").status_code == 200
+    second = application.question_cache.stats()
+
+    assert (first["misses"], first["entries"]) == (1, 1)
+    assert (second["hits"], second["misses"]) == (first["hits"] + 1, 1)
+    assert len(calls) == reads
+
+
+def test_day_fragments_slice_the_cached_category(application):
+    client = application.test_client()
+    client.get("/binary-search")
+    hits = application.question_cache.stats()["hits"]
+
+    assert client.get("/fragments/binary_search/days?after=1").status_code == 200
+    assert application.question_cache.stats()["hits"] == hits + 1
+
+
+def test_disabled_cache_streams_from_the_cursor(application):
+    application.question_cache = type(application.question_cache)(max_entries=0)
+    client = application.test_client()
+
+    assert client.get("/binary-search").status_code == 200
+    assert application.question_cache.get_day_page(application.tracker_collection, "binary_search").lazy
+    stats = application.question_cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (0, 2, 0)
@@ -0,0 +1,87 @@
+"""scripts/seed_data.py resets progress by default and keeps it with ``--preserve-status``.
+
+Runs against mongomock instead of a MongoDB server (``pip install pytest mongomock``).
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import seed_data  # noqa: E402
+from app.services.progress import progress_collection  # noqa: E402
+from app.services.warmup import SEED_MANIFEST_COLLECTION  # noqa: E402
+
+
+@pytest.fixture
+def seed(monkeypatch, tmp_path):
+    monkeypatch.setenv("MONGO_DB_NAME", "seed_test")
+    monkeypatch.setenv("MONGO_COLLECTION_NAME", "questions")
+    monkeypatch.setattr(seed_data, "load_dotenv", lambda *args, **kwargs: None)
+    client = mongomock.MongoClient()
+    monkeypatch.setattr(seed_data, "build_mongo_client", lambda settings: client)
+    questions = tmp_path / "questions.json"
+    questions.write_text(
+        json.dumps(
+            [
+                {"day": 1, "title": "Two Sum", "status": {"user_one": True}},
+                {"day": 1, "title": "Three Sum"},
+            ]
+        )
+    )
+
+    def run(*args):
+        monkeypatch.setattr(sys, "argv", ["seed_data.py", "--file", str(questions), *args])
+        seed_data.main()
+
+    run.collection = client["seed_test"]["questions"]
+    return run
+
+
+def _progress(collection):
+    titles = {doc["_id"]: doc["title"] for doc in collection.find()}
+    return {(titles.get(doc["question_id"]), doc["user"]) for doc in progress_collection(collection).find()}
+
+
+def test_default_run_resets_progress_and_the_seed_manifest(seed):
+    collection = seed.collection
+    seed("--preserve-status")
+    assert _progress(collection) == {("Two Sum", "user_one")}
+    three_sum = collection.find_one({"title": "Three Sum"})["_id"]
+    progress_collection(collection).insert_one({"user": "user_two", "question_id": three_sum, "value": True})
+    manifest = collection.database[SEED_MANIFEST_COLLECTION]
+    manifest.insert_many([{"_id": "questions:striver", "sha256": "x"}, {"_id": "other:striver", "sha256": "x"}])
+
+    seed()
+
+    # A plain run ignores the file's status too: everything starts as not done.
+    assert _progress(collection) == set()
+    assert [doc["_id"] for doc in manifest.find()] == ["other:striver"]
+    assert collection.count_documents({"status": {"$exists": True}}) == 0
+
+
+def test_preserve_status_keeps_progress(seed):
+    collection = seed.collection
+    seed()
+    assert _progress(collection) == set()
+    two_sum, three_sum = (collection.find_one({"title": title})["_id"] for title in ("Two Sum", "Three Sum"))
+    progress_collection(collection).insert_many(
+        [
+            {"user": "user_one", "question_id": two_sum, "value": True, "category": "striver"},
+            {"user": "user_two", "question_id": three_sum, "value": True, "category": "striver"},
+        ]
+    )
+    manifest = collection.database[SEED_MANIFEST_COLLECTION]
+    manifest.insert_one({"_id": "questions:striver", "sha256": "x"})
+
+    seed("--preserve-status")
+
+    assert _progress(collection) == {("Two Sum", "user_one"), ("Three Sum", "user_two")}
+    assert progress_collection(collection).count_documents({}) == 2
+    assert manifest.count_documents({}) == 1
+    assert collection.count_documents({}) == 2
@@ -1,4 +1,12 @@
-from app import create_app, socketio
+# Patch the standard library before anything imports socket/threading so that
+# blocking PyMongo calls yield to the eventlet hub instead of stalling every
+# websocket on the worker. Gunicorn's eventlet worker patches as well; doing it
+# here also covers `python wsgi.py` and any import order surprises.
+import eventlet
+
+eventlet.monkey_patch()
+
+from app import create_app, socketio  # noqa: E402
 
 app = create_app()
 